@@ -0,0 +1,191 @@
+"""
+Awareness tiers for entity AI.
+
+`EntityManager.update_entities` only walks the *active* tier: entities that
+are aware of the player or within `wake_distance` of them. Far, unaware
+entities are parked as *dormant* (awake) or *sleeping* and are not touched
+per turn. A parked entity comes back when:
+
+- the player comes within `wake_distance` (found through the spatial index),
+- a noise, alarm or ally alerts it (`EntityManager.wake_entity`),
+- it dies, so its death animation and drops are processed.
+
+When the day/night phase flips, parked entities re-check their sleep state
+in place and move between the dormant and sleeping tiers.
+
+Status effects on a parked entity are not ticked. The skipped turns are
+applied in one `StatusEffectManager.advance` call when it wakes (or when the
+depth is saved, see `settle`).
+
+Active entities are also held in an `EnergyQueue`, which decides which of
+them get to act on a given turn. Parked entities leave the queue and keep
+their energy on `entity.energy`.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.lib.core.engine.energy import EnergyQueue
+from app.lib.core.logger import debug
+
+ACTIVE = 'active'
+DORMANT = 'dormant'
+SLEEPING = 'sleeping'
+
+
+class AIScheduler:
+    """Tracks which entities get an AI update this turn."""
+
+    def __init__(self, wake_distance: int = 20):
+        self.wake_distance = wake_distance
+        # id(entity) -> entity, in update order
+        self._active: Dict[int, Any] = {}
+        # id(entity) -> (entity, last turn whose status tick was applied)
+        self._dormant: Dict[int, Tuple[Any, int]] = {}
+        self._sleeping: Dict[int, Tuple[Any, int]] = {}
+        # Entity list the tiers were built from (see in_sync)
+        self._source: Optional[List[Any]] = None
+        self._phase: Optional[str] = None
+        # Action order for the active tier
+        self.queue = EnergyQueue()
+        # Last turn handled by update_entities; parked entities owe ticks up to here
+        self.turn = 0
+        # Number of parked entities woken so far (diagnostics)
+        self.wakes = 0
+
+    def __len__(self) -> int:
+        return len(self._active) + len(self._dormant) + len(self._sleeping)
+
+    def counts(self) -> Dict[str, int]:
+        return {ACTIVE: len(self._active), DORMANT: len(self._dormant), SLEEPING: len(self._sleeping)}
+
+    def tier(self, entity: Any) -> Optional[str]:
+        eid = id(entity)
+        if eid in self._active:
+            return ACTIVE
+        if eid in self._dormant:
+            return DORMANT
+        if eid in self._sleeping:
+            return SLEEPING
+        return None
+
+    # -------------------------
+    # Membership
+    # -------------------------
+    def reset(self, entities: List[Any], turn: int) -> None:
+        """Make every entity in `entities` active (new level, reload)."""
+        self._active = {id(e): e for e in entities}
+        self._dormant.clear()
+        self._sleeping.clear()
+        self._source = entities
+        self.queue.clear()
+        self.begin_turn(turn)
+        for entity in entities:
+            self.queue.add(entity)
+
+    def begin_turn(self, turn: int) -> None:
+        """Mark `turn` as the turn being processed."""
+        self.turn = turn
+        self.queue.now = turn
+
+    def in_sync(self, entities: List[Any]) -> bool:
+        """False if `entities` was replaced or changed size behind our back."""
+        return self._source is entities and len(self) == len(entities)
+
+    def add(self, entity: Any) -> None:
+        eid = id(entity)
+        if eid not in self._dormant and eid not in self._sleeping:
+            self._active[eid] = entity
+            self.queue.add(entity)
+
+    def discard(self, entity: Any) -> None:
+        eid = id(entity)
+        self._active.pop(eid, None)
+        self._dormant.pop(eid, None)
+        self._sleeping.pop(eid, None)
+        self.queue.discard(entity)
+
+    def active(self) -> List[Any]:
+        """Snapshot of the active tier, safe to iterate while entities wake or die."""
+        return list(self._active.values())
+
+    # -------------------------
+    # Tier changes
+    # -------------------------
+    def park(self, entity: Any, turn: int) -> None:
+        """Move `entity` out of the active tier; its status ticks are applied up to `turn`."""
+        eid = id(entity)
+        if self._active.pop(eid, None) is None:
+            return
+        self.queue.discard(entity)
+        if getattr(entity, 'is_sleeping', False):
+            self._sleeping[eid] = (entity, turn)
+        else:
+            self._dormant[eid] = (entity, turn)
+
+    def wake(self, entity: Any) -> bool:
+        """Return a parked entity to the active tier. Returns True if it was parked."""
+        eid = id(entity)
+        entry = self._dormant.pop(eid, None) or self._sleeping.pop(eid, None)
+        if entry is None:
+            return False
+        self._fast_forward(entity, entry[1])
+        self._active[eid] = entity
+        self.queue.add(entity)
+        self.wakes += 1
+        return True
+
+    def wake_all(self) -> int:
+        woken = 0
+        for entity, _ in list(self._dormant.values()) + list(self._sleeping.values()):
+            if self.wake(entity):
+                woken += 1
+        return woken
+
+    def wake_near(self, index: Any, x: int, y: int) -> int:
+        """Wake parked entities within `wake_distance` of (x, y)."""
+        if not self._dormant and not self._sleeping:
+            return 0
+        woken = 0
+        for entity in index.in_radius(x, y, self.wake_distance):
+            if self.wake(entity):
+                woken += 1
+        return woken
+
+    def set_phase(self, time_of_day: str) -> bool:
+        """Record the day/night phase; on a change, re-check sleep state of parked entities."""
+        if time_of_day == self._phase:
+            return False
+        first = self._phase is None
+        self._phase = time_of_day
+        if first:
+            return False
+        parked = list(self._dormant.values()) + list(self._sleeping.values())
+        self._dormant.clear()
+        self._sleeping.clear()
+        for entity, stamp in parked:
+            try:
+                entity.update_sleep_state(time_of_day)
+            except Exception:
+                pass
+            bucket = self._sleeping if getattr(entity, 'is_sleeping', False) else self._dormant
+            bucket[id(entity)] = (entity, stamp)
+        debug("[AI] %s falls: %s dormant, %s sleeping", time_of_day, len(self._dormant), len(self._sleeping), channel="AI")
+        return True
+
+    def settle(self) -> None:
+        """Apply owed status ticks to every parked entity without waking it,
+        and store queued entities' energy on the entities (before saving)."""
+        self.queue.sync()
+        for bucket in (self._dormant, self._sleeping):
+            for eid, (entity, stamp) in list(bucket.items()):
+                self._fast_forward(entity, stamp)
+                bucket[eid] = (entity, self.turn)
+
+    def _fast_forward(self, entity: Any, stamp: int) -> None:
+        skipped = self.turn - stamp
+        manager = getattr(entity, 'status_manager', None)
+        if skipped > 0 and manager is not None:
+            try:
+                manager.advance(skipped)
+            except Exception:
+                pass
@@ -1,5 +1,6 @@
 from typing import Any, Dict
 
+from app.lib.core.engine.grid import TileGrid
 from app.model.entity import Entity
 
 
@@ -20,8 +21,9 @@ class DepthStore:
         if not self.game.current_map:
             return {}
         # Map grid as list of strings for compactness
-        map_rows = ["".join(row) for row in self.game.current_map]
-        # Entities
+        map_rows = self.game.current_map.rows()
+        # Entities (parked ones first catch up on skipped status ticks)
+        self.game.entity_manager.settle_dormant()
         ents = [e.to_dict() for e in self.game.entity_manager.entities]
         # Ground items: serialize keys as "x,y"
         ground = {f"{x},{y}": items[:] for (x, y), items in self.game.ground_items.items()}
@@ -39,7 +41,7 @@ class DepthStore:
                   for (x, y), c in self.game.trap_manager.chests.items()}
         # Secret door difficulty and known traps
         secret = {f"{x},{y}": diff for (x, y), diff in self.game.secret_door_difficulty.items()}
-        known_traps = [f"{x},{y}" for (x, y) in getattr(self, 'known_traps', set())]
+        known_traps = [f"{x},{y}" for (x, y) in self.game.trap_manager.known_traps]
         # Visibility is large; persist explored mask only (1/2 treated as explored)
         explored = []
         try:
@@ -58,7 +60,7 @@ class DepthStore:
             "secret_door_difficulty": secret,
             "known_traps": known_traps,
             "explored": explored,
-            "lit_rooms": list(self.game.lit_rooms) if hasattr(self, 'lit_rooms') else [],
+            "lit_rooms": list(self.game.lit_rooms),
         }
 
     def _deserialize_depth_state(self, data: Dict[str, Any]) -> None:
@@ -67,13 +69,17 @@ class DepthStore:
             return
         # Map
         map_rows = data.get("map", [])
-        self.game.current_map = [list(row) for row in map_rows]
-        self.game.map_height = len(self.game.current_map) if self.game.current_map else 0
-        self.game.map_width = len(self.game.current_map[0]) if self.game.map_height > 0 else 0
+        self.game.current_map = TileGrid.from_rows(map_rows)
+        self.game.map_height = self.game.current_map.height
+        self.game.map_width = self.game.current_map.width
         # Rooms cannot be perfectly reconstructed; regenerate simple room list via generator cache where possible
         # Leave self.rooms as-is (may be []); features like lit_rooms still work
-        self.visibility = [[0 for _ in range(self.game.map_width)] for _ in range(self.game.map_height)]
-        self.light_colors = [[0 for _ in range(self.game.map_width)] for _ in range(self.game.map_height)]
+        self.game.fov.reset(self.game.map_width, self.game.map_height)
+        if self.game.current_depth == 0:
+            self.game.fov.prepare_town_sweep()
+        self.game.pathfinder.bind(self.game.current_map)
+        # Saved rooms are not restored, so cluster by fixed chunks only
+        self.game.path_hierarchy.bind(self.game.current_map)
         # Explored mask
         explored = data.get("explored") or []
         if explored and len(explored) == self.game.map_height:
@@ -82,38 +88,42 @@ class DepthStore:
                     try:
                         if explored[y][x]:
                             # mark explored; visible will be updated by update_fov
-                            self.visibility[y][x] = 1
+                            self.game.fov.visibility[y][x] = 1
                     except Exception:
                         pass
-        # Entities
-        self.entities = []
+        # Entities replace whatever the previous depth (or a fresh game) had
+        entities = []
         for ed in data.get("entities", []):
             try:
                 ent = Entity.from_dict(ed)
-                self.entities.append(ent)
+                entities.append(ent)
             except Exception:
                 continue
+        self.game.entity_manager.entities = entities
+        # Spatial hash/index and AI tiers/energy queue must follow the new list
+        self.game.entity_manager.rebuild_index()
         # Ground items
-        self.ground_items = {}
+        self.game.ground_items = {}
         for key, items in (data.get("ground_items") or {}).items():
             try:
                 x_str, y_str = key.split(",")
-                self.ground_items[(int(x_str), int(y_str))] = list(items)
+                self.game.ground_items[(int(x_str), int(y_str))] = list(items)
             except Exception:
                 continue
         # Death drop log (preserve per-depth drop records)
         try:
-            self.death_drop_log = list(data.get("death_drop_log") or [])
+            self.game.death_drop_log = list(data.get("death_drop_log") or [])
         except Exception:
-            self.death_drop_log = []
+            self.game.death_drop_log = []
         # Traps
-        self.traps = {}
+        traps = self.game.trap_manager.traps
+        traps.clear()
         for key, t in (data.get("traps") or {}).items():
             try:
                 x_str, y_str = key.split(",")
                 # Rehydrate id via loader
                 tdef = self.game.loader.get_trap(t.get("id")) if t.get("id") else None
-                self.traps[(int(x_str), int(y_str))] = {
+                traps[(int(x_str), int(y_str))] = {
                     'id': t.get('id'),
                     'data': tdef or {},
                     'revealed': bool(t.get('revealed', False)),
@@ -123,12 +133,13 @@ class DepthStore:
             except Exception:
                 continue
         # Chests
-        self.chests = {}
+        chests = self.game.trap_manager.chests
+        chests.clear()
         for key, c in (data.get("chests") or {}).items():
             try:
                 x_str, y_str = key.split(",")
                 cdef = self.game.loader.get_chest(c.get("id")) if hasattr(self.game.loader, 'get_chest') else None
-                self.chests[(int(x_str), int(y_str))] = {
+                chests[(int(x_str), int(y_str))] = {
                     'id': c.get('id'),
                     'data': cdef or {},
                     'opened': bool(c.get('opened', False)),
@@ -139,21 +150,23 @@ class DepthStore:
             except Exception:
                 continue
         # Secret doors / known traps / lit rooms
-        self.secret_door_difficulty = {}
+        self.game.secret_door_difficulty = {}
         for key, diff in (data.get("secret_door_difficulty") or {}).items():
             try:
                 x_str, y_str = key.split(",")
-                self.secret_door_difficulty[(int(x_str), int(y_str))] = int(diff)
+                self.game.secret_door_difficulty[(int(x_str), int(y_str))] = int(diff)
             except Exception:
                 continue
-        self.known_traps = set()
+        known_traps = self.game.trap_manager.known_traps
+        known_traps.clear()
         for key in data.get("known_traps", []):
             try:
                 x_str, y_str = key.split(",")
-                self.known_traps.add((int(x_str), int(y_str)))
+                known_traps.add((int(x_str), int(y_str)))
             except Exception:
                 continue
-        self.lit_rooms = set(int(i) for i in data.get("lit_rooms", []))
+        self.game.lit_rooms.clear()
+        self.game.lit_rooms.update(int(i) for i in data.get("lit_rooms", []))
 
     def save_game(self, path: str) -> Dict[str, Any]:
         """Return a complete save dict and write to path if provided.
@@ -162,7 +175,7 @@ class DepthStore:
         """
         # Cache current depth before saving
         if self.game.current_map:
-            self.depth_cache[self.current_depth] = self._serialize_depth_state()
+            self.depth_cache[self.game.current_depth] = self._serialize_depth_state()
         
         # Include data-layer identification mappings so unknown names remain stable
         data_state = {}
@@ -174,8 +187,8 @@ class DepthStore:
 
         save = {
             "version": 1,
-            "time": int(self.time),
-            "current_depth": int(self.current_depth),
+            "time": int(self.game.time),
+            "current_depth": int(self.game.current_depth),
             "player": self.game.player.to_dict() if getattr(self.game, 'player', None) else {},
             "depth_state": {},
             "data": data_state,
@@ -205,8 +218,8 @@ class DepthStore:
         except Exception:
             pass
         # Core vars
-        self.time = int(data.get('time', 0))
-        self.current_depth = int(data.get('current_depth', 0))
+        self.game.time = int(data.get('time', 0))
+        self.game.current_depth = int(data.get('current_depth', 0))
         
         # Restore all cached depths
         self.depth_cache.clear()
@@ -219,11 +232,11 @@ class DepthStore:
                 continue
         
         # Load current depth state
-        if self.current_depth in self.depth_cache:
-            self._deserialize_depth_state(self.depth_cache[self.current_depth])
+        if self.game.current_depth in self.depth_cache:
+            self._deserialize_depth_state(self.depth_cache[self.game.current_depth])
         else:
             # Fallback generate a map if not present
-            self.game.generate_map(self.current_depth)
+            self.game.generate_map(self.game.current_depth)
         
         # Ensure status manager exists on player
         self.game._ensure_player_status_manager()
@@ -0,0 +1,174 @@
+"""
+Energy-based action scheduling.
+
+Every actor gains `speed` energy per game turn and spends `ACTION_COST` per
+action. The player's base speed equals the cost (one action per turn);
+monsters default to half of it, which matches the old every-other-turn
+`move_counter` pacing. Status effects scale speed: Hasted doubles it,
+Slowed halves it and Paralyzed stops the actor's energy gain.
+
+`EnergyQueue` keeps monsters in a heap keyed by the turn their next action
+is due, so a turn only pops the actors that can act. Energy is stored
+lazily as (energy, since, speed) and only recomputed when an actor acts or
+its speed changes. Ties are broken by the order actors joined the queue,
+which keeps action order deterministic for a given seed.
+"""
+from __future__ import annotations
+import heapq
+from typing import Any, Dict, Iterator, List, Tuple
+
+ACTION_COST = 100
+PLAYER_SPEED = 100
+MONSTER_SPEED = 50
+
+# Status effect -> speed multiplier
+SPEED_EFFECTS: Dict[str, float] = {
+    'Hasted': 2.0,
+    'Slowed': 0.5,
+    'Paralyzed': 0.0,
+}
+
+
+def actor_speed(actor: Any, base: int) -> int:
+    """Energy per turn for `actor` after status-effect speed modifiers."""
+    manager = getattr(actor, 'status_manager', None)
+    if manager is None:
+        return base
+    speed = float(base)
+    for name, factor in SPEED_EFFECTS.items():
+        if manager.has_effect(name):
+            speed *= factor
+    return int(speed)
+
+
+class EnergyQueue:
+    """Priority queue of actors ordered by the turn their next action is due."""
+
+    def __init__(self, base_speed: int = MONSTER_SPEED):
+        self.base_speed = base_speed
+        # (due turn, join order, generation, actor); stale generations are skipped.
+        # Generations are queue-wide so entries left behind by a discarded
+        # actor can never match the state it gets when re-added.
+        self._heap: List[Tuple[int, int, int, Any]] = []
+        self._generation = 0
+        # id(actor) -> [actor, energy, since, speed, order, generation]
+        self._state: Dict[int, list] = {}
+        self._joined = 0
+        # Current turn; set by the owner before popping
+        self.now = 0
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def __contains__(self, actor: Any) -> bool:
+        return id(actor) in self._state
+
+    def clear(self) -> None:
+        self.sync()
+        for state in self._state.values():
+            self._unlisten(state[0])
+        self._heap.clear()
+        self._state.clear()
+
+    # -------------------------
+    # Membership
+    # -------------------------
+    def add(self, actor: Any) -> None:
+        """Queue `actor`, starting from its stored `energy` (capped at one action)."""
+        eid = id(actor)
+        if eid in self._state:
+            return
+        energy = min(ACTION_COST, int(getattr(actor, 'energy', 0)))
+        self._joined += 1
+        state = [actor, energy, self.now, actor_speed(actor, self.base_speed), self._joined, 0]
+        self._state[eid] = state
+        manager = getattr(actor, 'status_manager', None)
+        if manager is not None:
+            manager.on_change = lambda name, a=actor: self._effect_changed(a, name)
+        self._push(state)
+
+    def discard(self, actor: Any) -> None:
+        """Drop `actor`, writing its current energy back to `actor.energy`."""
+        state = self._state.pop(id(actor), None)
+        if state is None:
+            return
+        actor.energy = min(ACTION_COST, self._energy(state))
+        self._unlisten(actor)
+
+    def sync(self) -> None:
+        """Write every queued actor's current energy back to `actor.energy` (saving)."""
+        for state in self._state.values():
+            state[0].energy = min(ACTION_COST, self._energy(state))
+
+    # -------------------------
+    # Scheduling
+    # -------------------------
+    def energy(self, actor: Any) -> int:
+        state = self._state.get(id(actor))
+        return self._energy(state) if state is not None else int(getattr(actor, 'energy', 0))
+
+    def speed(self, actor: Any) -> int:
+        state = self._state.get(id(actor))
+        return state[3] if state is not None else actor_speed(actor, self.base_speed)
+
+    def reschedule(self, actor: Any) -> None:
+        """Recompute `actor`'s speed from its status effects and requeue it."""
+        state = self._state.get(id(actor))
+        if state is None:
+            return
+        state[1] = self._energy(state)
+        state[2] = self.now
+        state[3] = actor_speed(actor, self.base_speed)
+        self._push(state)
+
+    def pop_due(self) -> Iterator[Any]:
+        """Yield actors whose next action is due by `now`, earliest first.
+
+        The caller must `spend` each yielded actor before asking for the next
+        one; an actor with energy for several actions is yielded again.
+        """
+        heap = self._heap
+        state_of = self._state
+        while heap and heap[0][0] <= self.now:
+            _, _, gen, actor = heapq.heappop(heap)
+            state = state_of.get(id(actor))
+            if state is None or state[5] != gen:
+                continue
+            yield actor
+
+    def spend(self, actor: Any, cost: int = ACTION_COST) -> None:
+        """Charge `actor` for one action and queue its next one."""
+        state = self._state.get(id(actor))
+        if state is None:
+            return
+        state[1] = self._energy(state) - cost
+        state[2] = self.now
+        self._push(state)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _energy(self, state: list) -> int:
+        return state[1] + state[3] * (self.now - state[2])
+
+    def _push(self, state: list) -> None:
+        self._generation += 1
+        state[5] = self._generation
+        energy, since, speed = state[1], state[2], state[3]
+        if energy >= ACTION_COST:
+            due = since
+        elif speed <= 0:
+            # Paralyzed: requeued by _effect_changed when the effect ends
+            return
+        else:
+            due = since + -(-(ACTION_COST - energy) // speed)
+        heapq.heappush(self._heap, (due, state[4], state[5], state[0]))
+
+    def _effect_changed(self, actor: Any, name: str) -> None:
+        if name in SPEED_EFFECTS:
+            self.reschedule(actor)
+
+    def _unlisten(self, actor: Any) -> None:
+        manager = getattr(actor, 'status_manager', None)
+        if manager is not None and getattr(manager, 'on_change', None) is not None:
+            manager.on_change = None
@@ -1,13 +1,24 @@
-import math
 import random
-from typing import List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 
-from app.lib.core.engine.pathfinding import find_path
+from app.lib.core.engine.ai_scheduler import AIScheduler
+from app.lib.core.engine.geometry import dist2, in_range
+from app.lib.core.engine.pathfinding import FlowField, SafetyMap
+from app.lib.core.engine.spatial import SpatialIndex
 from app.lib.core.logger import debug
-from app.lib.utils import _apply_damage_modifiers, _get_status_effect_modifier, roll_dice
+from app.lib.utils import _apply_damage_modifiers, _get_status_effect_modifier, _parse_damage_expr, roll_dice
 from app.model.entity import Entity
 from app.model.status_effects import StatusEffectManager
-from config import DOOR_CLOSED, DOOR_OPEN, FLOOR, SECRET_DOOR_FOUND, SECRET_DOOR, STAIRS_DOWN, STAIRS_UP
+from config import DOOR_CLOSED, DOOR_OPEN, SECRET_DOOR_FOUND
+
+# How far (in steps) the shared player flow field reaches. Chasers farther
+# out than this fall back to their own A* search.
+PLAYER_FLOW_RADIUS = 40
+
+# Unaware entities farther than this from the player are parked by the AI
+# scheduler and skip their turns until something wakes them.
+AI_UPDATE_DISTANCE = 20
 
 
 class EntityManager:
@@ -18,16 +29,25 @@ class EntityManager:
         self.entities = []
         # Performance: spatial hash for O(1) entity lookups by position
         self._spatial_hash: dict[Tuple[int, int], Entity] = {}
+        # Bucketed index for range queries and per-template population counts
+        self.index = SpatialIndex()
+        # Active / dormant / sleeping tiers; only the active tier is updated
+        self.scheduler = AIScheduler(AI_UPDATE_DISTANCE)
+        # Distance-to-player map shared by every approaching entity
+        self._player_flow = FlowField()
+        # Escape map for fleeing entities, rebuilt lazily from the flow field
+        self._safety_map = SafetyMap()
+        self._safety_source = -1
+        # Seconds spent per AI phase during the last update_entities()
+        self.turn_profile: Dict[str, float] = {}
     
     def _is_walkable_for_ai(self, x: int, y: int) -> bool:
-        if not (0 <= x < self.game.map_width and 0 <= y < self.game.map_height):
+        grid = self.game.current_map
+        if not grid:
             return False
-        if not self.game.current_map:
-            return False
-        tile = self.game.current_map[y][x]
         # AI can path through floors, stairs, and open doors only.
         # Closed doors and secret doors must be opened first and are not considered walkable for pathfinding.
-        if tile not in (FLOOR, STAIRS_DOWN, STAIRS_UP, DOOR_OPEN):
+        if not grid.is_ai_passable(x, y):
             return False
         if self.get_entity_at(x, y):
             return False
@@ -36,29 +56,112 @@ class EntityManager:
             return False
         return True
 
+    def _player_flow_field(self) -> Optional[FlowField]:
+        """Return the player flow field, rebuilding it only if the player
+        moved or the map changed since it was last computed."""
+        grid = self.game.current_map
+        player = self.game.player
+        if not grid or not player or not getattr(player, 'position', None):
+            return None
+        origin = (player.position[0], player.position[1])
+        field = self._player_flow
+        if not field.is_current(grid, origin, grid.ai_passable):
+            t0 = time.perf_counter()
+            field.compute(grid, origin, grid.ai_passable, max_dist=PLAYER_FLOW_RADIUS)
+            self._profile('flow', t0)
+            debug("[AI][FLOW] recomputed from %s (%d tiles)", origin, field.reached, channel="AI")
+        return field
+
+    def _player_safety_map(self) -> Optional[SafetyMap]:
+        """Return the escape map, rebuilding it at most once per flow field
+        (i.e. once per turn) and only when something actually flees."""
+        field = self._player_flow_field()
+        if field is None:
+            return None
+        if self._safety_source != field.computations:
+            t0 = time.perf_counter()
+            self._safety_map.compute(field)
+            self._safety_source = field.computations
+            self._profile('safety', t0)
+            debug("[AI][FLOW] safety map rebuilt (%d tiles)", field.reached, channel="AI")
+        return self._safety_map
+
+    def _flee_step(self, entity: Entity) -> Optional[Tuple[int, int]]:
+        """Safest neighbouring step for `entity`, or None if it is cornered or
+        outside the player's flow field."""
+        safety = self._player_safety_map()
+        if safety is None:
+            return None
+        ex, ey = entity.position
+        steps = safety.escape_steps(ex, ey, self._spatial_hash)
+        return steps[0] if steps else None
+
+    def _profile(self, phase: str, started: float) -> None:
+        self.turn_profile[phase] = self.turn_profile.get(phase, 0.0) + (time.perf_counter() - started)
+
+    def _flow_step(self, entity: Entity, toward: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int]]:
+        """Next downhill step for `entity` on the player flow field.
+
+        With `toward` set (a flank tile), the downhill step closest to it is
+        preferred. Returns None when the entity is off the field or every
+        downhill neighbour is occupied.
+        """
+        field = self._player_flow_field()
+        if field is None:
+            return None
+        ex, ey = entity.position
+        steps = field.downhill(ex, ey, self._spatial_hash)
+        if not steps:
+            return None
+        if toward is not None and len(steps) > 1:
+            tx, ty = toward
+            return min(steps, key=lambda p: abs(p[0] - tx) + abs(p[1] - ty))
+        return steps[0]
+
     def _approach(self, entity: Entity, px: int, py: int) -> None:
         ex, ey = entity.position
-        path = find_path(self.game.map_width, self.game.map_height, (ex, ey), (px, py), self._is_walkable_for_ai, max_nodes=500)
+        player = self.game.player
+        if player and tuple(player.position) == (px, py):
+            # Chasing the player: descend the shared flow field (O(1) per step)
+            step = self._flow_step(entity)
+            if step is not None:
+                if step == (px, py):
+                    debug("[AI][APPROACH] %s adjacent -> attack player", entity.name, channel="AI")
+                    self._entity_attack(entity)
+                else:
+                    debug("[AI][APPROACH] %s flow step (%s,%s)->%s", entity.name, ex, ey, step, channel="AI")
+                    self._move_entity(entity, step[0], step[1])
+                return
+        # Other monsters block; the player's tile is the goal (attack on arrival)
+        path = self.game.pathfinder.find_path((ex, ey), (px, py), blocked=self._spatial_hash.keys(),
+                                              passable=self.game.current_map.ai_passable, max_nodes=500)
+        if not path:
+            hierarchy = getattr(self.game, 'path_hierarchy', None)
+            if hierarchy is not None and hierarchy.active:
+                # Over the flat search budget on a large map: plan over the cluster graph
+                path = hierarchy.find_path((ex, ey), (px, py), 'ai_passable')
+                if path and path[0] in self._spatial_hash:
+                    path = []
         if path:
-            debug(f"[AI][APPROACH] {entity.name} path_len={len(path)} next={path[0]} target=({px},{py})")
+            debug("[AI][APPROACH] %s path_len=%s next=%s target=(%s,%s)", entity.name, len(path), path[0], px, py, channel="AI")
             nx, ny = path[0]
             if [nx, ny] != [px, py]:
                 self._move_entity(entity, nx, ny)
             else:
                 # Adjacent -> attack
-                debug(f"[AI][APPROACH] {entity.name} adjacent -> attack player")
+                debug("[AI][APPROACH] %s adjacent -> attack player", entity.name, channel="AI")
                 self._entity_attack(entity)
         else:
-            debug(f"[AI][APPROACH] {entity.name} no path -> naive step toward player")
+            debug("[AI][APPROACH] %s no path -> naive step toward player", entity.name, channel="AI")
             # Fallback naive step
             dx = 0 if px == ex else (1 if px > ex else -1)
             dy = 0 if py == ey else (1 if py > ey else -1)
             nx, ny = ex + dx, ey + dy
             if self._is_walkable_for_ai(nx, ny):
-                debug(f"[AI][APPROACH] {entity.name} naive move ({ex},{ey})->({nx},{ny})")
+                debug("[AI][APPROACH] %s naive move (%s,%s)->(%s,%s)", entity.name, ex, ey, nx, ny, channel="AI")
                 self._move_entity(entity, nx, ny)
             else:
-                debug(f"[AI][APPROACH] {entity.name} naive blocked target=({nx},{ny})")
+                debug("[AI][APPROACH] %s naive blocked target=(%s,%s)", entity.name, nx, ny, channel="AI")
 
     
     def _wander_entity(self, entity: Entity) -> None:
@@ -67,13 +170,13 @@ class EntityManager:
             dx, dy = random.choice([(1,0),(-1,0),(0,1),(0,-1)])
             nx, ny = ex + dx, ey + dy
             if self._is_walkable_for_ai(nx, ny):
-                debug(f"[AI][WANDER] {entity.name} move ({ex},{ey})->({nx},{ny})")
+                debug("[AI][WANDER] %s move (%s,%s)->(%s,%s)", entity.name, ex, ey, nx, ny, channel="AI")
                 self._move_entity(entity, nx, ny)
                 break
         else:
-            debug(f"[AI][WANDER] {entity.name} no valid move from ({ex},{ey})")
+            debug("[AI][WANDER] %s no valid move from (%s,%s)", entity.name, ex, ey, channel="AI")
 
-    def _aggressive_entity(self, entity: Entity, dist: float, px: int, py: int) -> None:
+    def _aggressive_entity(self, entity: Entity, d2: int, px: int, py: int) -> None:
         """
         Enhanced aggressive AI with tactical combat decisions.
         - Smarter fleeing based on HP and distance
@@ -84,15 +187,14 @@ class EntityManager:
         
         # Dynamic fleeing with better logic
         if entity.status_manager.has_behavior('flee'):
-            debug(f"[AI][AGG] {entity.name} fleeing dist={dist:.2f}")
+            debug("[AI][AGG] %s fleeing d2=%d", entity.name, d2, channel="AI")
             # Flee away from player, prefer longer escape routes
             flee_options = []
             for dx, dy in [(1,0), (-1,0), (0,1), (0,-1), (1,1), (1,-1), (-1,1), (-1,-1)]:
                 nx, ny = ex + dx, ey + dy
                 if self._is_walkable_for_ai(nx, ny):
-                    # Score based on distance gained from player
-                    new_dist = math.sqrt((nx - px)**2 + (ny - py)**2)
-                    flee_options.append(((nx, ny), new_dist))
+                    # Score based on (squared) distance gained from player
+                    flee_options.append(((nx, ny), dist2(nx, ny, px, py)))
             
             if flee_options:
                 # Pick position that maximizes distance from player
@@ -109,49 +211,49 @@ class EntityManager:
             return
         
         if not entity.aware_of_player:
-            debug(f"[AI][AGG] {entity.name} not aware; skip combat logic dist={dist:.2f}")
+            debug("[AI][AGG] %s not aware; skip combat logic d2=%d", entity.name, d2, channel="AI")
             return
         
         # Tactical ranged/spell usage based on distance and HP
         hp_percent = entity.hp / max(1, entity.max_hp)
         prefer_ranged = hp_percent < 0.5  # Prefer ranged when wounded
         
-        if dist > 1.5:
+        if not in_range(d2, 1.5):
             acted = False
             # Wounded enemies prefer ranged combat
             ranged_chance = 0.70 if prefer_ranged else 0.55
             
-            if entity.ranged_attack and dist <= entity.ranged_range and self.game.fov._line_of_sight(ex, ey, px, py):
+            if entity.ranged_attack and in_range(d2, entity.ranged_range) and self.game.fov._line_of_sight(ex, ey, px, py):
                 if random.random() < ranged_chance:
-                    self._entity_ranged_attack(entity, px, py, dist)
+                    self._entity_ranged_attack(entity, px, py, d2)
                     acted = True
-                    debug(f"[AI][AGG] {entity.name} uses ranged attack dist={dist:.2f}")
+                    debug("[AI][AGG] %s uses ranged attack d2=%d", entity.name, d2, channel="AI")
             
             if not acted and entity.spell_list and entity.mana > 0:
                 spell_chance = 0.50 if prefer_ranged else 0.35
                 if random.random() < spell_chance:
-                    if self._entity_cast_spell(entity, px, py, dist):
+                    if self._entity_cast_spell(entity, px, py, d2):
                         acted = True
-                        debug(f"[AI][AGG] {entity.name} casts spell dist={dist:.2f}")
+                        debug("[AI][AGG] %s casts spell d2=%d", entity.name, d2, channel="AI")
             
             # If ranged attack used, consider maintaining distance
-            if acted and prefer_ranged and dist < 4:
+            if acted and prefer_ranged and d2 < 4 * 4:
                 # Back up slightly after ranged attack
-                debug(f"[AI][AGG] {entity.name} acted ranged+prefer_ranged; holding position dist={dist:.2f}")
+                debug("[AI][AGG] %s acted ranged+prefer_ranged; holding position d2=%d", entity.name, d2, channel="AI")
                 return
             elif acted:
-                debug(f"[AI][AGG] {entity.name} acted (ranged/spell); end turn dist={dist:.2f}")
+                debug("[AI][AGG] %s acted (ranged/spell); end turn d2=%d", entity.name, d2, channel="AI")
                 return
         
         # Melee engagement
-        if dist <= 1.5:
-            debug(f"[AI][AGG] {entity.name} melee attack dist={dist:.2f}")
+        if in_range(d2, 1.5):
+            debug("[AI][AGG] %s melee attack d2=%d", entity.name, d2, channel="AI")
             self._entity_attack(entity)
         else:
-            debug(f"[AI][AGG] {entity.name} approaches player dist={dist:.2f}")
+            debug("[AI][AGG] %s approaches player d2=%d", entity.name, d2, channel="AI")
             self._approach(entity, px, py)
 
-    def _pack_entity(self, entity: Entity, dist: float, px: int, py: int) -> None:
+    def _pack_entity(self, entity: Entity, d2: int, px: int, py: int) -> None:
         """
         Enhanced pack AI with coordination, morale, and tactics.
         - Allies boost morale and reduce flee chance
@@ -162,15 +264,11 @@ class EntityManager:
         ex, ey = entity.position
         
         # Count nearby allies (same template_id within detection range)
-        ally_count = 0
-        allies_nearby = []
-        for other in self.entities:
-            if other.hp > 0 and other.template_id == entity.template_id and other != entity:
-                ox, oy = other.position
-                ally_dist = math.sqrt((ex - ox)**2 + (ey - oy)**2)
-                if ally_dist <= entity.detection_range:
-                    ally_count += 1
-                    allies_nearby.append(other)
+        allies_nearby = [
+            other for other in self.index.in_radius(ex, ey, entity.detection_range)
+            if other.hp > 0 and other.template_id == entity.template_id and other is not entity
+        ]
+        ally_count = len(allies_nearby)
         
         # Dynamic fleeing based on morale (HP% + ally presence)
         hp_percent = entity.hp / max(1, entity.max_hp)
@@ -192,10 +290,14 @@ class EntityManager:
             # Coordinated retreat: try to move toward nearest ally or away from player
             if allies_nearby:
                 # Move toward nearest healthy ally
-                nearest_ally = min(allies_nearby, key=lambda a: math.sqrt((ex - a.position[0])**2 + (ey - a.position[1])**2))
+                nearest_ally = min(allies_nearby, key=lambda a: dist2(ex, ey, a.position[0], a.position[1]))
                 target_x, target_y = nearest_ally.position
             else:
-                # Just flee away from player
+                # Just flee away from player, following the safety map
+                step = self._flee_step(entity)
+                if step is not None:
+                    self._move_entity(entity, step[0], step[1])
+                    return
                 target_x = ex - (1 if px > ex else -1 if px < ex else 0)
                 target_y = ey - (1 if py > ey else -1 if py < ey else 0)
             
@@ -208,7 +310,7 @@ class EntityManager:
             return
         
         # Awareness and calling for help
-        if not entity.aware_of_player and dist <= entity.detection_range and self.game.fov._line_of_sight(ex, ey, px, py):
+        if not entity.aware_of_player and in_range(d2, entity.detection_range) and self.game.fov._line_of_sight(ex, ey, px, py):
             entity.aware_of_player = True
             # Call for help - alert nearby sleeping/unaware allies
             if ally_count > 0:
@@ -216,6 +318,7 @@ class EntityManager:
                     if not ally.aware_of_player and random.random() < 0.7:
                         ally.aware_of_player = True
                         ally.is_sleeping = False  # Wake up!
+                        self.wake_entity(ally)
                 if random.random() < 0.4:
                     self.game.log_event(f"{entity.name} howls for the pack!")
         
@@ -223,21 +326,21 @@ class EntityManager:
             return
         
         # Pack ranged/spell support
-        if dist > 1.5:
-            if entity.ranged_attack and dist <= entity.ranged_range and self.game.fov._line_of_sight(ex, ey, px, py):
+        if not in_range(d2, 1.5):
+            if entity.ranged_attack and in_range(d2, entity.ranged_range) and self.game.fov._line_of_sight(ex, ey, px, py):
                 if random.random() < 0.50:  # Increased ranged usage
-                    self._entity_ranged_attack(entity, px, py, dist)
+                    self._entity_ranged_attack(entity, px, py, d2)
                     return
             if entity.spell_list and entity.mana > 0 and random.random() < 0.30:
-                if self._entity_cast_spell(entity, px, py, dist):
+                if self._entity_cast_spell(entity, px, py, d2):
                     return
         
         # Melee: attempt to surround player
-        if dist <= 1.5:
+        if in_range(d2, 1.5):
             self._entity_attack(entity)
         else:
             # Surround tactics: if allies are engaging, try to flank
-            if ally_count >= 2 and dist <= 4:
+            if ally_count >= 2 and in_range(d2, 4):
                 # Find position adjacent to player not occupied by allies
                 surround_positions = [
                     (px + dx, py + dy)
@@ -249,14 +352,19 @@ class EntityManager:
                     if self._is_walkable_for_ai(pos[0], pos[1]) and not self.get_entity_at(pos[0], pos[1])
                 ]
                 if open_flanks:
-                    # Pick closest flank position
+                    # Pick closest flank position and head there downhill on
+                    # the player flow field, steering toward the flank
                     target = min(open_flanks, key=lambda p: abs(p[0] - ex) + abs(p[1] - ey))
-                    self._approach(entity, target[0], target[1])
+                    step = self._flow_step(entity, toward=target)
+                    if step is not None and step != (px, py):
+                        self._move_entity(entity, step[0], step[1])
+                    else:
+                        self._approach(entity, target[0], target[1])
                     return
             # Default: approach directly
             self._approach(entity, px, py)
 
-    def _thief_entity(self, entity: Entity, dist: float, px: int, py: int) -> None:
+    def _thief_entity(self, entity: Entity, d2: int, px: int, py: int) -> None:
         """
         Enhanced thief AI with stealth, ambush, and tactical theft.
         - Hides in shadows (unlit tiles) to ambush
@@ -273,7 +381,19 @@ class EntityManager:
         
         # Fleeing after theft
         if entity.status_manager.has_behavior('flee'):
-            # Try to hide in nearest shadow while fleeing
+            # Escape along the safety map, preferring steps into shadow
+            safety = self._player_safety_map()
+            escape_steps = safety.escape_steps(ex, ey, self._spatial_hash) if safety else []
+            if escape_steps:
+                fov_vis = self.game.fov.visibility
+                shadowed = [
+                    (nx, ny) for (nx, ny) in escape_steps
+                    if 0 <= ny < len(fov_vis) and 0 <= nx < len(fov_vis[0]) and fov_vis[ny][nx] < 2
+                ]
+                nx, ny = shadowed[0] if shadowed else escape_steps[0]
+                self._move_entity(entity, nx, ny)
+                return
+            # Cornered or off the map: try to hide in nearest shadow
             escape_options = []
             for dx, dy in [(1,0), (-1,0), (0,1), (0,-1), (1,1), (1,-1), (-1,1), (-1,-1)]:
                 nx, ny = ex + dx, ey + dy
@@ -304,13 +424,13 @@ class EntityManager:
         detection_mod = 0.5 if in_shadows else 1.0
         effective_detection_range = entity.detection_range * detection_mod
         
-        if dist <= effective_detection_range and self.game.fov._line_of_sight(ex, ey, px, py):
+        if in_range(d2, effective_detection_range) and self.game.fov._line_of_sight(ex, ey, px, py):
             if not entity.aware_of_player and random.random() < detection_mod:
                 entity.aware_of_player = True
         
         if not entity.aware_of_player:
             # Stealth mode: try to position for ambush
-            if dist <= entity.detection_range * 1.5:
+            if in_range(d2, entity.detection_range * 1.5):
                 # Try to circle around to flank
                 flank_positions = [
                     (px + dx, py + dy)
@@ -327,16 +447,16 @@ class EntityManager:
             return
         
         # Ambush: ranged attack from stealth
-        if in_shadows and dist > 1.5 and dist <= entity.ranged_range:
+        if in_shadows and not in_range(d2, 1.5) and in_range(d2, entity.ranged_range):
             if entity.ranged_attack and self.game.fov._line_of_sight(ex, ey, px, py):
                 if random.random() < 0.70:  # High chance from stealth
-                    self._entity_ranged_attack(entity, px, py, dist)
+                    self._entity_ranged_attack(entity, px, py, d2)
                     if random.random() < 0.4:
                         self.game.log_event(f"{entity.name} strikes from the shadows!")
                     return
         
         # Close range: theft attempt
-        if dist <= 1.5:
+        if in_range(d2, 1.5):
             # Theft attempt
             if getattr(self.game.player, 'gold', 0) > 0 and random.random() < 0.60 and self.game.player:
                 current_gold = getattr(self.game.player, 'gold', 0)
@@ -359,7 +479,7 @@ class EntityManager:
                 entity.status_manager.add_effect('Fleeing', 12)
         else:
             # Approach cautiously, trying to stay in shadows when possible
-            if in_shadows and dist <= 4:
+            if in_shadows and in_range(d2, 4):
                 # Stay hidden, circle closer
                 circle_positions = [
                     (px + dx, py + dy)
@@ -374,12 +494,12 @@ class EntityManager:
                     self._approach(entity, target[0], target[1])
                     return
             # Default approach is now gated by a pursuit check
-            if self._should_pursue_thief(dist):
-                debug(f"[AI][THIEF] {entity.name} chooses to pursue the player")
+            if self._should_pursue_thief(d2):
+                debug("[AI][THIEF] %s chooses to pursue the player", entity.name, channel="AI")
                 self._approach(entity, px, py)
             else:
                 # Prefer to hold or slip into darker tiles away from player
-                debug(f"[AI][THIEF] {entity.name} decides not to pursue; staying hidden")
+                debug("[AI][THIEF] %s decides not to pursue; staying hidden", entity.name, channel="AI")
                 moved = False
                 best_opt = None
                 best_score = None
@@ -404,7 +524,7 @@ class EntityManager:
                     pass
 
     # Pursuit decision helpers
-    def _should_pursue_beggar(self, dist: float) -> bool:
+    def _should_pursue_beggar(self, d2: int) -> bool:
         """Decide if a beggar chooses to pursue the player.
         Factors: player gold, distance, and time of day.
         """
@@ -412,13 +532,13 @@ class EntityManager:
         if pgold <= 0:
             return False
         base = 0.45  # baseline when you have gold
-        if dist < 5:
+        if d2 < 5 * 5:
             base += 0.20
         if not self.game.fov._is_daytime():
             base += 0.10
         return random.random() < min(0.85, base)
 
-    def _should_pursue_thief(self, dist: float) -> bool:
+    def _should_pursue_thief(self, d2: int) -> bool:
         """Decide if a thief chooses to actively pursue the player.
         Factors: player gold, distance, and time of day.
         """
@@ -430,7 +550,7 @@ class EntityManager:
             base += 0.15
         if not self.game.fov._is_daytime():
             base += 0.15
-        if dist < 6:
+        if d2 < 6 * 6:
             base += 0.10
         return random.random() < min(0.9, base)
 
@@ -489,12 +609,12 @@ class EntityManager:
     # -------------------------
     # Ranged & Spell Attacks
     # -------------------------
-    def _entity_ranged_attack(self, entity: Entity, px: int, py: int, dist: float) -> None:
+    def _entity_ranged_attack(self, entity: Entity, px: int, py: int, d2: int) -> None:
         data = entity.ranged_attack
         if not data:
             return
         dmg_expr = data.get('damage', '1d4')
-        dmg = self.game._parse_damage_expr(dmg_expr)
+        dmg = _parse_damage_expr(dmg_expr)
         # Spawn a travelling projectile; damage is applied on impact during projectile update
         start = (entity.position[0], entity.position[1])
         end = (px, py)
@@ -520,7 +640,7 @@ class EntityManager:
         self.game._spawn_projectile(start, end, dmg, kind='ranged', source='entity', on_hit_msg=f"{entity.name}'s {data.get('name','ranged')} hits you for {dmg}!", impact_effect_type='hit', impact_duration=10)
         self.game.log_event(f"{entity.name} fires {data.get('name','ranged')}.")
 
-    def _entity_cast_spell(self, entity: Entity, px: int, py: int, dist: float) -> bool:
+    def _entity_cast_spell(self, entity: Entity, px: int, py: int, d2: int) -> bool:
         if not entity.spell_list or entity.mana <= 0:
             return False
         # Filter castable spells (enough mana, appropriate distance)
@@ -537,10 +657,10 @@ class EntityManager:
                 mana_cost = first_class.get('mana', 0)
             if mana_cost > entity.mana:
                 continue
-            # Range heuristic: attack spells require LOS and dist <= 10; buffs always cast; others need LOS if requires_target
+            # Range heuristic: attack spells require LOS and range <= 10; buffs always cast; others need LOS if requires_target
             if sp.get('effect_type') in ('attack','debuff') and not self.game.fov._line_of_sight(entity.position[0], entity.position[1], px, py):
                 continue
-            if sp.get('requires_target') and dist > 10:
+            if sp.get('requires_target') and not in_range(d2, 10):
                 continue
             viable.append((sp, mana_cost))
         if not viable:
@@ -551,7 +671,7 @@ class EntityManager:
         name = sp.get('name','Spell')
         if etype == 'attack':
             dmg_expr = sp.get('damage','2d4')
-            dmg = self.game._parse_damage_expr(dmg_expr)
+            dmg = _parse_damage_expr(dmg_expr)
             dead = self.game._inflict_player_damage(dmg, f"{entity.name} ({name})")
             if dead:
                 self.game.log_event(f"{entity.name}'s {name} annihilates you for {dmg}!")
@@ -612,6 +732,9 @@ class EntityManager:
             if e.hp > 0 or getattr(e, '_death_processed', False):
                 continue
             setattr(e, '_death_processed', True)
+            self.index.mark_dead(e)
+            # Parked entities must be active to play out their death
+            self.scheduler.wake(e)
             x, y = e.position
             drops, gold_amt = e.get_drops() if hasattr(e, 'get_drops') else ([], 0)
             
@@ -653,7 +776,7 @@ class EntityManager:
             try:
                 e.is_dying = True
                 e.death_animation_frame = 0
-                debug(f"[ENTITY] Marked {e.name} as dying (frame reset to 0)")
+                debug("[ENTITY] Marked %s as dying (frame reset to 0)", e.name, channel="AI")
             except Exception:
                 pass
 
@@ -664,7 +787,7 @@ class EntityManager:
         if entity.clone_rate <= 0 or entity.hp <= 0 or not self.game.current_map:
             return
         # Count existing of same template
-        same = sum(1 for e in self.entities if e.template_id == entity.template_id and e.hp > 0)
+        same = self.index.population(entity.template_id)
         if entity.clone_max_population and same >= entity.clone_max_population:
             return
         if random.random() >= entity.clone_rate:
@@ -677,9 +800,7 @@ class EntityManager:
             if self._is_walkable_for_ai(nx, ny):
                 try:
                     new_ent = Entity(entity.template_id, self.game.current_depth, [nx, ny])
-                    self.entities.append(new_ent)
-                    # Performance: update spatial hash for new entity
-                    self._spatial_hash[(nx, ny)] = new_ent
+                    self.add_entity(new_ent)
                     self.game.log_event(f"{entity.name} divides!")
                 except Exception:
                     pass
@@ -702,7 +823,7 @@ class EntityManager:
             return
         if not (0 <= x < self.game.map_width and 0 <= y < self.game.map_height):
             return
-        tile = self.game.current_map[y][x]
+        tile = self.game.current_map.char_at(x, y)
         
         # Check if tile is a closed door or revealed secret door - AI may open it
         # AI cannot open unrevealed secret doors (SECRET_DOOR)
@@ -711,32 +832,28 @@ class EntityManager:
             # appropriate intelligence/appendages). Templates can explicitly opt-in/out using
             # the `can_open_doors` flag. If not allowed, treat the door as blocking movement.
             if not self._can_entity_open_doors(entity):
-                debug(f"[AI][DOOR] {entity.name} cannot open door at ({x},{y}) - blocked")
+                debug("[AI][DOOR] %s cannot open door at (%s,%s) - blocked", entity.name, x, y, channel="AI")
                 return
             # Open the door (opening consumes the AI's action)
-            self.game.current_map[y][x] = DOOR_OPEN
+            self.game.set_tile(x, y, DOOR_OPEN)
             self.game.log_event(f"{entity.name} opens a door.")
             self.game.noise_manager.create_noise((x, y), radius=2, intensity=2)
             self.game.fov.update_fov()
-            debug(f"[AI][DOOR] {entity.name} opened door at ({x},{y})")
-            try:
-                self.game.mark_dirty_tile(x, y)
-            except Exception:
-                pass
+            debug("[AI][DOOR] %s opened door at (%s,%s)", entity.name, x, y, channel="AI")
             # Don't move yet - door opening takes their action this turn
             return
         
         # Normal walkability check
-        if tile not in (FLOOR, STAIRS_DOWN, STAIRS_UP, DOOR_OPEN):
-            debug(f"[AI][MOVE] {entity.name} blocked by tile {tile} at ({x},{y})")
+        if not self.game.current_map.is_ai_passable(x, y):
+            debug("[AI][MOVE] %s blocked by tile %s at (%s,%s)", entity.name, tile, x, y, channel="AI")
             return
         # Block if another entity occupies target
         if self.get_entity_at(x, y):
-            debug(f"[AI][MOVE] {entity.name} blocked by entity at ({x},{y})")
+            debug("[AI][MOVE] %s blocked by entity at (%s,%s)", entity.name, x, y, channel="AI")
             return
         # Block if player occupies target
         if self.game.player and hasattr(self.game.player, 'position') and tuple(self.game.player.position) == (x, y):
-            debug(f"[AI][MOVE] {entity.name} blocked by player at ({x},{y})")
+            debug("[AI][MOVE] %s blocked by player at (%s,%s)", entity.name, x, y, channel="AI")
             return
         prev: Tuple[int, int] = (entity.position[0], entity.position[1])
         # Update sprite direction based on movement
@@ -757,8 +874,9 @@ class EntityManager:
         # Always assign tuple for consistency
         entity.position = (x, y)
         self._spatial_hash[(x, y)] = entity
+        self.index.move(entity, x, y)
         
-        debug(f"[AI][MOVE] {entity.name} {prev}->({x},{y})")
+        debug("[AI][MOVE] %s %s->(%s,%s)", entity.name, prev, x, y, channel="AI")
         self.game._on_actor_moved(entity, prev, (x, y))
     
     # -------------------------
@@ -771,10 +889,49 @@ class EntityManager:
             return entity
         return None
 
+    def add_entity(self, entity: Entity) -> None:
+        """Start tracking a newly created entity (summons, clones)."""
+        self.entities.append(entity)
+        pos = (int(entity.position[0]), int(entity.position[1]))
+        self._spatial_hash[pos] = entity
+        self.index.insert(entity)
+        self.scheduler.add(entity)
+
+    def rebuild_index(self) -> None:
+        """Rebuild the tile hash and spatial index from ``self.entities``."""
+        self._spatial_hash.clear()
+        self.index.clear()
+        for entity in self.entities:
+            if hasattr(entity, 'position') and entity.position:
+                try:
+                    pos: Tuple[int, int] = (int(entity.position[0]), int(entity.position[1]))
+                except Exception:
+                    continue
+                self._spatial_hash[pos] = entity
+                self.index.insert(entity)
+        self.scheduler.reset(self.entities, getattr(self.game, 'time', 0))
+
+    def wake_entity(self, entity: Entity) -> None:
+        """Return a parked (far, unaware) entity to the active AI tier."""
+        if self.scheduler.wake(entity):
+            debug("[AI] Woke %s at %s", entity.name, entity.position, channel="AI")
+
+    def wake_all(self) -> None:
+        """Return every parked entity to the active AI tier (alarms)."""
+        woken = self.scheduler.wake_all()
+        if woken:
+            debug("[AI] Woke %s parked entities", woken, channel="AI")
+
+    def settle_dormant(self) -> None:
+        """Bring parked entities' status effects up to date (before saving)."""
+        self.scheduler.settle()
+
     def remove_entity(self, entity: Entity) -> None:
         """Remove an entity from tracking and mark its tile dirty for redraw."""
         if entity in self.entities:
             self.entities.remove(entity)
+        self.index.remove(entity)
+        self.scheduler.discard(entity)
         try:
             pos = (int(entity.position[0]), int(entity.position[1]))
         except Exception:
@@ -837,25 +994,37 @@ class EntityManager:
     def update_entities(self) -> None:
         # Early diagnostics to understand why AI might be skipped
         if not self.game.player:
-            debug("[AI] Skipped entity update: no player")
+            debug("[AI] Skipped entity update: no player", channel="AI")
             return
         if not self.game.current_map:
-            debug("[AI] Skipped entity update: no current_map")
+            debug("[AI] Skipped entity update: no current_map", channel="AI")
             return
         if not self.entities:
-            debug("[AI] Skipped entity update: no entities present")
+            debug("[AI] Skipped entity update: no entities present", channel="AI")
             return
-        debug(f"[AI] Updating {len(self.entities)} entities")
+        debug("[AI] Updating %s entities", len(self.entities), channel="AI")
+        self.turn_profile = {}
+        turn_started = time.perf_counter()
         px, py = getattr(self.game.player, 'position', (0, 0))
+        time_of_day = 'Day' if self.game.fov._is_daytime() else 'Night'
         
-        # Performance: skip full AI updates for distant entities
-        # Only process entities within reasonable distance from player
-        AI_UPDATE_DISTANCE = 20  # Tune this value based on map size
+        # Performance: only the active tier is updated. Far, unaware entities
+        # are parked until the player approaches or something alerts them
+        scheduler = self.scheduler
+        if not scheduler.in_sync(self.entities):
+            # Entity list replaced without rebuild_index(); start everyone active
+            scheduler.reset(self.entities, scheduler.turn)
+        scheduler.set_phase(time_of_day)
+        scheduler.wake_near(self.index, px, py)
+        turn = getattr(self.game, 'time', scheduler.turn)
+        scheduler.begin_turn(turn)
         
         entities_processed = 0
         entities_skipped = 0
+        # Entities that passed upkeep (awake, alive, near) and may act if due
+        ready = set()
         
-        for entity in self.entities[:]:
+        for entity in scheduler.active():
             # Advance death animations/cleanup for dead entities so they do not linger
             if entity.hp <= 0:
                 # If death already processed (drops/xp), advance timer toward removal
@@ -866,19 +1035,19 @@ class EntityManager:
                         self.remove_entity(entity)
                 continue
             
-            # Calculate distance to player early for culling
+            # Calculate distance to player early for culling. Range checks here
+            # and in the AI routines compare squared distances (`in_range`)
             ex, ey = entity.position
-            dist = math.sqrt((ex - px) ** 2 + (ey - py) ** 2)
+            d2 = (ex - px) * (ex - px) + (ey - py) * (ey - py)
             
-            # Performance: skip AI updates for distant entities unless they're aware of player
-            # Always tick status effects and sleep state for all entities
-            if dist > AI_UPDATE_DISTANCE and not entity.aware_of_player:
-                # Still tick status effects even for distant entities
+            # Performance: park distant entities unless they're aware of player.
+            # This turn's status tick and sleep check happen now; later turns
+            # are fast-forwarded when the entity wakes
+            if not in_range(d2, AI_UPDATE_DISTANCE) and not entity.aware_of_player:
                 if hasattr(entity, 'status_manager'):
                     entity.status_manager.tick_effects()
-                # Update sleep state
-                time_of_day = 'Day' if self.game.fov._is_daytime() else 'Night'
                 entity.update_sleep_state(time_of_day)
+                scheduler.park(entity, turn)
                 entities_skipped += 1
                 continue
             
@@ -886,22 +1055,20 @@ class EntityManager:
             
             # Per-entity diagnostic summary
             debug(
-                f"[AI] ENTITY {entity.name} id={entity.template_id} pos={entity.position} ai={getattr(entity,'ai_type','?')} beh={getattr(entity,'behavior','')} "
-                f"sleepFlags(day={getattr(entity,'sleeps_during_day',False)},night={getattr(entity,'sleeps_during_night',False)}) aware={entity.aware_of_player} move_ctr={entity.move_counter:.2f} hp={entity.hp}/{entity.max_hp} hostile={entity.hostile}"
+                lambda: f"[AI] ENTITY {entity.name} id={entity.template_id} pos={entity.position} ai={getattr(entity,'ai_type','?')} beh={getattr(entity,'behavior','')} "
+                f"sleepFlags(day={getattr(entity,'sleeps_during_day',False)},night={getattr(entity,'sleeps_during_night',False)}) aware={entity.aware_of_player} energy={scheduler.queue.energy(entity)} hp={entity.hp}/{entity.max_hp} hostile={entity.hostile}",
+                channel="AI"
             )
             # Sleep logic (simple: skip if asleep)
-            time_of_day = 'Day' if self.game.fov._is_daytime() else 'Night'
             entity.update_sleep_state(time_of_day)
             if entity.is_sleeping:
-                debug(f"[AI]   -> sleeping during {time_of_day}; skipped")
+                debug("[AI]   -> sleeping during %s; skipped", time_of_day, channel="AI")
                 continue
 
             # Stealth detection check (only if entity hasn't already spotted player)
             if not entity.has_spotted_player and not entity.aware_of_player:
-                ex, ey = entity.position
-                dist = math.sqrt((ex - px) ** 2 + (ey - py) ** 2)
                 # Only check within reasonable range and with LOS
-                if dist <= entity.detection_range and self.game.fov._line_of_sight(ex, ey, px, py):
+                if in_range(d2, entity.detection_range) and self.game.fov._line_of_sight(ex, ey, px, py):
                     player_stealth = self.game.player.get_stealth_value()
                     entity_perception = entity.get_perception_value()
                     
@@ -924,9 +1091,9 @@ class EntityManager:
                         if not entity.hostile and entity.ai_type in ('aggressive', 'pack', 'thief'):
                             entity.hostile = True
                         self.game.log_event(f"{entity.name} spots you!")
-                        debug(f"[STEALTH] {entity.name} detected player: roll {perception_roll} (base+light:{entity_perception}+{light_modifier}) vs DC {stealth_dc} (light:{light_level})")
+                        debug("[STEALTH] %s detected player: roll %s (base+light:%s+%s) vs DC %s (light:%s)", entity.name, perception_roll, entity_perception, light_modifier, stealth_dc, light_level, channel="STEALTH")
                     else:
-                        debug(f"[STEALTH] {entity.name} failed to detect: roll {perception_roll} vs DC {stealth_dc} (light:{light_level})")
+                        debug("[STEALTH] %s failed to detect: roll %s vs DC %s (light:%s)", entity.name, perception_roll, stealth_dc, light_level, channel="STEALTH")
 
             # Tick status effects
             if hasattr(entity, 'status_manager'):
@@ -1002,56 +1169,24 @@ class EntityManager:
                             entity.status_manager.add_effect('Fleeing', 10)
                             self.game.log_event(f"{entity.name} panics!")
 
-            # Movement pacing
-            entity.move_counter += 1
-            if entity.move_counter < 2:
-                debug(f"[AI]   -> move skipped (pacing) move_counter={entity.move_counter:.2f}")
-                continue
-            entity.move_counter = 0
-
-            # Note: ex, ey, and dist already calculated above for distance culling
-
-            # Maintain awareness for entities that have already spotted player
-            if entity.has_spotted_player and dist <= entity.detection_range and self.game.fov._line_of_sight(ex, ey, px, py):
-                entity.aware_of_player = True
-            elif entity.has_spotted_player and (dist > entity.detection_range or not self.game.fov._line_of_sight(ex, ey, px, py)):
-                # Lose awareness if out of range or LOS is broken
-                entity.aware_of_player = False
-                debug(f"[STEALTH] {entity.name} lost sight of player")
+            ready.add(id(entity))
 
-            # Behavior routing
-            ai_type = getattr(entity, 'ai_type', 'passive')
-            behavior = getattr(entity, 'behavior', '')
-            if behavior in ('beggar', 'drunk', 'idiot') and self.game.current_depth == 0:
-                debug(f"[AI]   -> town_npc_behavior route: beh={behavior} dist={dist:.2f}")
-                self._town_npc_behavior(entity, behavior, dist, px, py)
-                continue
-            if ai_type == 'passive':
-                debug("[AI]   -> passive skip")
-                continue
-            elif ai_type == 'wander':
-                debug(f"[AI]   -> wander route dist={dist:.2f}")
-                self._wander_entity(entity)
-            elif ai_type == 'aggressive':
-                debug(f"[AI]   -> aggressive route dist={dist:.2f} aware={entity.aware_of_player}")
-                self._aggressive_entity(entity, dist, px, py)
-            elif ai_type == 'pack':
-                debug(f"[AI]   -> pack route dist={dist:.2f} aware={entity.aware_of_player}")
-                self._pack_entity(entity, dist, px, py)
-            elif ai_type == 'thief':
-                debug(f"[AI]   -> thief route dist={dist:.2f} aware={entity.aware_of_player}")
-                self._thief_entity(entity, dist, px, py)
+        # Actions: only entities whose next action is due are popped, in
+        # (due turn, queue join order) so the order is reproducible
+        queue = scheduler.queue
+        for entity in queue.pop_due():
+            if id(entity) in ready and entity.hp > 0:
+                self._take_action(entity, px, py)
             else:
-                # Default fallback aggressive-like
-                if entity.aware_of_player:
-                    debug(f"[AI]   -> fallback approach dist={dist:.2f}")
-                    self._approach(entity, px, py)
-            # Post-action cloning attempt
-            self._attempt_entity_clone(entity)
+                debug("[AI]   -> %s idles its action", entity.name, channel="AI")
+            queue.spend(entity)
         
         # Performance logging: show lazy AI culling statistics
         if entities_skipped > 0:
-            debug(f"[AI] Performance: processed {entities_processed}, skipped {entities_skipped} distant entities")
+            debug("[AI] Performance: processed %s, parked %s distant entities", entities_processed, entities_skipped, channel="AI")
+        debug(lambda: "[AI] Tiers: " + " ".join(f"{k}={v}" for k, v in scheduler.counts().items()), channel="AI")
+        self._profile('total', turn_started)
+        debug(lambda: "[AI] Turn profile: " + " ".join(f"{k}={v * 1000:.2f}ms" for k, v in self.turn_profile.items()), channel="AI")
         
         # Stealth feedback: periodic message if player avoided detection
         self.game._provide_stealth_feedback()
@@ -1059,6 +1194,50 @@ class EntityManager:
         # Process any deaths (drops/xp) after all actions
         self._process_entity_deaths()
 
+    def _take_action(self, entity: Entity, px: int, py: int) -> None:
+        """Run one AI action for an entity whose turn came up in the energy queue."""
+        ex, ey = entity.position
+        d2 = (ex - px) * (ex - px) + (ey - py) * (ey - py)
+
+        # Maintain awareness for entities that have already spotted player
+        in_detection = in_range(d2, entity.detection_range)
+        if entity.has_spotted_player and in_detection and self.game.fov._line_of_sight(ex, ey, px, py):
+            entity.aware_of_player = True
+        elif entity.has_spotted_player and (not in_detection or not self.game.fov._line_of_sight(ex, ey, px, py)):
+            # Lose awareness if out of range or LOS is broken
+            entity.aware_of_player = False
+            debug("[STEALTH] %s lost sight of player", entity.name, channel="STEALTH")
+
+        # Behavior routing
+        ai_type = getattr(entity, 'ai_type', 'passive')
+        behavior = getattr(entity, 'behavior', '')
+        if behavior in ('beggar', 'drunk', 'idiot') and self.game.current_depth == 0:
+            debug("[AI]   -> town_npc_behavior route: beh=%s d2=%d", behavior, d2, channel="AI")
+            self._town_npc_behavior(entity, behavior, d2, px, py)
+            return
+        if ai_type == 'passive':
+            debug("[AI]   -> passive skip", channel="AI")
+            return
+        elif ai_type == 'wander':
+            debug("[AI]   -> wander route d2=%d", d2, channel="AI")
+            self._wander_entity(entity)
+        elif ai_type == 'aggressive':
+            debug("[AI]   -> aggressive route d2=%d aware=%s", d2, entity.aware_of_player, channel="AI")
+            self._aggressive_entity(entity, d2, px, py)
+        elif ai_type == 'pack':
+            debug("[AI]   -> pack route d2=%d aware=%s", d2, entity.aware_of_player, channel="AI")
+            self._pack_entity(entity, d2, px, py)
+        elif ai_type == 'thief':
+            debug("[AI]   -> thief route d2=%d aware=%s", d2, entity.aware_of_player, channel="AI")
+            self._thief_entity(entity, d2, px, py)
+        else:
+            # Default fallback aggressive-like
+            if entity.aware_of_player:
+                debug("[AI]   -> fallback approach d2=%d", d2, channel="AI")
+                self._approach(entity, px, py)
+        # Post-action cloning attempt
+        self._attempt_entity_clone(entity)
+
     def _compute_xp_reward(self, entity: Entity) -> int:
         """Compute XP reward based on entity stats instead of a flat die roll."""
         lvl = max(1, int(getattr(entity, 'level', 1)))
@@ -1094,11 +1273,11 @@ class EntityManager:
         score = max(5, min(int(score), 5000))
         return score
     
-    def _town_npc_behavior(self, entity: Entity, behavior: str, dist: float, px: int, py: int) -> None:
+    def _town_npc_behavior(self, entity: Entity, behavior: str, d2: int, px: int, py: int) -> None:
         """Simple town NPC behaviors: beggar/drunk/idiot interactions."""
         ex, ey = entity.position
-        if dist <= 1.5:
-            debug(f"[AI][TOWN] {entity.name} interaction range dist={dist:.2f} beh={behavior}")
+        if in_range(d2, 1.5):
+            debug("[AI][TOWN] %s interaction range d2=%d beh=%s", entity.name, d2, behavior, channel="AI")
             if behavior == 'beggar':
                 pgold = getattr(self.game.player, 'gold', 0) if self.game.player else 0
                 if pgold > 0 and random.random() < 0.6:
@@ -1126,8 +1305,8 @@ class EntityManager:
         else:
             # Drift toward player a bit (beggars/thief-like pursuit is gated)
             if behavior == 'beggar':
-                if not self._should_pursue_beggar(dist):
-                    debug(f"[AI][TOWN] {entity.name} decides not to pursue (beggar check)")
+                if not self._should_pursue_beggar(d2):
+                    debug("[AI][TOWN] %s decides not to pursue (beggar check)", entity.name, channel="AI")
                     return
             # LOS requirement to move toward the player
             if self.game.fov._line_of_sight(ex, ey, px, py):
@@ -1135,7 +1314,7 @@ class EntityManager:
                 dy = 0 if py == ey else (1 if py > ey else -1)
                 nx, ny = ex + dx, ey + dy
                 if self._is_walkable_for_ai(nx, ny):
-                    debug(f"[AI][TOWN] {entity.name} drifts toward player ({ex},{ey})->({nx},{ny})")
+                    debug("[AI][TOWN] %s drifts toward player (%s,%s)->(%s,%s)", entity.name, ex, ey, nx, ny, channel="AI")
                     self._move_entity(entity, nx, ny)
                 else:
-                    debug(f"[AI][TOWN] {entity.name} drift blocked target=({nx},{ny})")
+                    debug("[AI][TOWN] %s drift blocked target=(%s,%s)", entity.name, nx, ny, channel="AI")
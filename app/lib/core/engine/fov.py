@@ -1,5 +1,7 @@
-import math
 from typing import Any, Dict, List, Tuple
+from app.lib.core.engine.geometry import disc_offsets
+from app.lib.core.engine.line_sweep import LineSweep
+from app.lib.core.engine.shadowcast import Shadowcaster
 from app.lib.core.logger import debug
 from config import DOOR_CLOSED, MAGMA_VEIN, NIGHT_BASE_RADIUS, QUARTZ_VEIN, SECRET_DOOR, SECRET_DOOR_FOUND, WALL
 
@@ -10,109 +12,83 @@ class FOV:
         # Visibility / lighting
         self.visibility: List[List[int]] = []  # 0 unseen,1 explored,2 visible
         self.light_colors: List[List[int]] = []
-        # Dynamic lighting sources (emplaced torches, spells, etc.)
+        # Tiles currently at visibility 2 and tiles holding a light color, so
+        # each update only touches what changed instead of the whole map.
+        self._visible: set[Tuple[int, int]] = set()
+        self._lit: set[Tuple[int, int]] = set()
+        self._town_day_explored = False
+        # Reusable shadowcasting engine (owns its visibility buffers)
+        self._caster = Shadowcaster()
+        # Whole-map Bresenham LOS for daytime in town
+        self._sweep = LineSweep()
+        # Turn-scoped LOS memo keyed by (x0, y0, x1, y1)
+        self._los_cache: Dict[Tuple[int, int, int, int], bool] = {}
+        self._los_cache_turn = -1
+        self.los_cache_hits = 0
+        self.los_cache_misses = 0
+        # Persistent lights (lit rooms, emplaced torches) per depth. Each keeps
+        # its lit tiles ('tiles', flat indices) until a tile in range changes.
+        self.static_lights: Dict[int, List[Dict[str, Any]]] = {}
+        # Transient lighting sources (spells, etc.), culled once expired
         self.dynamic_lights: List[Dict[str, Any]] = []  # each: {'pos':(x,y),'radius':int,'color':int,'expires':turn}
+        # Player's carried light, rebuilt on every update
+        self._torch_light: Dict[str, Any] = {}
+        # Flat per-tile light level (0 dark, 1 dim, 2 bright); the static
+        # part is cached and transient lights are stamped on top when stale.
+        self._static_light_level = bytearray()
+        self._static_light_level_dirty = True
+        self.light_level = bytearray()
+        self._light_level_dirty = True
         self._time_override = None # 'day'|'night' testing override
     
-    def _cast_light(self, visible: set[Tuple[int, int]], ox: int, oy: int, radius: int,
-                    row: int, start_slope: float, end_slope: float,
-                    xx: int, xy: int, yx: int, yy: int) -> None:
+    def reset(self, width: int, height: int) -> None:
+        """Allocate fresh visibility/light arrays for a newly loaded map."""
+        self.visibility = [[0 for _ in range(width)] for _ in range(height)]
+        self.light_colors = [[0 for _ in range(width)] for _ in range(height)]
+        self._visible = set()
+        self._lit = set()
+        self._town_day_explored = False
+        self._los_cache.clear()
+        # Static lights of a revisited depth stay valid (the generator caches
+        # the map and every mutation invalidates them), only the derived
+        # light-level grids need rebuilding for the new dimensions.
+        self._static_light_level_dirty = True
+        self._light_level_dirty = True
+
+    def _shadowcast_fov(self, origin_x: int, origin_y: int, radius: int) -> List[int]:
         """
-        Recursive shadowcasting helper for one octant.
-        
-        Uses transformation matrix to map octant coordinates to map coordinates:
-        map_x = ox + col*xx + row*xy
-        map_y = oy + col*yx + row*yy
+        Compute field of view using iterative shadowcasting.
+        Returns the flat indices (y * map_width + x) of visible tiles within
+        radius. Walls block sight but are themselves visible (if adjacent).
+
+        The returned list is the caster's reusable buffer and is overwritten
+        by the next call.
         """
-        if start_slope < end_slope:
-            return
-        
-        next_start_slope = start_slope
-        blocked = False
-        
-        col = 0
-        while col <= row:
-            # Transform to map coordinates
-            dx = col * xx + row * xy
-            dy = col * yx + row * yy
-            x, y = ox + dx, oy + dy
-            
-            # Bounds check
-            if not (0 <= x < self.game.map_width and 0 <= y < self.game.map_height):
-                col += 1
-                continue
-            
-            # Check distance
-            dist_sq = dx * dx + dy * dy
-            if dist_sq > radius * radius:
-                col += 1
-                continue
-            
-            # Compute slopes
-            left_slope = (col - 0.5) / (row + 0.5)
-            right_slope = (col + 0.5) / (row - 0.5)
-            
-            # Check if within visible wedge
-            if start_slope < right_slope:
-                col += 1
-                continue
-            elif end_slope > left_slope:
-                break
-            
-            # Tile is visible
-            visible.add((x, y))
-            
-            # Check opacity
-            is_opaque = self._is_opaque(self.game.current_map[y][x]) if self.game.current_map else False
-            
-            if blocked:
-                # We're in a blocked section
-                if is_opaque:
-                    next_start_slope = right_slope
-                else:
-                    # Found transparent tile; end blocked section
-                    blocked = False
-                    start_slope = next_start_slope
-            else:
-                # Not currently blocked
-                if is_opaque and row < radius:
-                    # Found blocker; recurse for next row with narrowed wedge
-                    blocked = True
-                    self._cast_light(visible, ox, oy, radius, row + 1, start_slope, left_slope,
-                                   xx, xy, yx, yy)
-                    next_start_slope = right_slope
-            
-            col += 1
-        
-        # Continue to next row if not blocked
-        if not blocked and row < radius:
-            self._cast_light(visible, ox, oy, radius, row + 1, start_slope, end_slope,
-                           xx, xy, yx, yy)
-    
-    def _shadowcast_fov(self, origin_x: int, origin_y: int, radius: int) -> set[Tuple[int, int]]:
+        grid = self.game.current_map
+        if not grid:
+            return []
+        return self._caster.compute(grid.opaque, grid.width, grid.height, origin_x, origin_y, radius)
+
+    def prepare_town_sweep(self) -> None:
+        """Build the day-town LOS shadow table for the current map ahead of time.
+
+        The table takes a few hundred ms to build, so the town calls this when
+        its map is generated or loaded instead of paying for it on the first
+        daytime FOV update.
         """
-        Compute field of view using recursive shadowcasting algorithm.
-        Returns set of visible (x, y) coordinates from origin within radius.
-        Walls block sight but are themselves visible (if adjacent).
+        grid = self.game.current_map
+        if grid:
+            self._sweep.prepare(grid.width, grid.height)
+
+    def _town_day_fov(self, origin_x: int, origin_y: int) -> List[int]:
+        """Flat indices (y * width + x) of every tile in line of sight, map-wide.
+
+        The same tiles as a `_line_of_sight` trace to every tile on the map;
+        the sweep marks wall shadows instead of tracing lines. The returned
+        list is replaced by the next call.
         """
-        visible = {(origin_x, origin_y)}  # Origin always visible
-        
-        # 8 octants defined by transformation multipliers
-        octants = [
-            (1, 0, 0, 1),   # East
-            (0, 1, 1, 0),   # Northeast  
-            (0, -1, 1, 0),  # Southeast
-            (-1, 0, 0, 1),  # West
-            (0, -1, -1, 0), # Northwest
-            (0, 1, -1, 0),  # Southwest
-            (1, 0, 0, -1),  # North octants
-            (-1, 0, 0, -1),
-        ]
-        
-        for (xx, xy, yx, yy) in octants:
-            self._cast_light(visible, origin_x, origin_y, radius, 1, 1.0, 0.0, xx, xy, yx, yy)
-        
-        return visible
+        grid = self.game.current_map
+        return self._sweep.compute(grid.opaque, grid.width, grid.height, origin_x, origin_y)
 
     # Utility logging kept minimal
     # =============================
@@ -130,23 +106,58 @@ class FOV:
         if radius <= 0:
             return
         self.dynamic_lights.append({'pos': (x, y), 'radius': radius, 'color': color, 'expires': self.game.time + duration})
+        self._light_level_dirty = True
+
+    def add_static_light(self, x: int, y: int, radius: int, color: int, room: int = -1) -> Dict[str, Any]:
+        """Register a persistent light (emplaced torch, lit room) on the current depth."""
+        light = {'pos': (x, y), 'radius': radius, 'color': color, 'room': room, 'tiles': None}
+        self.static_lights.setdefault(self.game.current_depth, []).append(light)
+        self._static_light_level_dirty = True
+        return light
+
+    def _current_static_lights(self) -> List[Dict[str, Any]]:
+        return self.static_lights.get(self.game.current_depth, [])
+
+    def _sync_room_lights(self) -> None:
+        """Match persistent room lights to `game.lit_rooms`.
+
+        Rooms are lit from several places (entering a room, restoring a
+        save), so the light list follows the set rather than being told.
+        """
+        lights = self._current_static_lights()
+        lit_rooms = self.game.lit_rooms
+        have = {l['room'] for l in lights if l['room'] >= 0}
+        if have == lit_rooms:
+            return
+        if have - lit_rooms:
+            lights[:] = [l for l in lights if l['room'] < 0 or l['room'] in lit_rooms]
+            self._static_light_level_dirty = True
+        # Room ambient lights: mark lit rooms with magical hue (3)
+        for r_idx in lit_rooms - have:
+            if 0 <= r_idx < len(self.game.rooms):
+                room = self.game.rooms[r_idx]
+                cx, cy = room.center()
+                self.add_static_light(cx, cy, max(room.x2 - room.x1, room.y2 - room.y1)//2 + 1, 3, room=r_idx)
 
     def _update_dynamic_lights(self) -> None:
-        """Cull expired dynamic lights and inject persistent sources (player torch)."""
+        """Cull expired dynamic lights and refresh the player torch.
+
+        Static lights persist and are not touched here.
+        """
         # Remove expired
+        before = len(self.dynamic_lights)
         self.dynamic_lights = [l for l in self.dynamic_lights if self.game.time <= l.get('expires', self.game.time)]
-        # Player equipped light source re-added each turn for flicker
+        # Player equipped light source re-evaluated each update for flicker
         torch_r = self._player_light_radius()
+        torch = {}
         if torch_r > 0 and self.game.player and hasattr(self.game.player, 'position') and self.game.player.position:
             px, py = self.game.player.position
             # Flicker by minor radius jitter (optional) kept stable for now
-            self.add_dynamic_light(px, py, torch_r, 2, duration=1)
-        # Room ambient lights: mark lit rooms with magical hue (3)
-        for r_idx, room in enumerate(self.game.rooms):
-            if r_idx in self.game.lit_rooms:
-                cx, cy = room.center()
-                self.add_dynamic_light(cx, cy, max(room.x2 - room.x1, room.y2 - room.y1)//2 + 1, 3, duration=1)
-
+            torch = {'pos': (px, py), 'radius': torch_r, 'color': 2}
+        if torch != self._torch_light or len(self.dynamic_lights) != before:
+            self._light_level_dirty = True
+        self._torch_light = torch
+        self._sync_room_lights()
 
     def update_fov(self) -> None:
         """
@@ -155,7 +166,7 @@ class FOV:
         """
         player = self.game.player  # Get player from game object
         if not player or not self.game.current_map:
-            debug("FOV update skipped: no player or map")
+            debug("FOV update skipped: no player or map", channel="FOV")
             return
         
         # Determine context
@@ -163,20 +174,28 @@ class FOV:
         # Use FOV's own _is_daytime (time override lives on FOV) when in town
         is_day = self._is_daytime() if is_town else False
 
-        # Mark previously visible tiles as explored. During daytime in town,
-        # initialize the entire map as explored (dimmed) so occluded tiles are visible-but-dim.
-        if is_town and is_day:
-            for y in range(self.game.map_height):
-                for x in range(self.game.map_width):
-                    self._set_visibility(x, y, 1)
-        else:
+        # Start a fresh visible set; tiles from last update that are not
+        # re-promoted below get demoted to explored once the new set is known,
+        # so only tiles that actually left or entered view change (and go dirty).
+        previous_visible = self._visible
+        self._visible = set()
+
+        # During daytime in town, initialize the entire map as explored (dimmed)
+        # so occluded tiles are visible-but-dim. Explored never reverts, so this
+        # only needs to happen once per map.
+        if is_town and is_day and not self._town_day_explored:
             for y in range(self.game.map_height):
+                row = self.visibility[y]
                 for x in range(self.game.map_width):
-                    if self.visibility[y][x] == 2:
+                    if row[x] == 0:
                         self._set_visibility(x, y, 1)
+            self._town_day_explored = True
         
-        # Reset light colors
-        self.light_colors = [[0 for _ in range(self.game.map_width)] for _ in range(self.game.map_height)]
+        # Reset light colors in place over last update's lit region
+        light_colors = self.light_colors
+        for (lx, ly) in self._lit:
+            light_colors[ly][lx] = 0
+        self._lit.clear()
         
         # Compute FOV (base visibility only)
         if hasattr(player, 'position') and player.position:
@@ -184,68 +203,41 @@ class FOV:
             visible_count = 0
 
             if is_town and is_day:
-                # Daytime in town: global LOS; everything in line of sight is fully visible
-                for ny in range(self.game.map_height):
-                    for nx in range(self.game.map_width):
-                        if self._line_of_sight(px, py, nx, ny):
-                            if self._set_visibility(nx, ny, 2):
-                                visible_count += 1
+                # Daytime in town: global LOS; everything in line of sight is fully visible.
+                width = self.game.current_map.width
+                for idx in self._town_day_fov(px, py):
+                    vy, vx = divmod(idx, width)
+                    if self._set_visibility(vx, vy, 2):
+                        visible_count += 1
             elif is_town and not is_day:
                 # Night in town: limited radius, expanded by equipped light source
                 radius = self._night_fov_radius()
-                r2 = radius * radius
-                for dy in range(-radius, radius + 1):
-                    for dx in range(-radius, radius + 1):
-                        nx, ny = px + dx, py + dy
-                        if 0 <= ny < self.game.map_height and 0 <= nx < self.game.map_width:
-                            if dx*dx + dy*dy <= r2:
-                                if self._line_of_sight(px, py, nx, ny):
-                                    if self._set_visibility(nx, ny, 2):
-                                        visible_count += 1
+                for dx, dy, _ in disc_offsets(radius):
+                    nx, ny = px + dx, py + dy
+                    if 0 <= ny < self.game.map_height and 0 <= nx < self.game.map_width:
+                        if self._line_of_sight(px, py, nx, ny):
+                            if self._set_visibility(nx, ny, 2):
+                                visible_count += 1
             else:
-                # Dungeon: use recursive shadowcasting for proper wall occlusion
+                # Dungeon: use shadowcasting for proper wall occlusion
                 # Use player's equipped light radius when present, otherwise fall
                 # back to the configured night base radius (typically 2).
                 radius = max(self._player_light_radius(), NIGHT_BASE_RADIUS)
-                visible_tiles = self._shadowcast_fov(px, py, radius)
-                # If the shadowcaster returns an unexpectedly small set (e.g.
-                # only the origin), fall back to a LOS-aware circular scan so
-                # small radii (unlit or minimal light) still reveal nearby
-                # tiles. This guards against shadowcast edge-cases.
-                if len(visible_tiles) <= 1:
-                    visible_tiles = set()
-                    r2 = radius * radius
-                    for dy in range(-radius, radius + 1):
-                        for dx in range(-radius, radius + 1):
-                            nx, ny = px + dx, py + dy
-                            if not (0 <= ny < self.game.map_height and 0 <= nx < self.game.map_width):
-                                continue
-                            if dx*dx + dy*dy <= r2:
-                                try:
-                                    if self._line_of_sight(px, py, nx, ny):
-                                        visible_tiles.add((nx, ny))
-                                except Exception:
-                                    pass
+                visible_idx = self._shadowcast_fov(px, py, radius)
                 # Debug: log initial dungeon visible set size for troubleshooting
-                try:
-                    debug(f"Initial dungeon visible_tiles count: {len(visible_tiles)} around ({px},{py})")
-                    if len(visible_tiles) < 20:
-                        debug(f"visible_tiles sample: {sorted(list(visible_tiles))}")
-                except Exception:
-                    pass
-                for (vx, vy) in visible_tiles:
+                debug("Initial dungeon visible_tiles count: %s around (%s,%s)", len(visible_idx), px, py, channel="FOV")
+                width = self.game.current_map.width
+                for idx in visible_idx:
+                    vy, vx = divmod(idx, width)
                     if self._set_visibility(vx, vy, 2):
                         visible_count += 1
 
             # Apply base lighting colors
             base_color_day = 1  # daylight
             base_color_torch = 2  # warm torch glow
-            base_color_night_dim = 0
             if is_town and is_day:
-                for y in range(self.game.map_height):
-                    for x in range(self.game.map_width):
-                        if self.visibility[y][x] == 2:
-                            self.light_colors[y][x] = base_color_day
+                for (vx, vy) in self._visible:
+                    self._set_light(vx, vy, base_color_day)
             elif is_town and not is_day:
                 torch_radius = self._player_light_radius()
                 for dy in range(-torch_radius, torch_radius + 1):
@@ -253,89 +245,82 @@ class FOV:
                         nx, ny = px + dx, py + dy
                         if 0 <= ny < self.game.map_height and 0 <= nx < self.game.map_width:
                             if dx*dx + dy*dy <= torch_radius*torch_radius and self.visibility[ny][nx] == 2:
-                                self.light_colors[ny][nx] = base_color_torch
-            else:
-                # Dungeon base lighting: visible tiles get dim unless lit by sources
-                for y in range(self.game.map_height):
-                    for x in range(self.game.map_width):
-                        if self.visibility[y][x] == 2:
-                            self.light_colors[y][x] = base_color_night_dim
+                                self._set_light(nx, ny, base_color_torch)
+            # Dungeon base lighting: visible tiles keep light color 0 (dim,
+            # cleared above) unless lit by sources
 
             # Refresh dynamic lights (torch, room ambient) BEFORE computing
             # final visibility so that light sources (player torch, placed
             # torches, spells) can contribute to visible tiles in dungeons.
             self._update_dynamic_lights()
 
-            # In dungeons, allow dynamic light sources to expand visibility
-            # beyond the base player radius by performing shadowcasting
-            # from each dynamic light and unioning the results. This ensures
-            # carried torches actually reveal tiles instead of only tinting
-            # already-visible tiles.
-            if not (is_town):
-                # visible_tiles may not be defined yet for some branches; only
-                # run this logic in the dungeon branch where shadowcasting
-                # produced `visible_tiles`.
-                try:
-                    # Collect additional tiles lit by dynamic lights using a
-                    # LOS-aware circular scan from each light origin. This is
-                    # simpler and more robust for small carried lights (torch,
-                    # lantern) than invoking the full shadowcaster per source.
-                    extra_tiles = set()
-                    debug(f"Dynamic lights present: {self.dynamic_lights}")
-                    for light in self.dynamic_lights:
-                        lx, ly = light.get('pos', (None, None))
-                        lr = int(light.get('radius', 0))
-                        if lx is None or ly is None or lr <= 0:
-                            continue
-                        r2 = lr * lr
-                        # iterate within the light circle and test LOS to each tile
-                        for dy in range(-lr, lr + 1):
-                            for dx in range(-lr, lr + 1):
-                                nx, ny = lx + dx, ly + dy
-                                if not (0 <= ny < self.game.map_height and 0 <= nx < self.game.map_width):
-                                    continue
-                                if dx*dx + dy*dy <= r2:
-                                    try:
-                                        if self._line_of_sight(lx, ly, nx, ny):
-                                            extra_tiles.add((nx, ny))
-                                    except Exception:
-                                        # Non-critical; skip problematic tiles
-                                        pass
-                    debug(f"Extra tiles from dynamic lights: {len(extra_tiles)}")
-                    # If visible_tiles exists, mark any additionally-lit tiles
-                    # as visible so they appear on the map. We do not rely on
-                    # modifying `visible_tiles` variable here to avoid linter
-                    # warnings about potential unbound variables.
-                    if 'visible_tiles' in locals():
-                        for (vx, vy) in extra_tiles:
-                            if 0 <= vy < self.game.map_height and 0 <= vx < self.game.map_width:
-                                if self._set_visibility(vx, vy, 2):
-                                    visible_count += 1
-                    debug(f"Post-dynamic visible_count: {visible_count}")
-                except Exception:
-                    # Non-critical: if dynamic light contribution fails,
-                    # continue with base visibility.
-                    pass
-
-            # Overlay dynamic lights (torches, spells, room lights)
+            # Overlay dynamic lights (torches, spells, room lights). Each light
+            # reveals and tints what it can see, so carried torches actually
+            # reveal tiles instead of only tinting already-visible ones.
             self._overlay_dynamic_lights(px, py)
 
-            debug(f"FOV updated: {visible_count} tiles visible around ({px}, {py}); day={is_day} town={is_town} dyn_lights={len(self.dynamic_lights)}")
+            # Demote tiles that dropped out of view this update
+            for (vx, vy) in previous_visible - self._visible:
+                self._set_visibility(vx, vy, 1)
+
+            debug("FOV updated: %s tiles visible around (%s, %s); day=%s town=%s dyn_lights=%s", visible_count, px, py, is_day, is_town, len(self.dynamic_lights), channel="FOV")
         else:
-            debug("FOV update skipped: player has no position")
+            self._visible = previous_visible
+            debug("FOV update skipped: player has no position", channel="FOV")
     
+    def los_cache_stats(self) -> Dict[str, int]:
+        """Return cumulative LOS cache hit/miss counters and current size."""
+        return {'hits': self.los_cache_hits, 'misses': self.los_cache_misses, 'size': len(self._los_cache)}
+
     def _line_of_sight(self, x0: int, y0: int, x1: int, y1: int) -> bool:
         """Bresenham LOS: returns True if target is visible from source.
 
         The target tile itself may be opaque (walls visible), but any
         intervening opaque tile blocks LOS.
+
+        Results are memoized for the current turn; the cache is dropped when
+        game time advances or a tile changes (`Game.set_tile`).
         """
+        turn = self.game.time
+        if turn != self._los_cache_turn:
+            if self._los_cache:
+                debug("LOS cache turn %s: %s entries, %s hits / %s misses total",
+                      self._los_cache_turn, len(self._los_cache), self.los_cache_hits, self.los_cache_misses,
+                      channel="FOV")
+                self._los_cache.clear()
+            self._los_cache_turn = turn
+        dx = x1 - x0
+        dy = y1 - y0
+        # Straight and exact-diagonal lines visit the same tiles in both
+        # directions, so those share one entry; other Bresenham lines are
+        # direction dependent.
+        if (dx == 0 or dy == 0 or dx == dy or dx == -dy) and (x1, y1) < (x0, y0):
+            key = (x1, y1, x0, y0)
+        else:
+            key = (x0, y0, x1, y1)
+        cached = self._los_cache.get(key)
+        if cached is not None:
+            self.los_cache_hits += 1
+            return cached
+        self.los_cache_misses += 1
+        result = self._trace_line_of_sight(x0, y0, x1, y1)
+        self._los_cache[key] = result
+        return result
+
+    def _trace_line_of_sight(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Uncached Bresenham trace backing `_line_of_sight`."""
         dx = abs(x1 - x0)
         dy = -abs(y1 - y0)
         sx = 1 if x0 < x1 else -1
         sy = 1 if y0 < y1 else -1
         err = dx + dy
         x, y = x0, y0
+        grid = self.game.current_map
+        if not grid:
+            return False
+        opaque = grid.opaque
+        width = grid.width
+        height = grid.height
 
         while True:
             if x == x1 and y == y1:
@@ -351,12 +336,9 @@ class FOV:
             if x == x1 and y == y1:
                 continue
             # Bounds check
-            if not (0 <= x < self.game.map_width and 0 <= y < self.game.map_height):
-                return False
-            if not self.game.current_map:
+            if not (0 <= x < width and 0 <= y < height):
                 return False
-            t = self.game.current_map[y][x]
-            if self._is_opaque(t):
+            if opaque[y * width + x]:
                 return False
     
     def _night_fov_radius(self) -> int:
@@ -365,116 +347,108 @@ class FOV:
         return max(NIGHT_BASE_RADIUS, light_radius or 0)
 
     def _overlay_dynamic_lights(self, px: int, py: int) -> None:
-        """Blend dynamic lights onto light_colors respecting visibility.
+        """Blend static and dynamic lights onto light_colors and visibility.
 
-        Visible tiles get light color replaced if dynamic light covers them.
-        If in dungeon and tile not visible but inside lit room, mark explored brightness subtly.
+        Every tile a light can see (one shadowcast from its origin, so walls
+        bounding the lit area are included) becomes visible and takes the
+        light's color.
         """
-        if not self.game.current_map:
+        grid = self.game.current_map
+        if not grid:
             return
-        for light in self.dynamic_lights:
+        width = grid.width
+        for light in self._current_static_lights():
+            tiles = light['tiles']
+            if tiles is None:
+                (lx, ly) = light['pos']
+                tiles = light['tiles'] = list(self._shadowcast_fov(lx, ly, light['radius']))
+            self._apply_light(tiles, light['color'], width)
+        transient = self.dynamic_lights + [self._torch_light] if self._torch_light else self.dynamic_lights
+        for light in transient:
             (lx, ly) = light['pos']
-            radius = light['radius']
-            color = light['color']
-            r2 = radius * radius
-            minx = max(0, lx - radius)
-            maxx = min(self.game.map_width - 1, lx + radius)
-            miny = max(0, ly - radius)
-            maxy = min(self.game.map_height - 1, ly + radius)
-            for y in range(miny, maxy + 1):
-                dy = y - ly
-                dy2 = dy * dy
-                row_vis = self.visibility[y]
-                row_col = self.light_colors[y]
-                for x in range(minx, maxx + 1):
-                    dx = x - lx
-                    if dx*dx + dy2 <= r2:
-                        # If the tile is within the light radius, ensure it is
-                        # marked visible if the light actually has LOS to it.
-                        # This helps ensure carried torches reveal walls as well
-                        # as floors instead of only tinting already-visible tiles.
-                        if row_vis[x] != 2:
-                            try:
-                                if self._line_of_sight(lx, ly, x, y):
-                                    row_vis[x] = 2
-                            except Exception:
-                                # Non-critical - if LOS check fails, skip changing visibility
-                                pass
-
-                        # Apply the light color to any now-visible tiles
-                        if row_vis[x] == 2:
-                            row_col[x] = color
-                            # Also reveal nearby walls so they appear at the
-                            # same apparent radius as lit floors. Some tiles
-                            # (walls) can be visually important even if
-                            # occlusion logic keeps deeper walls hidden; here
-                            # we reveal immediate neighboring wall tiles when
-                            # a floor tile is lit by a dynamic source.
-                            for ndy in (-1, 0, 1):
-                                for ndx in (-1, 0, 1):
-                                    if ndx == 0 and ndy == 0:
-                                        continue
-                                    nx = x + ndx
-                                    ny = y + ndy
-                                    if not (0 <= ny < self.game.map_height and 0 <= nx < self.game.map_width):
-                                        continue
-                                    try:
-                                        nt = self.game.current_map[ny][nx]
-                                    except Exception:
-                                        nt = None
-                                    # Reveal walls and secret-door tiles adjacent to lit tiles
-                                    if nt in (WALL, SECRET_DOOR, SECRET_DOOR_FOUND):
-                                        if self.visibility[ny][nx] != 2:
-                                            try:
-                                                if self._line_of_sight(lx, ly, nx, ny):
-                                                    self.visibility[ny][nx] = 2
-                                                    # Tint wall tile as well
-                                                    self.light_colors[ny][nx] = color
-                                            except Exception:
-                                                pass
+            self._apply_light(self._shadowcast_fov(lx, ly, int(light['radius'])), light['color'], width)
         # Potential future: soft falloff / brightness; simple color override for MVP
-    
+
+    def _apply_light(self, tiles: List[int], color: int, width: int) -> None:
+        for idx in tiles:
+            y, x = divmod(idx, width)
+            self._set_visibility(x, y, 2)
+            self._set_light(x, y, color)
+
+    def tile_changed(self, x: int, y: int) -> None:
+        """Drop cached LOS and static-light results affected by a tile change."""
+        self._los_cache.clear()
+        for light in self._current_static_lights():
+            (lx, ly) = light['pos']
+            r = light['radius']
+            if abs(lx - x) <= r and abs(ly - y) <= r:
+                light['tiles'] = None
+
+    @staticmethod
+    def _stamp_light_level(levels: bytearray, width: int, height: int, light: Dict[str, Any]) -> None:
+        """Raise `levels` inside a light's disc: bright within 60% of the radius, else dim."""
+        (lx, ly) = light['pos']
+        radius = light['radius']
+        bright2 = radius * radius * 9  # (0.6 r)^2 scaled by 25 to stay in integers
+        for dx, dy, d2 in disc_offsets(radius):
+            x = lx + dx
+            y = ly + dy
+            if not (0 <= x < width and 0 <= y < height):
+                continue
+            level = 2 if d2 * 25 <= bright2 else 1
+            idx = y * width + x
+            if levels[idx] < level:
+                levels[idx] = level
+
+    def _refresh_light_level(self) -> None:
+        """Rebuild the light-level grid from cached static levels plus transient lights."""
+        width = self.game.map_width
+        height = self.game.map_height
+        size = width * height
+        if self._static_light_level_dirty or len(self._static_light_level) != size:
+            static = bytearray(size)
+            for light in self._current_static_lights():
+                self._stamp_light_level(static, width, height, light)
+            self._static_light_level = static
+            self._static_light_level_dirty = False
+        levels = bytearray(self._static_light_level)
+        for light in self.dynamic_lights:
+            self._stamp_light_level(levels, width, height, light)
+        if self._torch_light:
+            self._stamp_light_level(levels, width, height, self._torch_light)
+        self.light_level = levels
+        self._light_level_dirty = False
+
     def _get_light_level_at(self, x: int, y: int) -> str:
         """
         Get light level at a specific position.
         Returns: 'bright', 'dim', or 'dark'
         
-        Bright light: Town during day, or within player's light radius
-        Dim light: Near player's light edge, or near dynamic lights
+        Bright light: Town during day, or within 60% of a light's radius
+        Dim light: Within the outer part of a light's radius
         Dark: No light sources nearby
         """
         # Town during day is always bright
         if self.game.current_depth == 0 and self._is_daytime():
             return 'bright'
-        
-        # Check player's light source
-        if self.game.player and hasattr(self.game.player, 'position'):
-            px, py = self.game.player.position
-            player_light = self._player_light_radius()
-            dist_to_player = math.sqrt((x - px) ** 2 + (y - py) ** 2)
-            
-            if dist_to_player <= player_light:
-                # Within full light radius
-                if dist_to_player <= player_light * 0.6:
-                    return 'bright'
-                else:
-                    return 'dim'
-        
-        # Check dynamic lights
-        for light in self.dynamic_lights:
-            lx, ly = light['pos']
-            radius = light['radius']
-            dist = math.sqrt((x - lx) ** 2 + (y - ly) ** 2)
-            if dist <= radius * 0.6:
-                return 'bright'
-            elif dist <= radius:
-                return 'dim'
-        
+        if self._light_level_dirty or self._static_light_level_dirty:
+            self._refresh_light_level()
+        if not (0 <= x < self.game.map_width and 0 <= y < self.game.map_height):
+            return 'dark'
+        level = self.light_level[y * self.game.map_width + x]
+        if level == 2:
+            return 'bright'
+        if level == 1:
+            return 'dim'
         # Default is darkness in dungeons
         return 'dark'
 
     def _is_opaque(self, tile: str) -> bool:
-        """Return True if tile blocks line of sight."""
+        """Return True if tile blocks line of sight.
+
+        Classifies a tile character; per-position checks should read the
+        precomputed ``current_map.opaque`` mask instead.
+        """
         if tile == WALL:
             return True
         if tile in (DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND, QUARTZ_VEIN, MAGMA_VEIN):
@@ -487,35 +461,32 @@ class FOV:
         try:
             inv = getattr(self.game.player, 'inventory', None)
             if not inv:
-                debug("_player_light_radius: no inventory on player")
+                debug("_player_light_radius: no inventory on player", channel="FOV")
                 return 0
             light = inv.equipment.get('light') if hasattr(inv, 'equipment') else None
             # Debug: log equipment light slot state for troubleshooting
-            try:
-                debug(f"_player_light_radius: equipment.light = {repr(light)}")
-            except Exception:
-                pass
+            debug("_player_light_radius: equipment.light = %r", light, channel="FOV")
             if not light:
                 return 0
             # Effect may be a list like ['light_source', radius, duration]
             if isinstance(light.effect, list) and len(light.effect) >= 2 and light.effect[0] == 'light_source':
                 # Check if light has fuel remaining
                 if hasattr(light, 'fuel_remaining') and light.fuel_remaining is not None:
-                    debug(f"_player_light_radius: light.fuel_remaining={light.fuel_remaining}")
+                    debug("_player_light_radius: light.fuel_remaining=%s", light.fuel_remaining, channel="FOV")
                     if light.fuel_remaining <= 0:
-                        debug("_player_light_radius: light has no fuel")
+                        debug("_player_light_radius: light has no fuel", channel="FOV")
                         return 0  # No light if fuel depleted
                 # effect format: ['light_source', radius, duration]
                 try:
                     radius = int(light.effect[1])
                 except Exception:
                     radius = int(getattr(light, 'light_radius', 0) or 0)
-                debug(f"_player_light_radius: returning radius={radius}")
+                debug("_player_light_radius: returning radius=%s", radius, channel="FOV")
                 return max(0, radius)
             # Fallback: some older saves may store radius on field
             if hasattr(light, 'light_radius'):
                 r = int(getattr(light, 'light_radius', 0) or 0)
-                debug(f"_player_light_radius: fallback light_radius={r}")
+                debug("_player_light_radius: fallback light_radius=%s", r, channel="FOV")
                 return max(0, r)
             return 0
         except Exception:
@@ -524,15 +495,24 @@ class FOV:
     # ======================
     # Visibility/FOV helpers
     # ======================
+    def _set_light(self, x: int, y: int, color: int) -> None:
+        """Set a tile's light color, remembering it for the next in-place reset."""
+        self.light_colors[y][x] = color
+        self._lit.add((x, y))
+
     def _set_visibility(self, x: int, y: int, value: int) -> bool:
-        """Set visibility value and flag tile dirty when it changes."""
+        """Set visibility value and flag the tile's fog dirty when it changes."""
         try:
             current = self.visibility[y][x]
+            if value == 2:
+                self._visible.add((x, y))
+            else:
+                self._visible.discard((x, y))
             if current != value:
                 self.visibility[y][x] = value
-                # Inform UI to refresh this tile when using cached rendering.
-                if hasattr(self.game, "mark_dirty_tile"):
-                    self.game.mark_dirty_tile(x, y)
+                # Inform UI to refresh this tile's fog when using cached rendering.
+                if hasattr(self.game, "mark_fog_tile"):
+                    self.game.mark_fog_tile(x, y)
                 return True
             # Keep value in sync even if unchanged
             self.visibility[y][x] = value
@@ -11,12 +11,12 @@ import random
 from typing import List, Optional, Dict
 from app.model.entity import Entity
 from app.lib.core.loader import Loader
-from config import FLOOR, STAIRS_UP, STAIRS_DOWN, DEBUG
+from app.lib.core.logger import debug, is_debug_enabled
+from config import FLOOR, STAIRS_UP, STAIRS_DOWN
 
 
-def _dbg(msg: str) -> None:
-    if DEBUG:
-        print(f"[SPAWNER] {msg}")
+def _dbg(msg: str, *args) -> None:
+    debug("[SPAWNER] " + msg, *args, channel="SPAWN")
 
 def find_floor_tiles(map_data: List[List[str]], avoid_positions: Optional[List[List[int]]] = None) -> List[List[int]]:
     floor_tiles = []
@@ -52,12 +52,12 @@ def spawn_entities_for_depth(
     entities: List[Entity] = []
     avoid_positions = [player_position] if player_position else []
     spawnable_area = find_floor_tiles(map_data, avoid_positions)
-    _dbg(f"initial floor tiles: {len(spawnable_area)}")
+    _dbg("initial floor tiles: %d", len(spawnable_area))
     spawnable_area = [
         pos for pos in spawnable_area 
         if map_data[pos[1]][pos[0]] not in [STAIRS_UP, STAIRS_DOWN]
     ]
-    _dbg(f"floor tiles after removing stairs: {len(spawnable_area)}")
+    _dbg("floor tiles after removing stairs: %d", len(spawnable_area))
     if not spawnable_area:
         _dbg("no spawnable floor tiles available; returning empty entity list")
         return entities
@@ -78,35 +78,36 @@ def spawn_entities_for_depth(
     else:
         min_spawn = max(3, 4 + dungeon_level // 2)
         max_spawn = max(min_spawn, 6 + dungeon_level)
-        num_entities = random.randint(min_spawn, min(max_spawn, 9))
+        num_entities = random.randint(min(min_spawn, 9), min(max_spawn, 9))
         entity_pool = [
             template for template in game_data.get_entities_for_depth(target_depth)
             if template.get("hostile", False)
         ]
-    _dbg(f"target_depth={target_depth} (scaled) dungeon_level={dungeon_level} num_entities={num_entities}")
-    _dbg(f"entity pool size: {len(entity_pool)}")
-    if entity_pool and DEBUG:
+    _dbg("target_depth=%s (scaled) dungeon_level=%s num_entities=%s", target_depth, dungeon_level, num_entities)
+    _dbg("entity pool size: %d", len(entity_pool))
+    if entity_pool and is_debug_enabled("SPAWN"):
         sample = [t.get("id") for t in entity_pool[:10]]
-        _dbg(f"sample entity ids (up to 10): {sample}")
+        _dbg("sample entity ids (up to 10): %s", sample)
         # show computed chances for sample templates
         for t in entity_pool[:10]:
             try:
-                _dbg(f" - {t.get('id')}: spawn_chance={_calculate_spawn_probability(t, target_depth)}")
+                _dbg(" - %s: spawn_chance=%s", t.get('id'), _calculate_spawn_probability(t, target_depth))
             except Exception as e:
-                _dbg(f" - error computing chance for {t.get('id')}: {e}")
+                _dbg(" - error computing chance for %s: %s", t.get('id'), e)
     if not entity_pool:
         return entities
     max_attempts = num_entities * 5
     attempts = 0
-    _dbg(f"max_attempts={max_attempts}")
+    _dbg("max_attempts=%d", max_attempts)
     seen_rolls = 0
+    log_rolls = is_debug_enabled("SPAWN")
     while spawnable_area and len(entities) < num_entities and attempts < max_attempts:
         attempts += 1
         template = random.choice(entity_pool)
         chance = _calculate_spawn_probability(template, target_depth)
         roll = random.uniform(0, 100)
-        if DEBUG and seen_rolls < 20:
-            _dbg(f"attempt={attempts} picked={template.get('id')} roll={roll:.2f} chance={chance:.2f}")
+        if log_rolls and seen_rolls < 20:
+            _dbg("attempt=%d picked=%s roll=%.2f chance=%.2f", attempts, template.get('id'), roll, chance)
             seen_rolls += 1
         if roll > chance or chance <= 0:
             continue
@@ -116,7 +117,6 @@ def spawn_entities_for_depth(
             entity = Entity(template_id=template['id'], level_or_depth=target_depth, position=spawn_pos)
             entities.append(entity)
         except Exception:
-            if DEBUG:
-                _dbg(f"exception creating entity from template {template.get('id')}; continuing")
+            _dbg("exception creating entity from template %s; continuing", template.get('id'))
             continue
     return entities
\ No newline at end of file
@@ -17,6 +17,7 @@ from config import (
     LARGE_DUNGEON_THRESHOLD, MAX_LARGE_MAP_WIDTH, MAX_LARGE_MAP_HEIGHT,
     QUARTZ_VEIN, MAGMA_VEIN, VIEWPORT_WIDTH, VIEWPORT_HEIGHT
 )
+from app.lib.core.engine.grid import TileGrid
 from app.lib.core.logger import debug
 
 MapData = List[List[str]]
@@ -110,10 +111,10 @@ class MapGenerator:
     
     def __init__(self):
         """Initialize the map generator with empty cache."""
-        self.town_map = None
-        self.cached_maps = {}  # depth -> (map_data, rooms_list)
+        self.town_map: Optional[TileGrid] = None
+        self.cached_maps = {}  # depth -> (TileGrid, rooms_list)
     
-    def get_map(self, depth: int) -> Tuple[MapData, List[Rect]]:
+    def get_map(self, depth: int) -> Tuple[TileGrid, List[Rect]]:
         """
         Generate or load a cached map for the given depth.
         
@@ -121,7 +122,7 @@ class MapGenerator:
             depth: Dungeon depth (0 = town, 1+ = dungeon)
             
         Returns:
-            Tuple of (map_data, rooms_list)
+            Tuple of (TileGrid, rooms_list)
             For town and caves, rooms_list will be empty
         """
         # Check cache first
@@ -160,17 +161,19 @@ class MapGenerator:
             
             # Add mineral veins
             map_data = add_mineral_veins(map_data, depth)
+            # Generation works on plain lists; store the result compactly
+            map_data = TileGrid.from_rows(map_data)
         
         # Cache the generated map
         self.cached_maps[depth] = (map_data, rooms)
         
         return map_data, rooms
     
-    def _get_town_map(self) -> MapData:
+    def _get_town_map(self) -> TileGrid:
         """Get the town map (depth 0)."""
         if self.town_map is None:
             debug("Loading town map layout")
-            self.town_map = [list(row) for row in TOWN_LAYOUT]
+            self.town_map = TileGrid.from_rows(TOWN_LAYOUT)
         
         return self.town_map
 
@@ -0,0 +1,60 @@
+"""
+Integer grid geometry helpers.
+
+Range checks compare squared distances against squared radii, so AI and
+lighting code never needs a square root per pair. Where an actual distance
+is needed (falloff factors, log output) `distance` takes the square root of
+the squared distance. `disc_offsets` caches the (dx, dy, d2) offsets inside
+each radius.
+"""
+from __future__ import annotations
+from math import sqrt
+from typing import Dict, Tuple
+
+Offset = Tuple[int, int, int]
+
+_DISCS: Dict[int, Tuple[Offset, ...]] = {}
+
+
+def dist2(ax: int, ay: int, bx: int, by: int) -> int:
+    """Squared Euclidean distance."""
+    dx = ax - bx
+    dy = ay - by
+    return dx * dx + dy * dy
+
+
+def chebyshev(ax: int, ay: int, bx: int, by: int) -> int:
+    """King-move distance (8-way steps)."""
+    dx = ax - bx if ax > bx else bx - ax
+    dy = ay - by if ay > by else by - ay
+    return dx if dx > dy else dy
+
+
+def adjacent(ax: int, ay: int, bx: int, by: int) -> bool:
+    """True if b is one of a's 8 neighbours or a itself (distance <= 1.5)."""
+    return -1 <= ax - bx <= 1 and -1 <= ay - by <= 1
+
+
+def in_range(d2: int, radius: float) -> bool:
+    """True if a squared distance lies within `radius` (inclusive)."""
+    return d2 <= radius * radius
+
+
+def distance(d2: int) -> float:
+    """Euclidean distance for an integer squared distance."""
+    return sqrt(d2)
+
+
+def disc_offsets(radius: int) -> Tuple[Offset, ...]:
+    """(dx, dy, dx*dx + dy*dy) for every offset within `radius`, row-major."""
+    disc = _DISCS.get(radius)
+    if disc is None:
+        r2 = radius * radius
+        disc = tuple(
+            (dx, dy, dx * dx + dy * dy)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius, radius + 1)
+            if dx * dx + dy * dy <= r2
+        )
+        _DISCS[radius] = disc
+    return disc
@@ -0,0 +1,305 @@
+"""
+Compact tile grid for map storage.
+
+Maps used to be stored as ``List[List[str]]`` of single-character strings.
+A ``TileGrid`` keeps the same tiles as one flat ``bytearray`` of small tile
+codes (one byte per tile) and translates between codes and the tile
+characters defined in ``config.py``.
+
+Legacy code that indexes ``grid[y][x]`` (read or write) keeps working through
+lightweight row views; hot paths should prefer ``char_at``/``code_at`` or the
+bulk ``row_string``/``region`` helpers.
+
+Each grid also keeps per-tile ``opaque``, ``passable`` and ``ai_passable``
+masks (one byte per tile, 0/1) so FOV, line of sight, pathfinding and
+projectiles never re-classify tile characters. The masks are derived with a
+single ``bytes.translate`` when the grid is built and patched by ``set``.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from config import (
+    WALL, FLOOR, STAIRS_DOWN, STAIRS_UP, DOOR_CLOSED, DOOR_OPEN,
+    SECRET_DOOR, SECRET_DOOR_FOUND, QUARTZ_VEIN, MAGMA_VEIN
+)
+
+# Code table derived from the config tile constants. WALL is code 0 so a
+# freshly allocated (zero-filled) grid is solid rock. Town shop entrances
+# ('1'-'6') are registered up front; any other character is appended on
+# first use by `tile_code`.
+TILE_CHARS: List[str] = [
+    WALL, FLOOR, STAIRS_DOWN, STAIRS_UP, DOOR_CLOSED, DOOR_OPEN,
+    SECRET_DOOR, SECRET_DOOR_FOUND, QUARTZ_VEIN, MAGMA_VEIN,
+    '1', '2', '3', '4', '5', '6',
+]
+TILE_CODES: Dict[str, int] = {ch: code for code, ch in enumerate(TILE_CHARS)}
+
+Coord = Tuple[int, int]
+
+# Tile classification. Anything not listed is see-through; the player may
+# walk on anything not in _PLAYER_BLOCKING (floors, stairs, open doors, shop
+# entrances), while AI movement is restricted to _AI_PASSABLE.
+_OPAQUE_TILES = (WALL, DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND, QUARTZ_VEIN, MAGMA_VEIN)
+_PLAYER_BLOCKING = (WALL, QUARTZ_VEIN, MAGMA_VEIN, DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND)
+_AI_PASSABLE = (FLOOR, STAIRS_DOWN, STAIRS_UP, DOOR_OPEN)
+
+
+def _mask_table(chars: Iterable[str], hit: int) -> bytes:
+    """Build a 256-entry translate table mapping tile codes to 0/1."""
+    table = bytearray([1 - hit]) * 256
+    for ch in chars:
+        table[TILE_CODES[ch]] = hit
+    return bytes(table)
+
+
+OPAQUE_TABLE = _mask_table(_OPAQUE_TILES, 1)
+PASSABLE_TABLE = _mask_table(_PLAYER_BLOCKING, 0)
+AI_PASSABLE_TABLE = _mask_table(_AI_PASSABLE, 1)
+
+
+def tile_code(ch: str) -> int:
+    """Return the byte code for a tile character, registering unknown ones."""
+    code = TILE_CODES.get(ch)
+    if code is not None:
+        return code
+    if not isinstance(ch, str) or len(ch) != 1:
+        raise ValueError(f"Tile must be a single character, got {ch!r}")
+    if len(TILE_CHARS) >= 256:
+        raise ValueError("Tile code table is full")
+    code = len(TILE_CHARS)
+    TILE_CHARS.append(ch)
+    TILE_CODES[ch] = code
+    return code
+
+
+def _encode(text: Iterable[str]) -> bytes:
+    codes = TILE_CODES
+    out = bytearray()
+    for ch in text:
+        code = codes.get(ch)
+        out.append(code if code is not None else tile_code(ch))
+    return bytes(out)
+
+
+def _decode(codes: Iterable[int]) -> str:
+    chars = TILE_CHARS
+    return "".join([chars[c] for c in codes])
+
+
+class TileRow:
+    """Mutable view of one grid row supporting ``row[x]`` reads and writes.
+
+    Compatibility shim for code written against ``List[List[str]]`` maps.
+    """
+    __slots__ = ("_grid", "_y", "_offset", "_width")
+
+    def __init__(self, grid: "TileGrid", y: int):
+        self._grid = grid
+        self._y = y
+        self._offset = y * grid.width
+        self._width = grid.width
+
+    def __len__(self) -> int:
+        return self._width
+
+    def __getitem__(self, x: Union[int, slice]):
+        if isinstance(x, slice):
+            return [TILE_CHARS[c] for c in self._grid.codes[self._offset:self._offset + self._width][x]]
+        if x < 0:
+            x += self._width
+        if not 0 <= x < self._width:
+            raise IndexError("tile row index out of range")
+        return TILE_CHARS[self._grid.codes[self._offset + x]]
+
+    def __setitem__(self, x: int, ch: str) -> None:
+        if x < 0:
+            x += self._width
+        if not 0 <= x < self._width:
+            raise IndexError("tile row index out of range")
+        self._grid.set(x, self._y, ch)
+
+    def __iter__(self) -> Iterator[str]:
+        chars = TILE_CHARS
+        for c in self._grid.codes[self._offset:self._offset + self._width]:
+            yield chars[c]
+
+    def __contains__(self, ch: object) -> bool:
+        code = TILE_CODES.get(ch) if isinstance(ch, str) else None
+        if code is None:
+            return False
+        return self._grid.codes.find(code, self._offset, self._offset + self._width) != -1
+
+    def __str__(self) -> str:
+        return self._grid.row_string(self._y)
+
+    def __repr__(self) -> str:
+        return f"TileRow({self._y}, {str(self)!r})"
+
+
+class TileGrid:
+    """Flat ``bytearray`` tile map indexed as ``grid[y][x]`` or ``grid.char_at(x, y)``."""
+
+    def __init__(self, width: int, height: int, fill: str = WALL):
+        self.width = int(width)
+        self.height = int(height)
+        self.codes = bytearray([tile_code(fill)]) * (self.width * self.height)
+        self._rows = [TileRow(self, y) for y in range(self.height)]
+        # Bumped on every tile change so derived data (flow fields, path
+        # caches) can tell when it is stale
+        self.version = 0
+        self.build_masks()
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Union[str, Sequence[str]]]) -> "TileGrid":
+        """Build a grid from strings or lists of tile characters (one per row)."""
+        height = len(rows)
+        width = len(rows[0]) if height > 0 else 0
+        grid = cls(0, 0)
+        grid.width = width
+        grid.height = height
+        buf = bytearray()
+        for y, row in enumerate(rows):
+            if len(row) != width:
+                raise ValueError(f"Map row {y} width mismatch: {len(row)} vs {width}")
+            buf += _encode(row)
+        grid.codes = buf
+        grid._rows = [TileRow(grid, y) for y in range(height)]
+        grid.build_masks()
+        return grid
+
+    # -------------------------
+    # List-of-lists compatibility
+    # -------------------------
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: Union[int, slice]):
+        return self._rows[y]
+
+    def __iter__(self) -> Iterator[TileRow]:
+        return iter(self._rows)
+
+    def __repr__(self) -> str:
+        return f"TileGrid({self.width}x{self.height})"
+
+    # -------------------------
+    # Opacity / walkability masks
+    # -------------------------
+    def build_masks(self) -> None:
+        """(Re)derive the opaque/passable masks from the tile codes."""
+        codes = self.codes
+        self.opaque = bytearray(codes.translate(OPAQUE_TABLE))
+        self.passable = bytearray(codes.translate(PASSABLE_TABLE))
+        self.ai_passable = bytearray(codes.translate(AI_PASSABLE_TABLE))
+
+    def is_opaque(self, x: int, y: int) -> bool:
+        """True if (x, y) blocks sight. Out-of-bounds tiles count as opaque."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.opaque[y * self.width + x] == 1
+        return True
+
+    def is_passable(self, x: int, y: int) -> bool:
+        """True if the player may stand on (x, y), ignoring occupants."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.passable[y * self.width + x] == 1
+        return False
+
+    def is_ai_passable(self, x: int, y: int) -> bool:
+        """True if monsters may path through (x, y), ignoring occupants."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.ai_passable[y * self.width + x] == 1
+        return False
+
+    # -------------------------
+    # Single-tile access
+    # -------------------------
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def code_at(self, x: int, y: int) -> int:
+        return self.codes[y * self.width + x]
+
+    def char_at(self, x: int, y: int) -> str:
+        return TILE_CHARS[self.codes[y * self.width + x]]
+
+    def get(self, x: int, y: int, default: Optional[str] = None) -> Optional[str]:
+        """Bounds-checked tile read returning `default` outside the map."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return TILE_CHARS[self.codes[y * self.width + x]]
+        return default
+
+    def set(self, x: int, y: int, ch: str) -> bool:
+        """Write a tile and patch the masks. Returns True if the tile changed.
+
+        Game code should go through ``Game.set_tile`` so the change is also
+        reported to the renderer.
+        """
+        idx = y * self.width + x
+        code = TILE_CODES.get(ch)
+        if code is None:
+            code = tile_code(ch)
+        if self.codes[idx] == code:
+            return False
+        self.codes[idx] = code
+        self.version += 1
+        self.opaque[idx] = OPAQUE_TABLE[code]
+        self.passable[idx] = PASSABLE_TABLE[code]
+        self.ai_passable[idx] = AI_PASSABLE_TABLE[code]
+        return True
+
+    # -------------------------
+    # Bulk views
+    # -------------------------
+    def row_string(self, y: int, x0: int = 0, x1: Optional[int] = None) -> str:
+        """Return row `y` (optionally the [x0, x1) span) as a string."""
+        if x1 is None or x1 > self.width:
+            x1 = self.width
+        x0 = max(0, x0)
+        base = y * self.width
+        return _decode(self.codes[base + x0:base + x1])
+
+    def rows(self) -> List[str]:
+        """Return every row as a string (compact serialization form)."""
+        return [self.row_string(y) for y in range(self.height)]
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> List[str]:
+        """Return the [x0, x1) x [y0, y1) rectangle as a list of row strings."""
+        y0 = max(0, y0)
+        y1 = min(self.height, y1)
+        return [self.row_string(y, x0, x1) for y in range(y0, y1)]
+
+    def find(self, ch: str) -> Optional[Coord]:
+        """Return the first (x, y) holding tile `ch` in row-major order."""
+        code = TILE_CODES.get(ch)
+        if code is None or self.width == 0:
+            return None
+        idx = self.codes.find(code)
+        if idx == -1:
+            return None
+        return (idx % self.width, idx // self.width)
+
+    def positions_of(self, ch: str) -> Iterator[Coord]:
+        """Yield every (x, y) holding tile `ch` in row-major order."""
+        code = TILE_CODES.get(ch)
+        if code is None or self.width == 0:
+            return
+        codes = self.codes
+        idx = codes.find(code)
+        while idx != -1:
+            yield (idx % self.width, idx // self.width)
+            idx = codes.find(code, idx + 1)
+
+    def to_lists(self) -> List[List[str]]:
+        """Return a detached ``List[List[str]]`` copy of the map."""
+        return [list(self.row_string(y)) for y in range(self.height)]
+
+    def copy(self) -> "TileGrid":
+        grid = TileGrid(0, 0)
+        grid.width = self.width
+        grid.height = self.height
+        grid.codes = bytearray(self.codes)
+        grid._rows = [TileRow(grid, y) for y in range(grid.height)]
+        grid.opaque = bytearray(self.opaque)
+        grid.passable = bytearray(self.passable)
+        grid.ai_passable = bytearray(self.ai_passable)
+        return grid
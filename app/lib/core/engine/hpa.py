@@ -0,0 +1,398 @@
+"""
+Hierarchical pathfinding (HPA*) for large maps.
+
+Plain A* (`PathFinder`) runs with a node budget that long routes across a
+500x200 dungeon easily exceed. A `ClusterGraph` splits the map into
+clusters - the rooms' ``Rect`` interiors for room/corridor dungeons plus
+fixed square chunks for everything else (corridors, caves, town) - and
+records one entrance per contiguous opening between two clusters. Costs
+between the entrances of a cluster are found once with a BFS confined to
+that cluster, so a long route is an A* over a few hundred abstract nodes.
+The tile-level path of each hop is only searched when a route actually
+uses it, then cached.
+
+When a tile changes only the clusters around it are rebuilt (lazily, on
+the next query). `PathHierarchy` owns one graph per passability mask and
+is only active on maps large enough to need it.
+"""
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import heapq
+
+from app.lib.core.engine.grid import TileGrid
+from app.lib.core.engine.pathfinding import STRAIGHT_COST
+from app.lib.core.logger import debug
+
+Coord = Tuple[int, int]
+
+# Side of the square chunks tiles outside rooms are grouped into
+CHUNK_SIZE = 16
+# Maps with fewer tiles than this are left to plain A*
+MIN_HIERARCHY_TILES = 150 * 60
+
+
+class ClusterGraph:
+    """Abstract entrance graph over one passability mask of a `TileGrid`."""
+
+    def __init__(self, grid: TileGrid, mask_name: str = 'passable',
+                 rooms: Optional[Sequence] = None, chunk: int = CHUNK_SIZE):
+        self.grid = grid
+        self.mask_name = mask_name
+        self.chunk = chunk
+        w = grid.width
+        h = grid.height
+        self.width = w
+        self.height = h
+
+        # Cluster id of every tile: rooms first, then the chunk grid
+        self.cluster = array('i', [0]) * (w * h)
+        chunks_x = (w + chunk - 1) // chunk
+        room_count = len(rooms) if rooms else 0
+        for y in range(h):
+            base = y * w
+            row_id = room_count + (y // chunk) * chunks_x
+            for x in range(w):
+                self.cluster[base + x] = row_id + x // chunk
+        for rid, room in enumerate(rooms or ()):
+            for y in range(max(0, room.y1), min(h, room.y2)):
+                base = y * w
+                for x in range(max(0, room.x1), min(w, room.x2)):
+                    self.cluster[base + x] = rid
+        self.tiles: Dict[int, List[int]] = {}
+        for idx, cid in enumerate(self.cluster):
+            self.tiles.setdefault(cid, []).append(idx)
+
+        # (cid_a, cid_b) with cid_a < cid_b -> entrance tile pairs (idx_a, idx_b)
+        self.entrances: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # cid -> clusters sharing at least one entrance with it
+        self.neighbours: Dict[int, Set[int]] = {}
+        # cid -> entrance tiles inside it
+        self.nodes: Dict[int, Set[int]] = {}
+        # cid -> {node: {node: cost}} within the cluster
+        self.intra: Dict[int, Dict[int, Dict[int, int]]] = {}
+        # node -> {node in an adjacent cluster: cost}
+        self.inter: Dict[int, Dict[int, int]] = {}
+        # (node_a, node_b) -> tile path from a to b (excluding a)
+        self._segments: Dict[Tuple[int, int], List[int]] = {}
+        self._dirty: Set[int] = set()
+        self.rebuilds = 0
+        self._build()
+
+    @property
+    def mask(self) -> bytearray:
+        return getattr(self.grid, self.mask_name)
+
+    # -------------------------
+    # Construction
+    # -------------------------
+    def _build(self) -> None:
+        for cid in self.tiles:
+            for key, pairs in self._scan_borders(cid).items():
+                self.entrances[key] = pairs
+        self._link(self.tiles.keys())
+
+    def _scan_borders(self, cid: int) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
+        """Entrances between `cid` and each neighbouring cluster.
+
+        Every run of adjacent open tile pairs across a border becomes one
+        entrance at the middle of the run.
+        """
+        w = self.width
+        size = w * self.height
+        cluster = self.cluster
+        mask = self.mask
+        edges: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for idx in self.tiles[cid]:
+            if not mask[idx]:
+                continue
+            x = idx % w
+            for n in (idx - 1 if x > 0 else -1, idx + 1 if x < w - 1 else -1,
+                      idx - w, idx + w if idx + w < size else -1):
+                if n < 0 or not mask[n]:
+                    continue
+                other = cluster[n]
+                if other == cid:
+                    continue
+                if cid < other:
+                    edges.setdefault((cid, other), []).append((idx, n))
+                else:
+                    edges.setdefault((other, cid), []).append((n, idx))
+        result: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for key, pairs in edges.items():
+            pairs.sort()
+            runs: List[List[Tuple[int, int]]] = []
+            for a, b in pairs:
+                if runs:
+                    pa, pb = runs[-1][-1]
+                    if self._adjacent(a, pa) and self._adjacent(b, pb):
+                        runs[-1].append((a, b))
+                        continue
+                runs.append([(a, b)])
+            result[key] = [run[len(run) // 2] for run in runs]
+        return result
+
+    def _adjacent(self, a: int, b: int) -> bool:
+        w = self.width
+        d = abs(a - b)
+        return d == w or (d == 1 and a // w == b // w)
+
+    def _link(self, clusters: Iterable[int]) -> None:
+        """Recompute entrance nodes and intra-cluster costs for `clusters`."""
+        clusters = set(clusters)
+        for cid in clusters:
+            # Drop links of the old entrances, some of which may be gone now
+            for node in self.nodes.get(cid, ()):
+                self.inter.pop(node, None)
+            self.nodes[cid] = set()
+            self.neighbours[cid] = set()
+        for (ca, cb), pairs in self.entrances.items():
+            if ca in clusters:
+                self.neighbours[ca].add(cb)
+                self.nodes[ca].update(a for a, _ in pairs)
+            if cb in clusters:
+                self.neighbours[cb].add(ca)
+                self.nodes[cb].update(b for _, b in pairs)
+        for (ca, cb), pairs in self.entrances.items():
+            if ca in clusters or cb in clusters:
+                for a, b in pairs:
+                    self.inter.setdefault(a, {})[b] = STRAIGHT_COST
+                    self.inter.setdefault(b, {})[a] = STRAIGHT_COST
+        for cid in clusters:
+            nodes = self.nodes[cid]
+            edges: Dict[int, Dict[int, int]] = {}
+            for node in nodes:
+                dist, _ = self._cluster_bfs(node, cid, nodes)
+                edges[node] = {n: d * STRAIGHT_COST for n, d in dist.items() if n in nodes and n != node}
+            self.intra[cid] = edges
+        if self._segments:
+            cluster = self.cluster
+            self._segments = {k: v for k, v in self._segments.items() if cluster[k[0]] not in clusters}
+
+    def _cluster_bfs(self, src: int, cid: int, targets: Optional[Set[int]] = None) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """BFS from `src` confined to cluster `cid`; returns (steps, parents).
+
+        Stops early once every tile in `targets` has been reached.
+        """
+        w = self.width
+        size = w * self.height
+        cluster = self.cluster
+        mask = self.mask
+        dist = {src: 0}
+        parent = {src: -1}
+        remaining = len(targets) - (src in targets) if targets is not None else -1
+        queue = deque((src,))
+        while queue and remaining != 0:
+            idx = queue.popleft()
+            nd = dist[idx] + 1
+            x = idx % w
+            for n in (idx - 1 if x > 0 else -1, idx + 1 if x < w - 1 else -1,
+                      idx - w, idx + w if idx + w < size else -1):
+                if n < 0 or n in dist or cluster[n] != cid or not mask[n]:
+                    continue
+                dist[n] = nd
+                parent[n] = idx
+                queue.append(n)
+                if targets is not None and n in targets:
+                    remaining -= 1
+        return dist, parent
+
+    # -------------------------
+    # Local updates
+    # -------------------------
+    def tile_changed(self, x: int, y: int) -> None:
+        """Mark the clusters around (x, y) for rebuilding on the next query."""
+        w = self.width
+        if not (0 <= x < w and 0 <= y < self.height):
+            return
+        idx = y * w + x
+        self._dirty.add(self.cluster[idx])
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < w and 0 <= ny < self.height:
+                self._dirty.add(self.cluster[ny * w + nx])
+
+    def _refresh(self) -> None:
+        if not self._dirty:
+            return
+        dirty = self._dirty
+        self._dirty = set()
+        affected = set(dirty)
+        for cid in dirty:
+            affected |= self.neighbours.get(cid, set())
+        for key in [k for k in self.entrances if k[0] in dirty or k[1] in dirty]:
+            del self.entrances[key]
+        for cid in dirty:
+            for key, pairs in self._scan_borders(cid).items():
+                self.entrances[key] = pairs
+                affected.update(key)
+        self._link(affected)
+        self.rebuilds += 1
+        debug("[HPA] rebuilt %d clusters (%s)", len(affected), self.mask_name)
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def find_path(self, start: Coord, goal: Coord, max_nodes: int = 20000) -> List[Coord]:
+        """Plan start -> goal over the cluster graph and refine it to tiles.
+
+        Returns (x, y) steps excluding start and including goal, or [] if
+        the goal is unreachable. Occupants are not considered; callers
+        route around them locally.
+        """
+        self._refresh()
+        w = self.width
+        h = self.height
+        sx, sy = int(start[0]), int(start[1])
+        gx, gy = int(goal[0]), int(goal[1])
+        if not (0 <= sx < w and 0 <= sy < h and 0 <= gx < w and 0 <= gy < h):
+            return []
+        s = sy * w + sx
+        g = gy * w + gx
+        mask = self.mask
+        if s == g or not mask[g]:
+            return []
+        cluster = self.cluster
+        sc = cluster[s]
+        gc = cluster[g]
+
+        s_dist, s_parent = self._cluster_bfs(s, sc)
+        if sc == gc and g in s_dist:
+            return self._to_coords(self._unwind(s_parent, g))
+        g_dist, g_parent = self._cluster_bfs(g, gc)
+
+        # A* over entrance nodes; start and goal act as temporary nodes
+        start_edges = {n: s_dist[n] * STRAIGHT_COST for n in self.nodes.get(sc, ()) if n in s_dist}
+        goal_edges = {n: g_dist[n] * STRAIGHT_COST for n in self.nodes.get(gc, ()) if n in g_dist}
+        if not start_edges or not goal_edges:
+            return []
+        intra = self.intra
+        inter = self.inter
+        best = {s: 0}
+        came: Dict[int, int] = {s: -1}
+        open_heap: List[Tuple[int, int]] = [(0, s)]
+        expanded = 0
+        found = False
+        while open_heap and expanded < max_nodes:
+            f, node = heapq.heappop(open_heap)
+            cost = best[node]
+            ny, nx = divmod(node, w)
+            if f > cost + STRAIGHT_COST * (abs(nx - gx) + abs(ny - gy)):
+                continue  # Stale heap entry
+            if node == g:
+                found = True
+                break
+            expanded += 1
+            if node == s:
+                steps = list(start_edges.items())
+                steps += inter.get(s, {}).items()
+            else:
+                steps = list(intra.get(cluster[node], {}).get(node, {}).items())
+                steps += inter.get(node, {}).items()
+                if node in goal_edges:
+                    steps.append((g, goal_edges[node]))
+            for n, c in steps:
+                nc = cost + c
+                if nc < best.get(n, 1 << 30):
+                    best[n] = nc
+                    came[n] = node
+                    ny, nx = divmod(n, w)
+                    heapq.heappush(open_heap, (nc + STRAIGHT_COST * (abs(nx - gx) + abs(ny - gy)), n))
+        if not found:
+            return []
+
+        hops: List[int] = []
+        node = g
+        while node != -1:
+            hops.append(node)
+            node = came[node]
+        hops.reverse()
+
+        tiles: List[int] = []
+        for a, b in zip(hops, hops[1:]):
+            if cluster[a] != cluster[b]:
+                tiles.append(b)
+            elif a == s:
+                tiles.extend(self._unwind(s_parent, b))
+            elif b == g:
+                back = self._unwind(g_parent, a)
+                # Walk the goal-rooted tree backwards: a -> ... -> g
+                back.reverse()
+                tiles.extend(back[1:] + [g])
+            else:
+                tiles.extend(self._segment(a, b))
+        return self._to_coords(tiles)
+
+    def _segment(self, a: int, b: int) -> List[int]:
+        """Tile path between two entrances of one cluster (cached)."""
+        seg = self._segments.get((a, b))
+        if seg is None:
+            _, parent = self._cluster_bfs(a, self.cluster[a], {b})
+            seg = self._unwind(parent, b)
+            self._segments[(a, b)] = seg
+        return seg
+
+    @staticmethod
+    def _unwind(parent: Dict[int, int], idx: int) -> List[int]:
+        path: List[int] = []
+        while parent.get(idx, -1) != -1:
+            path.append(idx)
+            idx = parent[idx]
+        path.reverse()
+        return path
+
+    def _to_coords(self, tiles: List[int]) -> List[Coord]:
+        w = self.width
+        return [(idx % w, idx // w) for idx in tiles]
+
+
+class PathHierarchy:
+    """Per-map owner of the cluster graphs, one per passability mask.
+
+    Graphs are only built for maps of at least `MIN_HIERARCHY_TILES` tiles;
+    on smaller maps `active` is False and `find_path` returns [].
+    """
+
+    def __init__(self):
+        self.grid: Optional[TileGrid] = None
+        self.rooms: Sequence = ()
+        self.graphs: Dict[str, ClusterGraph] = {}
+
+    @property
+    def active(self) -> bool:
+        grid = self.grid
+        return grid is not None and grid.width * grid.height >= MIN_HIERARCHY_TILES
+
+    def bind(self, grid: TileGrid, rooms: Optional[Sequence] = None) -> None:
+        """Attach to a (new) map. The player-walkability graph is built now,
+        others on first use."""
+        self.grid = grid
+        self.rooms = rooms or ()
+        self.graphs = {}
+        if self.active:
+            self.graph('passable')
+
+    def graph(self, mask_name: str = 'passable') -> Optional[ClusterGraph]:
+        if not self.active:
+            return None
+        graph = self.graphs.get(mask_name)
+        if graph is None:
+            graph = ClusterGraph(self.grid, mask_name, self.rooms)
+            self.graphs[mask_name] = graph
+            debug("[HPA] %s graph: %d clusters, %d entrance pairs",
+                  mask_name, len(graph.tiles), sum(len(p) for p in graph.entrances.values()))
+        return graph
+
+    def tile_changed(self, x: int, y: int) -> None:
+        for graph in self.graphs.values():
+            graph.tile_changed(x, y)
+
+    def find_path(self, start: Coord, goal: Coord, mask_name: str = 'passable') -> List[Coord]:
+        graph = self.graph(mask_name)
+        if graph is None:
+            return []
+        try:
+            return graph.find_path(start, goal)
+        except Exception as e:
+            debug("[HPA] path %s -> %s failed: %s", start, goal, e)
+            return []
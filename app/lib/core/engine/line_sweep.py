@@ -0,0 +1,146 @@
+"""
+Whole-map Bresenham line-of-sight sweep.
+
+Gives exactly the tiles `FOV._line_of_sight` would accept from an origin (a
+Bresenham trace to every tile on the map), without tracing each line. A
+tile is hidden when its line passes through an opaque tile, so the sweep
+works from the walls instead: each opaque tile marks its "shadow", the
+precomputed set of targets whose lines pass through it, and whatever is
+left unmarked is visible.
+
+A wall whose neighbours towards the origin are all opaque only shadows
+targets that one of those neighbours already shadows (every line reaches
+it through one of them), so only the exposed faces of walls are marked.
+
+Lines depend only on the offset between origin and target, so shadows are
+tabulated over the grid of offsets, (2 * width - 1) x (2 * height - 1).
+Each `LineSweep` keeps the table for the last map size it swept; the
+table takes a few hundred ms and several MB, so it is not kept per size. Bresenham lines mirror exactly in x and y, so only the
+quadrant with non-negative offsets is traced. Each shadow is stored as an
+int bit mask over the offset grid, so marking a wall is a single shift and
+OR.
+"""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+
+def shadow_table(width: int, height: int) -> List[Tuple[int, int]]:
+    """Build the shadow of every offset for a `width` x `height` map.
+
+    Offsets (dx, dy) are indexed as (dy + height - 1) * (2 * width - 1) +
+    dx + width - 1. The shadow of offset i is the mask `bits << low` for
+    `(low, bits) = table[i]`.
+    """
+    row = 2 * width - 1
+    cx = width - 1
+    cy = height - 1
+    shadows: List[list] = [[] for _ in range(row * (2 * height - 1))]
+    for ty in range(height):
+        for tx in range(width):
+            if not (tx or ty):
+                continue
+            # Intermediate steps of the line to (tx, ty), as in _line_of_sight
+            steps = []
+            dy = -ty
+            err = tx + dy
+            x = y = 0
+            while True:
+                e2 = 2 * err
+                if e2 >= dy:
+                    err += dy
+                    x += 1
+                if e2 <= tx:
+                    err += tx
+                    y += 1
+                if x == tx and y == ty:
+                    break
+                steps.append((x, y))
+            mirrors = [(1, 1)]
+            if tx:
+                mirrors.append((-1, 1))
+            if ty:
+                mirrors.append((1, -1))
+            if tx and ty:
+                mirrors.append((-1, -1))
+            for mx, my in mirrors:
+                target = (cy + my * ty) * row + cx + mx * tx
+                for x, y in steps:
+                    shadows[(cy + my * y) * row + cx + mx * x].append(target)
+    table = []
+    for targets in shadows:
+        if not targets:
+            table.append((0, 0))
+            continue
+        low = min(targets)
+        high = max(targets)
+        # Binary digits, most significant (highest offset) first
+        digits = bytearray(b'0') * (high - low + 1)
+        for target in targets:
+            digits[high - target] = 49
+        table.append((low, int(digits, 2)))
+    return table
+
+
+class LineSweep:
+    """Reusable whole-map LOS sweep."""
+
+    def __init__(self):
+        # Flat indices (y * width + x) of every visible tile
+        self.visible: List[int] = []
+        # Shadow table for the last map size swept
+        self._size: Optional[Tuple[int, int]] = None
+        self._shadows: List[Tuple[int, int]] = []
+
+    def prepare(self, width: int, height: int) -> List[Tuple[int, int]]:
+        """Return the shadow table for a `width` x `height` map, building it if the size changed."""
+        if self._size != (width, height):
+            # Drop the old table first so two are never held at once
+            self._shadows = []
+            self._shadows = shadow_table(width, height)
+            self._size = (width, height)
+        return self._shadows
+
+    def compute(self, opaque: bytearray, width: int, height: int, ox: int, oy: int) -> List[int]:
+        """Return the flat indices of every tile with a clear Bresenham line from (ox, oy).
+
+        The target tile itself may be opaque (walls are visible). The
+        returned list is replaced by the next call.
+        """
+        visible = self.visible = []
+        if not (0 <= ox < width and 0 <= oy < height):
+            return visible
+        shadows = self.prepare(width, height)
+        row = 2 * width - 1
+        # Offset index of map tile (0, 0); tile (x, y) is at base + y * row + x
+        base = (height - 1 - oy) * row + width - 1 - ox
+        # Bit per offset: 1 = in some wall's shadow
+        marks = 0
+        for y in range(height):
+            sy = (y > oy) - (y < oy)
+            line = y * width
+            back = (y - sy) * width
+            for x in range(width):
+                if not opaque[line + x]:
+                    continue
+                sx = (x > ox) - (x < ox)
+                # Lines reach (x, y) from one of its neighbours towards the
+                # origin; if all of those are opaque (and none is the origin
+                # itself) they already shadow everything this tile would
+                if (abs(x - ox) > 1 or abs(y - oy) > 1) \
+                        and (not sx or opaque[line + x - sx]) \
+                        and (not sy or opaque[back + x]) \
+                        and (not (sx and sy) or opaque[back + x - sx]):
+                    continue
+                low, bits = shadows[base + y * row + x]
+                marks |= bits << low
+        full = (1 << width) - 1
+        marks >>= base
+        for y in range(height):
+            line = y * width
+            clear = (marks & full) ^ full
+            while clear:
+                bit = clear & -clear
+                visible.append(line + bit.bit_length() - 1)
+                clear ^= bit
+            marks >>= row
+        return visible
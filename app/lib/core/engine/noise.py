@@ -1,7 +1,8 @@
-import math
 import random
 from typing import Any, Dict, List, Tuple
 
+from app.lib.core.engine.geometry import distance
+
 
 class NoiseAndSleepManager:
     def __init__(self, game):
@@ -41,15 +42,16 @@ class NoiseAndSleepManager:
         radius = noise['radius']
         intensity = noise['intensity']
         
-        for entity in self.game.entity_manager.entities:
+        for entity in self.game.entity_manager.index.in_radius(nx, ny, radius):
             if not entity.is_sleeping:
                 continue
             
             ex, ey = entity.position
-            dist = math.sqrt((ex - nx)**2 + (ey - ny)**2)
+            d2 = (ex - nx) * (ex - nx) + (ey - ny) * (ey - ny)
             
-            if dist > radius:
+            if d2 > radius * radius:
                 continue
+            dist = distance(d2)
             
             # Wake chance based on distance and intensity
             # Formula: base_chance * (intensity/10) * (1 - dist/radius)
@@ -62,6 +64,7 @@ class NoiseAndSleepManager:
             
             if random.random() < wake_chance:
                 entity.wake_up()
+                self.game.entity_manager.wake_entity(entity)
                 if dist <= 2:  # Very close
                     self.game.log_event(f"{entity.name} wakes with a start!")
     
@@ -1,15 +1,41 @@
 """
-Simple A* pathfinding for grid-based maps.
+A* pathfinding for grid-based maps.
 
-Provides a function find_path(map_data, start, goal, is_walkable) that returns a list of
-(step_x, step_y) positions from start to goal (excluding start, including goal) or an empty list if no path.
+`PathFinder` is the engine used by the game: it is bound to the current
+`TileGrid`, reads static passability from one of the grid's masks, takes
+dynamic occupants as a set and keeps its g-score/parent arrays between
+searches (a generation counter marks which entries belong to the current
+search). The older callback-based find_path(map_width, map_height, start,
+goal, is_walkable) is kept for ad-hoc use.
+
+`FlowField` is a bounded Dijkstra distance map from a single origin (the
+player). Any number of chasers can descend it with O(1) work per step instead
+of running one A* each. `SafetyMap` turns such a field into an escape map for
+fleeing entities. `PathFollower` caches a walked route (click-to-move) and
+repairs only the broken stretch when something gets in the way.
+
+Both return a list of (step_x, step_y) positions from start to goal
+(excluding start, including goal) or an empty list if no path.
 """
 from __future__ import annotations
-from typing import Callable, List, Tuple, Optional, Dict
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Collection, Dict, Iterable, List, Optional, Tuple
 import heapq
 
+from app.lib.core.engine.grid import TileGrid
+
+if TYPE_CHECKING:
+    from app.lib.core.engine.hpa import PathHierarchy
+
 Coord = Tuple[int, int]
 
+# Step costs: orthogonal moves cost 10, diagonal moves 14 (~10 * sqrt(2))
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
+_STEPS_4 = ((1, 0, STRAIGHT_COST), (-1, 0, STRAIGHT_COST), (0, 1, STRAIGHT_COST), (0, -1, STRAIGHT_COST))
+_STEPS_8 = _STEPS_4 + ((1, 1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST))
+
 
 def heuristic(a: Coord, b: Coord) -> int:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -84,3 +110,699 @@ def find_path(
 
     # No path
     return []
+
+
+class PathFinder:
+    """Reusable A* engine bound to one map.
+
+    Static passability comes from a flat grid mask (``grid.passable`` by
+    default, ``grid.ai_passable`` for monsters); dynamic occupants are passed
+    per call as a collection of (x, y). Nothing is reallocated between
+    searches on the same map.
+    """
+
+    def __init__(self, grid: Optional[TileGrid] = None):
+        self.grid: Optional[TileGrid] = None
+        self.width = 0
+        self.height = 0
+        self._g = array('i')
+        self._parent = array('i')
+        self._stamp = array('I')
+        self._generation = 0
+        # Instrumentation
+        self.last_expanded = 0
+        self.total_expanded = 0
+        self.searches = 0
+        if grid is not None:
+            self.bind(grid)
+
+    def bind(self, grid: TileGrid) -> None:
+        """Attach to a (new) map, growing the search arrays only if needed."""
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+        size = grid.width * grid.height
+        if len(self._g) < size:
+            self._g = array('i', [0]) * size
+            self._parent = array('i', [-1]) * size
+            self._stamp = array('I', [0]) * size
+            self._generation = 0
+
+    def _next_generation(self) -> int:
+        self._generation += 1
+        if self._generation >= 0xFFFFFFFF:
+            # Counter wrapped: clear stamps once and start over
+            self._stamp = array('I', [0]) * len(self._stamp)
+            self._generation = 1
+        return self._generation
+
+    def _blocked_indices(self, blocked: Optional[Iterable[Coord]]) -> Collection[int]:
+        if not blocked:
+            return ()
+        w = self.width
+        h = self.height
+        return {int(y) * w + int(x) for (x, y) in blocked if 0 <= x < w and 0 <= y < h}
+
+    def _heuristic(self, x: int, y: int, gx: int, gy: int, diagonal: bool) -> int:
+        dx = abs(x - gx)
+        dy = abs(y - gy)
+        if diagonal:
+            # Octile distance
+            return STRAIGHT_COST * (dx + dy) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dx, dy)
+        return STRAIGHT_COST * (dx + dy)
+
+    def path_costs(self, path: List[Coord]) -> List[int]:
+        """g-values of `path`'s steps from the search that just produced it.
+
+        Only meaningful right after that search; steps the current search
+        did not reach read as -1.
+        """
+        g = self._g
+        stamp = self._stamp
+        gen = self._generation
+        w = self.width
+        costs: List[int] = []
+        for x, y in path:
+            idx = y * w + x
+            costs.append(g[idx] if stamp[idx] == gen else -1)
+        return costs
+
+    def _reconstruct(self, idx: int) -> List[Coord]:
+        parent = self._parent
+        w = self.width
+        path: List[Coord] = []
+        while parent[idx] != -1:
+            y, x = divmod(idx, w)
+            path.append((x, y))
+            idx = parent[idx]
+        path.reverse()
+        return path
+
+    def find_path(
+        self,
+        start: Coord,
+        goal: Coord,
+        blocked: Optional[Iterable[Coord]] = None,
+        passable: Optional[bytearray] = None,
+        max_nodes: int = 2000,
+        diagonal: bool = False,
+    ) -> List[Coord]:
+        """A* from start to goal.
+
+        Args:
+            blocked: tiles occupied by entities (the goal itself is exempt so
+                callers can path onto the tile they want to attack/reach)
+            passable: flat mask to read static passability from
+                (defaults to ``grid.passable``)
+            max_nodes: expansion budget; the search gives up once exceeded
+            diagonal: allow 8-way moves; diagonals may not cut wall corners
+        """
+        grid = self.grid
+        if grid is None:
+            return []
+        try:
+            sx, sy = int(start[0]), int(start[1])
+            gx, gy = int(goal[0]), int(goal[1])
+        except Exception:
+            # Malformed inputs -> no path
+            return []
+        w = self.width
+        h = self.height
+        self.last_expanded = 0
+        self.searches += 1
+        if (sx, sy) == (gx, gy):
+            return []
+        if not (0 <= sx < w and 0 <= sy < h and 0 <= gx < w and 0 <= gy < h):
+            return []
+        mask = passable if passable is not None else grid.passable
+        goal_idx = gy * w + gx
+        if not mask[goal_idx]:
+            return []
+        blocked_idx = self._blocked_indices(blocked)
+        steps = _STEPS_8 if diagonal else _STEPS_4
+        corner = DIAGONAL_COST - 2 * STRAIGHT_COST
+
+        gen = self._next_generation()
+        g = self._g
+        parent = self._parent
+        stamp = self._stamp
+        start_idx = sy * w + sx
+        g[start_idx] = 0
+        parent[start_idx] = -1
+        stamp[start_idx] = gen
+        h0 = self._heuristic(sx, sy, gx, gy, diagonal)
+        # Heap entries (f, h, idx): ties on f prefer nodes closer to the goal
+        open_heap: List[Tuple[int, int, int]] = [(h0, h0, start_idx)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        expanded = 0
+
+        while open_heap and expanded < max_nodes:
+            f, hc, idx = heappop(open_heap)
+            gc = g[idx]
+            if f - hc > gc:
+                continue  # Stale heap entry
+            expanded += 1
+            if idx == goal_idx:
+                self.last_expanded = expanded
+                self.total_expanded += expanded
+                return self._reconstruct(idx)
+            y, x = divmod(idx, w)
+            for dx, dy, cost in steps:
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                n = ny * w + nx
+                if not mask[n] or (n in blocked_idx and n != goal_idx):
+                    continue
+                if dx and dy and not (mask[y * w + nx] and mask[ny * w + x]):
+                    continue  # No cutting wall corners
+                ng = gc + cost
+                if stamp[n] == gen and ng >= g[n]:
+                    continue
+                stamp[n] = gen
+                g[n] = ng
+                parent[n] = idx
+                ddx = abs(nx - gx)
+                ddy = abs(ny - gy)
+                hn = STRAIGHT_COST * (ddx + ddy)
+                if diagonal:
+                    hn += corner * (ddx if ddx < ddy else ddy)
+                heappush(open_heap, (ng + hn, hn, n))
+
+        self.last_expanded = expanded
+        self.total_expanded += expanded
+        return []
+
+    def find_path_to_any(
+        self,
+        start: Coord,
+        goals: Optional[Iterable[Coord]] = None,
+        is_goal: Optional[Callable[[int, int], bool]] = None,
+        blocked: Optional[Iterable[Coord]] = None,
+        passable: Optional[bytearray] = None,
+        max_nodes: int = 2000,
+        diagonal: bool = False,
+        goal_costs: Optional[Dict[Coord, int]] = None,
+    ) -> List[Coord]:
+        """Shortest path from start to the nearest of several goals, in one search.
+
+        Give either `goals` (a collection of (x, y); A* with the distance to
+        the goals' bounding box as heuristic) or `is_goal(x, y)` (plain Dijkstra,
+        the predicate is tested as tiles are settled). Goals must be passable
+        in the mask and, unlike ``find_path``, are not exempt from `blocked`.
+        The start tile never counts as a goal. The reached goal is the last
+        element of the returned path.
+
+        `goal_costs` optionally adds a fixed cost for finishing at a given
+        goal (e.g. the known remaining cost of a cached route from there);
+        the search then minimises path cost + goal cost instead of stopping
+        at the first goal reached.
+        """
+        grid = self.grid
+        if grid is None or (goals is None and is_goal is None):
+            return []
+        try:
+            sx, sy = int(start[0]), int(start[1])
+        except Exception:
+            return []
+        w = self.width
+        h = self.height
+        self.last_expanded = 0
+        self.searches += 1
+        if not (0 <= sx < w and 0 <= sy < h):
+            return []
+        mask = passable if passable is not None else grid.passable
+        blocked_idx = self._blocked_indices(blocked)
+        start_idx = sy * w + sx
+
+        goal_idx: Optional[Dict[int, int]] = None
+        goal_xy: List[Coord] = []
+        if goals is not None:
+            goal_idx = {}
+            for gx, gy in goals:
+                gx, gy = int(gx), int(gy)
+                if not (0 <= gx < w and 0 <= gy < h):
+                    continue
+                g_i = gy * w + gx
+                if g_i == start_idx or not mask[g_i] or g_i in blocked_idx:
+                    continue
+                goal_idx[g_i] = goal_costs.get((gx, gy), 0) if goal_costs else 0
+                goal_xy.append((gx, gy))
+            if not goal_idx:
+                return []
+        best_idx = -1
+        best_total = 0
+
+        # Distance to the goals' bounding box plus the cheapest goal cost:
+        # never more than the true cost to finish, and O(1) however many
+        # goals there are
+        if goal_xy:
+            min_x = min(gx for gx, _ in goal_xy)
+            max_x = max(gx for gx, _ in goal_xy)
+            min_y = min(gy for _, gy in goal_xy)
+            max_y = max(gy for _, gy in goal_xy)
+            min_cost = min(goal_idx.values())
+
+        def estimate(x: int, y: int) -> int:
+            if not goal_xy:
+                return 0
+            bx = min_x if x < min_x else max_x if x > max_x else x
+            by = min_y if y < min_y else max_y if y > max_y else y
+            return self._heuristic(x, y, bx, by, diagonal) + min_cost
+
+        steps = _STEPS_8 if diagonal else _STEPS_4
+        gen = self._next_generation()
+        g = self._g
+        parent = self._parent
+        stamp = self._stamp
+        g[start_idx] = 0
+        parent[start_idx] = -1
+        stamp[start_idx] = gen
+        h0 = estimate(sx, sy)
+        open_heap: List[Tuple[int, int, int]] = [(h0, h0, start_idx)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        expanded = 0
+
+        while open_heap and expanded < max_nodes:
+            f, hc, idx = heappop(open_heap)
+            gc = g[idx]
+            if f - hc > gc:
+                continue  # Stale heap entry
+            if best_idx != -1 and f >= best_total:
+                break  # Nothing left can beat the best goal found
+            expanded += 1
+            y, x = divmod(idx, w)
+            if idx != start_idx:
+                if goal_idx is not None:
+                    reached = idx in goal_idx
+                else:
+                    reached = bool(is_goal(x, y))
+                if reached:
+                    if not goal_costs:
+                        self.last_expanded = expanded
+                        self.total_expanded += expanded
+                        return self._reconstruct(idx)
+                    total = gc + goal_idx[idx]
+                    if best_idx == -1 or total < best_total:
+                        best_idx = idx
+                        best_total = total
+            for dx, dy, cost in steps:
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < w and 0 <= ny < h):
+                    continue
+                n = ny * w + nx
+                if not mask[n] or n in blocked_idx:
+                    continue
+                if dx and dy and not (mask[y * w + nx] and mask[ny * w + x]):
+                    continue  # No cutting wall corners
+                ng = gc + cost
+                if stamp[n] == gen and ng >= g[n]:
+                    continue
+                stamp[n] = gen
+                g[n] = ng
+                parent[n] = idx
+                hn = estimate(nx, ny)
+                heappush(open_heap, (ng + hn, hn, n))
+
+        self.last_expanded = expanded
+        self.total_expanded += expanded
+        if best_idx != -1:
+            return self._reconstruct(best_idx)
+        return []
+
+
+class FlowField:
+    """Distance map (in 4-way steps) from one origin over a passability mask.
+
+    The field is bounded by `max_dist` so its cost does not grow with map
+    size; tiles farther away (or unreachable) read as ``UNREACHED``. Only the
+    entries written by the last ``compute`` are cleared on the next one.
+    """
+
+    UNREACHED = -1
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.dist = array('i')
+        self.origin: Optional[Coord] = None
+        self.max_dist = 0
+        self._touched: List[int] = []
+        self._grid: Optional[TileGrid] = None
+        self._version = -1
+        self._mask: Optional[bytearray] = None
+        # Instrumentation
+        self.computations = 0
+
+    def is_current(self, grid: TileGrid, origin: Coord, passable: Optional[bytearray] = None) -> bool:
+        """True if the field was built for this map state and origin."""
+        return (
+            self._grid is grid
+            and self._version == grid.version
+            and self.origin == origin
+            and (passable is None or self._mask is passable)
+        )
+
+    def compute(self, grid: TileGrid, origin: Coord, passable: Optional[bytearray] = None,
+                max_dist: int = 40) -> None:
+        """Flood outwards from `origin` over `passable` (default ``grid.passable``).
+
+        The origin itself is always distance 0 even if the mask marks it
+        impassable (e.g. the player standing on a closed-door tile).
+        """
+        w = grid.width
+        h = grid.height
+        size = w * h
+        dist = self.dist
+        if len(dist) != size:
+            dist = self.dist = array('i', [self.UNREACHED]) * size
+        else:
+            for idx in self._touched:
+                dist[idx] = self.UNREACHED
+        touched: List[int] = []
+        self._touched = touched
+        self.width = w
+        self.height = h
+        self._grid = grid
+        self._version = grid.version
+        mask = passable if passable is not None else grid.passable
+        self._mask = mask
+        self.max_dist = max_dist
+        try:
+            ox, oy = int(origin[0]), int(origin[1])
+        except Exception:
+            self.origin = None
+            return
+        self.origin = (ox, oy)
+        self.computations += 1
+        if not (0 <= ox < w and 0 <= oy < h):
+            return
+
+        start = oy * w + ox
+        dist[start] = 0
+        touched.append(start)
+        queue = deque((start,))
+        popleft = queue.popleft
+        push = queue.append
+        unreached = self.UNREACHED
+        while queue:
+            idx = popleft()
+            d = dist[idx]
+            if d >= max_dist:
+                continue
+            nd = d + 1
+            x = idx % w
+            # Left, right, up, down
+            if x > 0:
+                n = idx - 1
+                if dist[n] == unreached and mask[n]:
+                    dist[n] = nd
+                    touched.append(n)
+                    push(n)
+            if x < w - 1:
+                n = idx + 1
+                if dist[n] == unreached and mask[n]:
+                    dist[n] = nd
+                    touched.append(n)
+                    push(n)
+            if idx >= w:
+                n = idx - w
+                if dist[n] == unreached and mask[n]:
+                    dist[n] = nd
+                    touched.append(n)
+                    push(n)
+            if idx < size - w:
+                n = idx + w
+                if dist[n] == unreached and mask[n]:
+                    dist[n] = nd
+                    touched.append(n)
+                    push(n)
+
+    @property
+    def reached(self) -> int:
+        """Number of tiles the last ``compute`` reached."""
+        return len(self._touched)
+
+    def distance(self, x: int, y: int) -> int:
+        """Steps from (x, y) to the origin, or ``UNREACHED``."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.dist[y * self.width + x]
+        return self.UNREACHED
+
+    def downhill(self, x: int, y: int, blocked: Optional[Collection[Coord]] = None) -> List[Coord]:
+        """Neighbours of (x, y) that are one step closer to the origin.
+
+        Tiles in `blocked` are skipped, except the origin itself so a chaser
+        standing next to it gets it back as its (attack) step. Returns an
+        empty list if (x, y) is outside the field.
+        """
+        d = self.distance(x, y)
+        if d <= 0:
+            return []
+        want = d - 1
+        steps: List[Coord] = []
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if self.distance(nx, ny) != want:
+                continue
+            if blocked and (nx, ny) in blocked and (nx, ny) != self.origin:
+                continue
+            steps.append((nx, ny))
+        return steps
+
+
+class SafetyMap:
+    """Escape map derived from a `FlowField` (negative-scaled Dijkstra rescan).
+
+    Every tile the field reached is seeded with ``-distance * scale`` and the
+    map is then relaxed outwards again, so descending it leads away from the
+    origin without getting stuck in dead-end corners (a corridor that loops
+    back past the origin scores better than a closet next to it). Values are
+    in ``STRAIGHT_COST`` units; tiles outside the source field read as None.
+    """
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.value = array('i')
+        self.origin: Optional[Coord] = None
+        self._field: Optional[FlowField] = None
+        self._touched: List[int] = []
+
+    def compute(self, field: FlowField, scale: float = 1.2) -> None:
+        w = field.width
+        h = field.height
+        size = w * h
+        unset = 0x7FFFFFFF
+        value = self.value
+        if len(value) != size:
+            value = self.value = array('i', [unset]) * size
+        else:
+            for idx in self._touched:
+                value[idx] = unset
+        self.width = w
+        self.height = h
+        self.origin = field.origin
+        self._field = field
+        touched = list(field._touched)
+        self._touched = touched
+
+        dist = field.dist
+        unreached = FlowField.UNREACHED
+        k = scale * STRAIGHT_COST
+        open_heap: List[Tuple[int, int]] = []
+        for idx in touched:
+            v = -int(dist[idx] * k)
+            value[idx] = v
+            open_heap.append((v, idx))
+        heapq.heapify(open_heap)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        while open_heap:
+            v, idx = heappop(open_heap)
+            if v > value[idx]:
+                continue  # Stale heap entry
+            nv = v + STRAIGHT_COST
+            x = idx % w
+            for n in (idx - 1 if x > 0 else -1, idx + 1 if x < w - 1 else -1,
+                      idx - w, idx + w if idx < size - w else -1):
+                # Only tiles the source field reached (i.e. passable ones)
+                if n < 0 or dist[n] == unreached:
+                    continue
+                if nv < value[n]:
+                    value[n] = nv
+                    heappush(open_heap, (nv, n))
+
+    def value_at(self, x: int, y: int) -> Optional[int]:
+        """Safety score at (x, y) (lower is safer), or None outside the map."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            v = self.value[y * self.width + x]
+            if v != 0x7FFFFFFF:
+                return v
+        return None
+
+    def escape_steps(self, x: int, y: int, blocked: Optional[Collection[Coord]] = None) -> List[Coord]:
+        """Neighbours of (x, y) that are safer than it, safest first.
+
+        The origin and tiles in `blocked` are never returned.
+        """
+        here = self.value_at(x, y)
+        if here is None:
+            return []
+        steps: List[Tuple[int, Coord]] = []
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            v = self.value_at(nx, ny)
+            if v is None or v >= here:
+                continue
+            if (nx, ny) == self.origin or (blocked and (nx, ny) in blocked):
+                continue
+            steps.append((v, (nx, ny)))
+        steps.sort()
+        return [pos for _, pos in steps]
+
+
+class PathFollower:
+    """A cached route walked one step at a time (click-to-move).
+
+    Each step only the next `lookahead` tiles are checked for occupants;
+    the whole remaining route is re-checked against the map only when the
+    grid's version changed (a door opened or closed, a vein was dug). When
+    a step is blocked the route is repaired locally: one search from the
+    current position back onto the untouched suffix past the obstruction,
+    scored with the remaining costs kept from the original search. A full
+    replan only happens if that fails.
+
+    With a `hierarchy` attached, long routes on large maps are planned over
+    its cluster graph instead of a (budget-capped) flat A*.
+    """
+
+    # Straight-line distance beyond which routes are planned hierarchically
+    LONG_ROUTE = 48
+    # How many clear steps past an obstruction a repair may rejoin the route at
+    REJOIN_WINDOW = 16
+
+    def __init__(self, pathfinder: Optional[PathFinder], lookahead: int = 3, repair_nodes: int = 600):
+        self.pathfinder = pathfinder
+        self.hierarchy: Optional["PathHierarchy"] = None
+        self.lookahead = lookahead
+        self.repair_nodes = repair_nodes
+        self.path: List[Coord] = []
+        # Cost from each step to the end of the route
+        self.remaining: List[int] = []
+        self.index = 0
+        self.goal: Optional[Coord] = None
+        self._grid: Optional[TileGrid] = None
+        self._version = -1
+        # Instrumentation
+        self.repairs = 0
+        self.replans = 0
+
+    @property
+    def done(self) -> bool:
+        return self.index >= len(self.path)
+
+    def next_step(self) -> Optional[Coord]:
+        return None if self.done else self.path[self.index]
+
+    def advance(self) -> None:
+        self.index += 1
+
+    def clear(self) -> None:
+        self._set_route([], [])
+        self.goal = None
+
+    def _set_route(self, path: List[Coord], costs: List[int]) -> None:
+        self.path = path
+        total = costs[-1] if costs else 0
+        self.remaining = [total - c for c in costs]
+        self.index = 0
+        grid = self.pathfinder.grid if self.pathfinder is not None else None
+        self._grid = grid
+        self._version = grid.version if grid is not None else -1
+
+    def plan(self, start: Coord, goal: Coord, blocked: Optional[Iterable[Coord]] = None) -> List[Coord]:
+        """Search a fresh route and cache it."""
+        pf = self.pathfinder
+        self.goal = (int(goal[0]), int(goal[1]))
+        hierarchy = self.hierarchy
+        if hierarchy is not None and hierarchy.active:
+            far = abs(goal[0] - start[0]) + abs(goal[1] - start[1]) > self.LONG_ROUTE
+            path = [] if far else pf.find_path(start, goal, blocked=blocked)
+            if path:
+                self._set_route(path, pf.path_costs(path))
+                return path
+            # Long (or over-budget) route: plan over the cluster graph; the
+            # occupants it ignores are handled by check() as they come up
+            path = hierarchy.find_path(start, goal)
+            self._set_route(path, [STRAIGHT_COST * (i + 1) for i in range(len(path))])
+            return path
+        path = pf.find_path(start, goal, blocked=blocked)
+        self._set_route(path, pf.path_costs(path))
+        return path
+
+    def adopt(self, path: List[Coord]) -> None:
+        """Follow a route computed elsewhere (costs assumed uniform)."""
+        self.goal = path[-1] if path else None
+        self._set_route(path, [STRAIGHT_COST * (i + 1) for i in range(len(path))])
+
+    def check(self, current: Coord, blocked: Collection[Coord]) -> bool:
+        """Make sure the upcoming steps are clear, repairing the route if not.
+
+        Returns False when no route to the goal remains.
+        """
+        if self.done:
+            return True
+        grid = self.pathfinder.grid if self.pathfinder is not None else None
+        if grid is None:
+            return False
+        path = self.path
+        near = min(len(path), self.index + self.lookahead)
+        map_changed = grid is not self._grid or grid.version != self._version
+        end = len(path) if map_changed else near
+        for i in range(self.index, end):
+            x, y = path[i]
+            if not grid.is_passable(x, y) or (i < near and (x, y) in blocked):
+                return self._repair(current, i, blocked)
+        self._grid = grid
+        self._version = grid.version
+        return True
+
+    def _repair(self, current: Coord, broken: int, blocked: Collection[Coord]) -> bool:
+        pf = self.pathfinder
+        grid = pf.grid
+        path = self.path
+        remaining = self.remaining
+        # Rejoin points: the first clear steps after the obstruction, scored
+        # by the cost still left from there on the cached route
+        rejoin: Dict[Coord, int] = {}
+        for i in range(broken + 1, len(path)):
+            pos = path[i]
+            if pos not in blocked and grid.is_passable(pos[0], pos[1]):
+                rejoin[pos] = remaining[i]
+                if len(rejoin) >= self.REJOIN_WINDOW:
+                    break
+        if rejoin:
+            detour = pf.find_path_to_any(current, rejoin.keys(), blocked=blocked,
+                                         max_nodes=self.repair_nodes, goal_costs=rejoin)
+            if detour:
+                k = path.index(detour[-1], broken + 1)
+                costs = pf.path_costs(detour)
+                head = costs[-1] + remaining[k]
+                suffix = path[k + 1:]
+                self.path = detour + suffix
+                self.remaining = [head - c for c in costs] + remaining[k + 1:]
+                self.index = 0
+                self._grid = grid
+                self._version = grid.version
+                self.repairs += 1
+                return True
+        if self.goal is None:
+            return False
+        self.replans += 1
+        path = self.plan(current, self.goal, blocked)
+        # A hierarchical plan ignores occupants; if it runs straight back
+        # into one there is no way around
+        return bool(path) and not any(pos in blocked for pos in path[:self.lookahead] if pos != self.goal)
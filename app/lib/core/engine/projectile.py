@@ -42,13 +42,13 @@ class SimpleProjectile:
             self.prev = self.pos
             self.pos = nxt
             x, y = nxt
-            debug(f"[DEBUG] Projectile step to ({x},{y}), source={self.source}, kind={self.kind}, dmg={self.damage}")
+            debug("Projectile step to (%s,%s), source=%s, kind=%s, dmg=%s", x, y, self.source, self.kind, self.damage, channel="PROJECTILE")
                 
             # Stop if out of bounds or opaque
-            tile = engine.get_tile_at_coords(x, y)
-            if tile is None or engine.fov._is_opaque(tile):
+            grid = engine.current_map
+            if not grid or grid.is_opaque(x, y):
                 # Hit a wall or went out of bounds - this is a miss
-                debug(f"[DEBUG] Projectile MISS - hit wall/OOB at ({x},{y}), tile={tile}")
+                debug("Projectile MISS - hit wall/OOB at (%s,%s)", x, y, channel="PROJECTILE")
                 if self.source == 'player':
                     engine.toasts.show("Miss!", 1.5, (200, 200, 200), (50, 50, 50))
                 self._active = False
@@ -58,7 +58,7 @@ class SimpleProjectile:
             if self.source == 'entity':
                 # Hitting player
                 if engine.player and hasattr(engine.player, 'position') and tuple(engine.player.position) == (x, y):
-                    debug(f"[DEBUG] Projectile HIT player at ({x},{y}) for {self.damage} damage")
+                    debug("Projectile HIT player at (%s,%s) for %s damage", x, y, self.damage, channel="PROJECTILE")
                     # Apply damage modifiers
                     final_dmg, resist_msg = utils._apply_damage_modifiers(self.damage, self.damage_type, engine.player)
                     engine._inflict_player_damage(final_dmg, "projectile")
@@ -79,7 +79,7 @@ class SimpleProjectile:
                 # Hitting any entity
                 ent = engine.entity_manager.get_entity_at(x, y)
                 if ent and ent.hp > 0:
-                    debug(f"[DEBUG] Projectile HIT {ent.name} at ({x},{y}) for {self.damage} damage")
+                    debug("Projectile HIT %s at (%s,%s) for %s damage", ent.name, x, y, self.damage, channel="PROJECTILE")
                     # Apply damage modifiers
                     final_dmg, resist_msg = utils._apply_damage_modifiers(self.damage, self.damage_type, ent)
                     died = ent.take_damage(final_dmg)
@@ -95,13 +95,13 @@ class SimpleProjectile:
                         ent.hp = 0
                     # Impact visual - this should show!
                     eff = self.impact_effect_type or ('hit' if self.kind == 'ranged' else 'magic')
-                    debug(f"[DEBUG] Adding impact effect '{eff}' at ({x},{y}), duration={self.impact_duration}")
+                    debug("Adding impact effect '%s' at (%s,%s), duration=%s", eff, x, y, self.impact_duration, channel="PROJECTILE")
                     engine.add_spell_effect((x, y), eff, duration=self.impact_duration)
                     self._active = False
                     return
             
         # If we exhausted the path without hitting anything
-        debug(f"[DEBUG] Projectile MISS - reached end of path, source={self.source}")
+        debug("Projectile MISS - reached end of path, source=%s", self.source, channel="PROJECTILE")
         if self.source == 'player':
             engine.toasts.show("Miss!", 1.5, (200, 200, 200), (50, 50, 50))
         self._active = False
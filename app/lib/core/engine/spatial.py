@@ -0,0 +1,138 @@
+"""
+Bucketed spatial index for entities.
+
+`EntityManager._spatial_hash` answers "who is on this tile"; `SpatialIndex`
+answers "who is near here". Entities are kept in square buckets of
+`cell` x `cell` tiles so radius and rectangle queries only look at the
+buckets they overlap, and a per-template population counter replaces full
+scans when counting how many of a monster type are alive.
+
+The index does not watch entities: `EntityManager` updates it when an
+entity is added, moved, killed or removed.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Tuple
+
+Coord = Tuple[int, int]
+
+# Bucket side in tiles
+CELL_SIZE = 8
+
+
+class SpatialIndex:
+    """Entities bucketed by position, with living counts per template."""
+
+    def __init__(self, cell: int = CELL_SIZE):
+        self.cell = cell
+        self._buckets: Dict[Coord, List[Any]] = {}
+        # id(entity) -> bucket key the entity is filed under
+        self._where: Dict[int, Coord] = {}
+        # template_id -> number of indexed entities still alive
+        self._population: Dict[str, int] = {}
+        # ids of entities counted in _population
+        self._living: set = set()
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, entity: Any) -> bool:
+        return id(entity) in self._where
+
+    def _key(self, x: int, y: int) -> Coord:
+        return (int(x) // self.cell, int(y) // self.cell)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._where.clear()
+        self._population.clear()
+        self._living.clear()
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def insert(self, entity: Any) -> None:
+        """File `entity` under its current position (no-op if already indexed)."""
+        eid = id(entity)
+        if eid in self._where:
+            return
+        key = self._key(entity.position[0], entity.position[1])
+        self._buckets.setdefault(key, []).append(entity)
+        self._where[eid] = key
+        if getattr(entity, 'hp', 1) > 0:
+            self._living.add(eid)
+            tid = getattr(entity, 'template_id', None)
+            self._population[tid] = self._population.get(tid, 0) + 1
+
+    def move(self, entity: Any, x: int, y: int) -> None:
+        """Re-file `entity` after it moved to (x, y)."""
+        eid = id(entity)
+        old = self._where.get(eid)
+        if old is None:
+            self.insert(entity)
+            return
+        key = self._key(x, y)
+        if key == old:
+            return
+        self._unfile(entity, old)
+        self._buckets.setdefault(key, []).append(entity)
+        self._where[eid] = key
+
+    def mark_dead(self, entity: Any) -> None:
+        """Stop counting `entity` in its template's population.
+
+        Dying entities stay in the buckets until removed so their corpse
+        tile is still found by position queries.
+        """
+        eid = id(entity)
+        if eid in self._living:
+            self._living.discard(eid)
+            tid = getattr(entity, 'template_id', None)
+            self._population[tid] = self._population.get(tid, 1) - 1
+
+    def remove(self, entity: Any) -> None:
+        self.mark_dead(entity)
+        key = self._where.pop(id(entity), None)
+        if key is not None:
+            self._unfile(entity, key)
+
+    def _unfile(self, entity: Any, key: Coord) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        # By identity: entity types may define value equality
+        for i, other in enumerate(bucket):
+            if other is entity:
+                del bucket[i]
+                break
+        if not bucket:
+            del self._buckets[key]
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def population(self, template_id: str) -> int:
+        """Number of living indexed entities of `template_id`."""
+        return self._population.get(template_id, 0)
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[Any]:
+        """Yield entities with x0 <= x <= x1 and y0 <= y <= y1."""
+        cell = self.cell
+        buckets = self._buckets
+        for by in range(int(y0) // cell, int(y1) // cell + 1):
+            for bx in range(int(x0) // cell, int(x1) // cell + 1):
+                bucket = buckets.get((bx, by))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    ex, ey = entity.position
+                    if x0 <= ex <= x1 and y0 <= ey <= y1:
+                        yield entity
+
+    def in_radius(self, x: int, y: int, radius: float) -> Iterator[Any]:
+        """Yield entities within Euclidean `radius` of (x, y) (inclusive)."""
+        r2 = radius * radius
+        r = int(radius)
+        for entity in self.in_rect(x - r, y - r, x + r, y + r):
+            ex, ey = entity.position
+            if (ex - x) * (ex - x) + (ey - y) * (ey - y) <= r2:
+                yield entity
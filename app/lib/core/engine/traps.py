@@ -171,7 +171,7 @@ class TrapAndChestManager:
             radius = int(effect[2])
             ax, ay = pos
             hits = 0
-            for ent in self.game.entity_manager.entities:
+            for ent in list(self.game.entity_manager.index.in_radius(ax, ay, radius)):
                 if ent.hp > 0:
                     ex, ey = ent.position
                     if (ex-ax)**2 + (ey-ay)**2 <= radius*radius:
@@ -203,6 +203,7 @@ class TrapAndChestManager:
         elif etype == 'alarm':
             for ent in self.game.entity_manager.entities:
                 ent.aware_of_player = True
+            self.game.entity_manager.wake_all()
             self.game.log_event(f"{tname} rings loudly! Monsters are alerted.")
             # Small sparkles to show activation
             try:
@@ -222,7 +223,7 @@ class TrapAndChestManager:
                     self.game.player.status_manager.add_effect(status_name, duration)
                     affected += 1
                     self.game.log_event(f"You are affected by {tname}: {status_name.lower()}!")
-            for ent in self.game.entity_manager.entities:
+            for ent in list(self.game.entity_manager.index.in_radius(ax, ay, radius)):
                 if ent.hp > 0:
                     ex, ey = ent.position
                     if (ex-ax)**2 + (ey-ay)**2 <= radius*radius and hasattr(ent, 'status_manager'):
@@ -319,7 +320,7 @@ class TrapAndChestManager:
                         if tile in (FLOOR, DOOR_OPEN, STAIRS_DOWN, STAIRS_UP):
                             try:
                                 new_ent = Entity(template_id, self.game.current_depth, [nx, ny])
-                                self.game.entity_manager.entities.append(new_ent)
+                                self.game.entity_manager.add_entity(new_ent)
                                 spawned += 1
                                 placed = True
                             except Exception:
@@ -354,6 +355,7 @@ class TrapAndChestManager:
             elif pick == 'alarm':
                 for ent in self.game.entity_manager.entities:
                     ent.aware_of_player = True
+                self.game.entity_manager.wake_all()
                 try:
                     self.game.add_spell_effect(pos, 'magic', duration=10)
                 except Exception:
@@ -24,14 +24,19 @@ import pygame
 
 from app.lib.core.assets import AssetManager
 from app.lib.core.engine.depth_store import DepthStore
+from app.lib.core.engine.energy import ACTION_COST, PLAYER_SPEED, actor_speed
 from app.lib.core.engine.entity import EntityManager
 from app.lib.core.engine.fov import FOV
+from app.lib.core.engine.grid import TileGrid
+from app.lib.core.engine.hpa import PathHierarchy
+from app.lib.core.engine.pathfinding import PathFinder
 from app.lib.core.engine.generation.map import MapGenerator
 from app.lib.core.engine.generation.entity import spawn_entities_for_depth
 from app.lib.core.engine.player_state import PlayerState
 from app.lib.core.engine.recall import RecallManager
-from app.lib.core.logger import debug, log_exception
+from app.lib.core.logger import debug, is_debug_enabled, log_exception
 from app.lib.core.engine.traps import TrapAndChestManager
+from app.lib.core.headless import NullScreenManager, NullSoundManager, NullToastManager
 from app.lib.core.engine.projectile import SimpleProjectile, VisualProjectile
 from app.lib.core.engine.spell_effects import SpellEffect
 from app.lib.core.loader import Loader
@@ -49,15 +54,23 @@ from config import (
     DOOR_CLOSED, DOOR_OPEN, SECRET_DOOR, SECRET_DOOR_FOUND, WINDOW_HEIGHT, WINDOW_WIDTH, QUARTZ_VEIN, MAGMA_VEIN
 )
 
+# Log every this many turns the player spends waiting for energy in _end_player_turn
+PLAYER_WAIT_LOG_INTERVAL = 100
+
 class Game:
     """Expanded engine with legacy gameplay systems (hunger, AI, search, recall, FOV)."""
     player: Optional[Player] = None
     SAVE_DIR = "saves"
 
-    def __init__(self, project_root: str, player: Optional[Player] = None) -> None:
-        """Initialize the engine."""
+    def __init__(self, project_root: str, player: Optional[Player] = None, headless: bool = False) -> None:
+        """Initialize the engine.
+
+        With `headless` no window, audio or fonts are created; sound, toasts
+        and screens are null objects (see app.lib.core.headless).
+        """
         
-        self.surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.headless = headless
+        self.surface = None if headless else pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.clock = pygame.time.Clock()
         self.running = True
         self.loader = Loader("data")  # Loads automatically
@@ -68,17 +81,22 @@ class Game:
             "spells": self.loader.spells,
         }
         self.assets = AssetManager(os.path.join(project_root, "assets"))
-        self.sound = SoundManager(self.assets)
-        # Preload curated default mappings for quick use
-        self.sound.load_curated_defaults()
-        self.toasts = ToastManager(self.assets.font("fonts", "text.ttf", size=18))
-        self.screens = ScreenManager(self)
+        if headless:
+            self.sound = NullSoundManager()
+            self.toasts = NullToastManager()
+            self.screens = NullScreenManager(self)
+        else:
+            self.sound = SoundManager(self.assets)
+            # Preload curated default mappings for quick use
+            self.sound.load_curated_defaults()
+            self.toasts = ToastManager(self.assets.font("fonts", "text.ttf", size=18))
+            self.screens = ScreenManager(self)
        
         self.player = player
         self.map_generator = MapGenerator()
 
         # Core game state
-        self.current_map: Optional[List[List[str]]] = None
+        self.current_map: Optional[TileGrid] = None
         self.current_depth = 0
         self.combat_log: List[str] = []
 
@@ -102,6 +120,8 @@ class Game:
 
         # Turn / time state
         self.time = 0              # Engine global time (turns)
+        # "Your haste allows extra movement!" already shown for this Haste
+        self._haste_announced = False
 
         # Previous player position (used for movement/trap triggers); initialized to None
         self._prev_player_pos: Optional[Tuple[int, int]] = None
@@ -109,6 +129,8 @@ class Game:
         # Dirty map tiles registry (decoupled: engine marks tiles and views can consume)
         # Use a set of (x, y) coords so multiple changes to same tile are idempotent
         self._dirty_map_tiles: set[Tuple[int, int]] = set()
+        # Tiles whose FOV visibility changed; views redraw only their fog
+        self._dirty_fog_tiles: set[Tuple[int, int]] = set()
 
         # Search system
         self.searching = False
@@ -123,6 +145,10 @@ class Game:
     def init(self):
         self.depth_store = DepthStore(self)
         self.fov = FOV(self)
+        # Reusable A* engine, re-bound whenever the current map changes
+        self.pathfinder = PathFinder()
+        # Cluster graph for long routes on large maps (inactive on small ones)
+        self.path_hierarchy = PathHierarchy()
         # Initialize core engine subsystems that were previously here
         # (entity manager, trap/chest manager, player state, etc.)
         self.entity_manager = EntityManager(self)
@@ -131,6 +157,8 @@ class Game:
         self.recall_manager = RecallManager(self)
         self.noise_manager = NoiseAndSleepManager(self)
         debug("Engine initialized (expanded mode)")
+        if self.headless:
+            return
         # Import TitleScreen lazily to avoid circular imports during module import
         from app.screens.title import TitleScreen
         self.screens.push(TitleScreen(self))
@@ -153,6 +181,34 @@ class Game:
             # Defensive: don't crash game logic when UI is not present
             pass
 
+    def mark_fog_tile(self, x: int, y: int) -> None:
+        """Mark a tile whose visibility changed; the terrain under it is unchanged.
+
+        Views that draw fog of war as a separate layer consume these through
+        ``consume_dirty_fog_tiles()``.
+        """
+        try:
+            if 0 <= x < self.map_width and 0 <= y < self.map_height:
+                self._dirty_fog_tiles.add((x, y))
+        except Exception:
+            pass
+
+    def set_tile(self, x: int, y: int, tile: str) -> bool:
+        """Change the map tile at (x, y).
+
+        All gameplay tile mutations (doors, tunnels, secret doors) go through
+        here so the grid's opacity/walkability masks stay in sync, cached LOS
+        results are dropped and the renderer is told about the change. Returns True if the tile changed.
+        """
+        if not self.current_map or not self.current_map.in_bounds(x, y):
+            return False
+        if not self.current_map.set(x, y, tile):
+            return False
+        self.fov.tile_changed(x, y)
+        self.path_hierarchy.tile_changed(x, y)
+        self.mark_dirty_tile(x, y)
+        return True
+
     def consume_dirty_map_tiles(self) -> set:
         """Return the set of dirty tiles and clear the registry atomically.
 
@@ -163,6 +219,12 @@ class Game:
         tiles = set(self._dirty_map_tiles)
         self._dirty_map_tiles.clear()
         return tiles
+
+    def consume_dirty_fog_tiles(self) -> set:
+        """Return and clear the tiles whose visibility changed (see ``mark_fog_tile``)."""
+        tiles = self._dirty_fog_tiles
+        self._dirty_fog_tiles = set()
+        return tiles
         
     
     def save_character(self):
@@ -179,7 +241,7 @@ class Game:
         save_path = os.path.join(self.SAVE_DIR, filename)
         try:
             self.depth_store.save_game(save_path)
-            debug(f"Game saved: {save_path}")
+            debug("Game saved: %s", save_path)
             self.toasts.show("Saved!", duration=1.5, bg=(240,220,150))
         except Exception as e:
             log_exception(e)
@@ -195,15 +257,15 @@ class Game:
             new_depth: Target depth (0=town, 1+=dungeon)
         """
         if new_depth == self.current_depth:
-            debug(f"Already at depth {new_depth}, no transition needed")
+            debug("Already at depth %s, no transition needed", new_depth)
             return
         
-        debug(f"Changing depth: {self.current_depth} -> {new_depth}")
+        debug("Changing depth: %s -> %s", self.current_depth, new_depth)
         
         # Cache current depth state before leaving
         if self.current_map:
             self.depth_store.depth_cache[self.current_depth] = self.depth_store._serialize_depth_state()
-            debug(f"Cached depth {self.current_depth} state")
+            debug("Cached depth %s state", self.current_depth)
         
         # Update current depth
         old_depth = self.current_depth
@@ -216,10 +278,10 @@ class Game:
         
         # Try to restore from cache, otherwise generate
         if new_depth in self.depth_store.depth_cache:
-            debug(f"Restoring depth {new_depth} from cache")
+            debug("Restoring depth %s from cache", new_depth)
             self.depth_store._deserialize_depth_state(self.depth_store.depth_cache[new_depth])
         else:
-            debug(f"Generating new map for depth {new_depth}")
+            debug("Generating new map for depth %s", new_depth)
             self.generate_map(new_depth)
         
         # Place player at appropriate stairs
@@ -236,7 +298,7 @@ class Game:
                 self.player.position = [stairs_pos[0], stairs_pos[1]]
                 from app.lib.utils import ensure_valid_player_position
                 ensure_valid_player_position(self, self.player)
-                debug(f"Placed player at {stairs_pos}")
+                debug("Placed player at %s", stairs_pos)
             else:
                 debug("Warning: No stairs found, player position unchanged")
 
@@ -246,11 +308,7 @@ class Game:
         """Find the first occurrence of a tile type on the current map."""
         if not self.current_map:
             return None
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                if self.current_map[y][x] == tile_type:
-                    return (x, y)
-        return None
+        return self.current_map.find(tile_type)
 
     def generate_map(self, depth: int):
         """
@@ -262,7 +320,7 @@ class Game:
         Returns:
             The generated map data
         """
-        debug(f"Generating map for depth {depth}")
+        debug("Generating map for depth %s", depth)
         self.current_depth = depth
         # Keep player depth in sync with engine depth for rendering & saves
         if self.player is not None:
@@ -280,8 +338,11 @@ class Game:
             self.map_width = len(map_data[0]) if self.map_height > 0 else 0
             
             # Initialize visibility arrays
-            self.fov.visibility = [[0 for _ in range(self.map_width)] for _ in range(self.map_height)]
-            self.fov.light_colors = [[0 for _ in range(self.map_width)] for _ in range(self.map_height)]
+            self.fov.reset(self.map_width, self.map_height)
+            if depth == 0:
+                self.fov.prepare_town_sweep()
+            self.pathfinder.bind(map_data)
+            self.path_hierarchy.bind(map_data, rooms)
         
         # Player position (may be None initially)
         player_pos = None
@@ -291,29 +352,20 @@ class Game:
         # Spawn entities
         self.entity_manager.entities = spawn_entities_for_depth(map_data, depth, player_pos)
         
-        # Performance: rebuild spatial hash for newly spawned entities
-        self.entity_manager._spatial_hash.clear()
-        for entity in self.entity_manager.entities:
-            if hasattr(entity, 'position') and entity.position:
-                # Ensure a fixed-size 2-tuple key for the spatial hash so static
-                # checkers treat the key as `Tuple[int, int]` instead of
-                # a variable-length `tuple[int, ...]`.
-                try:
-                    pos: Tuple[int, int] = (int(entity.position[0]), int(entity.position[1]))
-                except Exception:
-                    # Fallback: coerce using tuple() but don't rely on it for typing
-                    pos = (entity.position[0], entity.position[1])
-                self.entity_manager._spatial_hash[pos] = entity
+        # Performance: rebuild spatial hash and index for newly spawned entities
+        self.entity_manager.rebuild_index()
         
-        debug(f"Spawned {len(self.entity_manager.entities)} entities for depth {depth}")
+        debug("Spawned %s entities for depth %s", len(self.entity_manager.entities), depth, channel="SPAWN")
         if self.entity_manager.entities:
-            for e in self.entity_manager.entities:
+            # Skip the per-entity loop entirely when SPAWN is off
+            for e in (self.entity_manager.entities if is_debug_enabled("SPAWN") else ()):
                 try:
-                    debug(f"[SPAWN] id={e.template_id} name={e.name} pos={e.position} ai={getattr(e,'ai_type','?')} beh={getattr(e,'behavior','')} hostile={e.hostile}")
+                    debug("id=%s name=%s pos=%s ai=%s beh=%s hostile=%s", e.template_id, e.name, e.position,
+                          getattr(e, 'ai_type', '?'), getattr(e, 'behavior', ''), e.hostile, channel="SPAWN")
                 except Exception:
                     pass
         else:
-            debug("[SPAWN] No entities spawned on this depth")
+            debug("No entities spawned on this depth", channel="SPAWN")
 
         # Assign status managers (already present in Entity creation but maintain compatibility)
         for e in self.entity_manager.entities:
@@ -329,7 +381,7 @@ class Game:
         # them (handled in _on_actor_moved). Clear any previous state.
         self.lit_rooms.clear()
         
-        debug(f"Map generated: {self.map_width}x{self.map_height}")
+        debug("Map generated: %sx%s", self.map_width, self.map_height)
         return map_data
     
     def log_event(self, message: str) -> None:
@@ -342,7 +394,7 @@ class Game:
         self.combat_log.append(message)
         if len(self.combat_log) > 50:
             self.combat_log.pop(0)
-        debug(f"Event: {message}")
+        debug("Event: %s", message)
     
     def get_tile_at_coords(self, x: int, y: int) -> Optional[str]:
         """
@@ -357,8 +409,7 @@ class Game:
         """
         if not self.current_map:
             return None
-        if 0 <= y < self.map_height and 0 <= x < self.map_width:
-            return self.current_map[y][x]
+        return self.current_map.get(x, y)
 
     def get_entity_at(self, x: int, y: int):
         """
@@ -460,61 +511,55 @@ class Game:
         self._end_player_turn()
         return True
     
-    def _check_haste_bonus_actions(self) -> bool:
-        """Check if player has bonus actions remaining from Haste.
-        
-        Returns True if player can take another action without ending turn.
-        Manages 'haste_actions_remaining' attribute on player.
+    def _spend_player_action(self) -> bool:
+        """Charge the player one action's worth of energy.
+
+        Returns True if the player still has energy for another action this
+        turn (Hasted), in which case time does not advance.
         """
-        if not self.player or not hasattr(self.player, 'status_manager'):
-            return False
-        
-        # Check for Hasted status
-        hasted = self.player.status_manager.get_effect('Hasted')
-        if not hasted:
-            # Clear any lingering action counter
-            if hasattr(self.player, 'haste_actions_remaining'):
-                delattr(self.player, 'haste_actions_remaining')
-            return False
-        
-        # Initialize action counter if new haste
-        if not hasattr(self.player, 'haste_actions_remaining'):
-            # Magnitude determines extra actions per turn (default 1)
-            extra_actions = max(1, hasted.magnitude if hasted.magnitude else 1)
-            self.player.haste_actions_remaining = extra_actions
-            debug(f"[HASTE] Player gains {extra_actions} bonus action(s) this turn")
-        
-        # Check if actions remain
-        if self.player.haste_actions_remaining > 0:
-            self.player.haste_actions_remaining -= 1
-            debug(f"[HASTE] Using bonus action ({self.player.haste_actions_remaining} remaining)")
-            
-            # Show message on first use
-            if self.player.haste_actions_remaining == 0:
+        energy = getattr(self.player, 'energy', ACTION_COST) - ACTION_COST
+        self.player.energy = energy
+        if energy >= ACTION_COST:
+            debug("[HASTE] Bonus action (%s energy left)", energy, channel="GENERAL")
+            if not self._haste_announced:
+                self._haste_announced = True
                 self.log_event("Your haste allows extra movement!")
-            
             return True
-        
         return False
-    
+
     def _end_player_turn(self) -> None:
-        """Advance time and process per-turn systems (hunger, recall, AI, FOV)."""
+        """Spend the player's action and advance time until they can act again."""
         if not self.player:
             debug("[TURN] _end_player_turn skipped: engine.player is None")
             return
         
         # Check if haste grants bonus actions - if so, don't actually end turn yet
-        if self._check_haste_bonus_actions():
+        if self._spend_player_action():
             debug("[TURN] Bonus action from Haste - turn continues")
             return
 
+        # Slowed players lose turns; Paralyzed ones wait for the effect to wear
+        # off. Every speed modifier is a timed status effect ticked by
+        # _advance_turn, so the player always regains speed eventually; the
+        # player never acts before their energy covers the action.
+        waited = 0
+        while getattr(self.player, 'energy', ACTION_COST) < ACTION_COST and self.player.hp > 0:
+            self._advance_turn()
+            waited += 1
+            if waited % PLAYER_WAIT_LOG_INTERVAL == 0:
+                debug("[TURN] Player has waited %s turns for energy (%s)", waited, self.player.energy)
+
+    def _advance_turn(self) -> None:
+        """Advance time one turn and process per-turn systems (hunger, recall, AI, FOV)."""
+        self.player.energy = getattr(self.player, 'energy', 0) + actor_speed(self.player, PLAYER_SPEED)
+
         # Advance time
         self.time += 1
         if hasattr(self.player, 'time'):
             self.player.time += 1
-            debug(f"--- Turn {self.player.time} ---")
+            debug("--- Turn %d ---", self.player.time)
         else:
-            debug(f"--- Turn {self.time} ---")
+            debug("--- Turn %d ---", self.time)
 
         # Hunger system (attach lazily if missing)
         if not hasattr(self.player, 'max_hunger'):
@@ -536,6 +581,12 @@ class Game:
         # Tick player status effects if present
         if hasattr(self.player, 'status_manager'):
             expired = getattr(self.player.status_manager, 'tick_effects', lambda: [])()
+            if not getattr(self.player.status_manager, 'has_effect', lambda name: False)('Hasted'):
+                # Energy banked while Hasted must not outlast it (no free bonus
+                # action on the turn it ends); the next Haste is announced again
+                self._haste_announced = False
+                if self.player.energy > ACTION_COST:
+                    self.player.energy = ACTION_COST
             for eff in expired:
                 self.log_event(f"{eff} effect wears off.")
 
@@ -710,13 +761,13 @@ class Game:
     def update_projectiles(self) -> None:
         if not self.active_projectiles:
             return
-        print(f"[DEBUG] Updating {len(self.active_projectiles)} projectiles")
+        debug("Updating %s projectiles", len(self.active_projectiles), channel="PROJECTILE")
         for p in list(self.active_projectiles):
             if hasattr(p, 'step') and hasattr(p, 'is_active'):
                 try:
                     p.step(self)
                 except Exception as e:
-                    print(f"[DEBUG] Projectile step error: {e}")
+                    debug("Projectile step error: %s", e, channel="PROJECTILE")
                     # On failure, deactivate
                     try:
                         p._active = False
@@ -739,8 +790,7 @@ class Game:
                 p['prev'] = cur
                 p['current'] = nxt
                 # Stop if hit opaque
-                tile = self.get_tile_at_coords(nxt[0], nxt[1])
-                if tile is None or self.fov._is_opaque(tile) or nxt == dest:
+                if not self.current_map or self.current_map.is_opaque(nxt[0], nxt[1]) or nxt == dest:
                     p['done'] = True
         # Cleanup will be done by clear_inactive_projectiles
 
@@ -754,15 +804,13 @@ class Game:
         self.secret_door_difficulty.clear()
         if not self.current_map:
             return
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                if self.current_map[y][x] == SECRET_DOOR:
-                    diff = random.randint(30, 75)
-                    if random.random() < 0.2:
-                        diff += random.randint(10, 15)
-                    elif random.random() < 0.2:
-                        diff -= random.randint(5, 10)
-                    self.secret_door_difficulty[(x, y)] = max(10, min(90, diff))
+        for (x, y) in self.current_map.positions_of(SECRET_DOOR):
+            diff = random.randint(30, 75)
+            if random.random() < 0.2:
+                diff += random.randint(10, 15)
+            elif random.random() < 0.2:
+                diff -= random.randint(5, 10)
+            self.secret_door_difficulty[(x, y)] = max(10, min(90, diff))
 
     def _perform_search(self) -> bool:
         if not self.player or not self.current_map:
@@ -781,18 +829,14 @@ class Game:
                 sx, sy = px + dx, py + dy
                 if not (0 <= sx < self.map_width and 0 <= sy < self.map_height):
                     continue
-                if self.current_map[sy][sx] != SECRET_DOOR:
+                if self.current_map.char_at(sx, sy) != SECRET_DOOR:
                     continue
                 diff = self.secret_door_difficulty.get((sx, sy), 50)
                 chance = max(5.0, min(85.0, base_chance - diff))
                 if random.uniform(0, 100) <= chance:
-                    self.current_map[sy][sx] = SECRET_DOOR_FOUND
+                    self.set_tile(sx, sy, SECRET_DOOR_FOUND)
                     self.secret_door_difficulty.pop((sx, sy), None)
                     found_any = True
-                    try:
-                        self.mark_dirty_tile(sx, sy)
-                    except Exception:
-                        pass
         if found_any:
             self.log_event('You find a secret door!')
         elif not self.searching:
@@ -1035,11 +1079,11 @@ class Game:
         if not self.current_map or not (0 <= x < self.map_width and 0 <= y < self.map_height):
             return False
         
-        tile = self.current_map[y][x]
+        tile = self.current_map.char_at(x, y)
         
         # Check if it's a closed door
         if tile == DOOR_CLOSED:
-            self.current_map[y][x] = DOOR_OPEN
+            self.set_tile(x, y, DOOR_OPEN)
             self.log_event("You open the door.")
             try:
                 self.toasts.show("Door opened", 1.0, (200, 200, 150), (40, 40, 30))
@@ -1052,10 +1096,6 @@ class Game:
                 self.fov.update_fov()
             except Exception:
                 pass
-            try:
-                self.mark_dirty_tile(x, y)
-            except Exception:
-                pass
             return True
 
         # Handle secret doors separately: unrevealed secret doors should be
@@ -1063,7 +1103,7 @@ class Game:
         # Only a previously revealed secret door (SECRET_DOOR_FOUND) may be opened.
         elif tile == SECRET_DOOR:
             # Reveal the secret door but do not open it automatically.
-            self.current_map[y][x] = SECRET_DOOR_FOUND
+            self.set_tile(x, y, SECRET_DOOR_FOUND)
             self.log_event("You found a secret door!")
             try:
                 self.toasts.show("Secret door found!", 2.0, (255, 220, 100), (60, 50, 20))
@@ -1074,16 +1114,12 @@ class Game:
                 self.noise_manager.create_noise((x, y), radius=2, intensity=1)
             except Exception:
                 pass
-            try:
-                self.mark_dirty_tile(x, y)
-            except Exception:
-                pass
             # Indicate to caller that door was not opened yet
             return False
 
         elif tile == SECRET_DOOR_FOUND:
             # Previously revealed secret door can now be opened normally
-            self.current_map[y][x] = DOOR_OPEN
+            self.set_tile(x, y, DOOR_OPEN)
             self.log_event("You open the secret door.")
             try:
                 self.noise_manager.create_noise((x, y), radius=2, intensity=2)
@@ -1105,7 +1141,7 @@ class Game:
         if not self.current_map or not (0 <= x < self.map_width and 0 <= y < self.map_height):
             return False
         
-        tile = self.current_map[y][x]
+        tile = self.current_map.char_at(x, y)
         
         # Check if it's an open door
         if tile == DOOR_OPEN:
@@ -1119,15 +1155,11 @@ class Game:
                 self.log_event("You can't close a door while standing in it!")
                 return False
             
-            self.current_map[y][x] = DOOR_CLOSED
+            self.set_tile(x, y, DOOR_CLOSED)
             self.log_event("You close the door.")
             self.toasts.show("Door closed", 1.0, (200, 200, 150), (40, 40, 30))
             self.noise_manager.create_noise((x, y), radius=2, intensity=2)
             self.fov.update_fov()
-            try:
-                self.mark_dirty_tile(x, y)
-            except Exception:
-                pass
             return True
         
         return False
@@ -1141,7 +1173,7 @@ class Game:
         if max(abs(self.player.position[0] - x), abs(self.player.position[1] - y)) > 1:
             self.log_event("You need to get closer to tunnel.")
             return False
-        tile = self.current_map[y][x]
+        tile = self.current_map.char_at(x, y)
         if tile not in (QUARTZ_VEIN, MAGMA_VEIN):
             return False
         # Require a digging tool
@@ -1181,7 +1213,7 @@ class Game:
                 pass
             return False
 
-        self.current_map[y][x] = FLOOR
+        self.set_tile(x, y, FLOOR)
         self.log_event("You tunnel through the vein.")
         try:
             self.toasts.show("Tunnel cleared", 1.4, (200, 220, 200), (40, 60, 40))
@@ -1191,10 +1223,6 @@ class Game:
             self.noise_manager.create_noise((x, y), radius=4, intensity=4)
         except Exception:
             pass
-        try:
-            self.mark_dirty_tile(x, y)
-        except Exception:
-            pass
         try:
             self.fov.update_fov()
         except Exception:
@@ -1210,7 +1238,7 @@ class Game:
         if not self.current_map or not (0 <= x < self.map_width and 0 <= y < self.map_height):
             return False
         
-        tile = self.current_map[y][x]
+        tile = self.current_map.char_at(x, y)
         
         # Can only bash closed doors
         if tile not in (DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND):
@@ -1231,14 +1259,10 @@ class Game:
         
         if total >= dc:
             # Success: door breaks open
-            self.current_map[y][x] = DOOR_OPEN
+            self.set_tile(x, y, DOOR_OPEN)
             self.log_event(f"You bash the door open! (rolled {roll}+{str_mod}={total} vs DC {dc})")
             self.toasts.show("Door bashed open!", 1.5, (255, 180, 100), (60, 40, 20))
             self.fov.update_fov()
-            try:
-                self.mark_dirty_tile(x, y)
-            except Exception:
-                pass
             # Bashing takes a turn
             return True
         else:
@@ -1878,7 +1902,7 @@ class Game:
                 if self.player and hasattr(self.player, 'position'):
                     px, py = self.player.position
                     
-                    print(f"[DEBUG] Casting {name} from ({px},{py}) to ({tx},{ty}), dmg={dmg}, projectile={projectile_type}, impact={impact_effect}")
+                    debug("Casting %s from (%s,%s) to (%s,%s), dmg=%s, projectile=%s, impact=%s", name, px, py, tx, ty, dmg, projectile_type, impact_effect, channel="PROJECTILE")
                     
                     # Add visual projectile for smooth animation
                     self.add_visual_projectile((px, py), (tx, ty), projectile_type, speed=0.4)
@@ -2046,7 +2070,7 @@ class Game:
                     if room.x1 <= nx < room.x2 and room.y1 <= ny < room.y2:
                         if idx not in self.lit_rooms:
                             self.lit_rooms.add(idx)
-                            debug(f"Player entered room {idx}; marking lit")
+                            debug("Player entered room %s; marking lit", idx)
                             try:
                                 # Immediately refresh FOV so the newly-lit room is revealed
                                 self.fov.update_fov()
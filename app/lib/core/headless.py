@@ -0,0 +1,300 @@
+"""
+Headless engine support for batch simulations and benchmarks.
+
+``Game(project_root, headless=True)`` opens no window, mixer or fonts: sound,
+toasts and the screen stack are replaced by the null objects below, and
+``init()`` does not push the title screen. Map generation, turns, AI, FOV and
+saves run exactly as in the windowed game.
+
+``simulate`` drives a headless game with a random-walking player and reports
+throughput in turns per second. Run it from the command line with::
+
+    python -m app.lib.core.headless --turns 500 --depth 5
+
+``--bench-logging`` plays the same seeded run with debug logging on and off
+and reports the cost per turn of each. ``--bench-ai`` fills the map with
+hostiles and reports what ``update_entities`` costs per entity, for
+unaware monsters and for monsters chasing the player, once with the
+squared-distance range checks and once with a square root per check as
+the float-distance AI used to take.
+
+The SDL dummy video/audio drivers are selected when nothing else is set, so
+this also works on CI machines without a display.
+"""
+from __future__ import annotations
+import math
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+from app.lib.core.logger import debug, set_debug_enabled
+
+
+class NullSoundManager:
+    """Stands in for ``SoundManager``: every call is accepted and ignored."""
+
+    music_enabled = False
+    sfx_enabled = False
+    ambient_enabled = False
+    music_playing = None
+    ambient_playing = None
+
+    def __getattr__(self, name: str):
+        # play_sfx, play_music, update, load_curated_defaults, ...
+        return _noop
+
+
+class NullToastManager:
+    """Stands in for ``ToastManager``; remembers the last messages for inspection."""
+
+    def __init__(self, max_toasts: int = 5):
+        self.max_toasts = max_toasts
+        self.toasts: list = []
+
+    def show(self, message, duration=2.0, color=(0, 0, 0), bg=(255, 255, 255)):
+        if len(self.toasts) >= self.max_toasts:
+            self.toasts.pop(0)
+        self.toasts.append({"msg": message})
+
+    def draw(self, surface) -> None:
+        pass
+
+
+class NullScreenManager:
+    """Stands in for ``ScreenManager``: screens are never pushed or drawn."""
+
+    def __init__(self, game) -> None:
+        self.game = game
+        self.stack: list = []
+
+    def current(self):
+        return None
+
+    def handle_events(self, events) -> None:
+        pass
+
+    def draw(self, surface) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        # push, pop, replace, remove, push_under_top, ...
+        return _noop
+
+
+def _noop(*args, **kwargs) -> None:
+    return None
+
+
+def use_dummy_drivers() -> None:
+    """Select the SDL dummy video/audio drivers unless the caller chose others."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def default_player_data(name: str = "Sim") -> Dict[str, Any]:
+    """Minimal character record for a simulated Human Warrior."""
+    return {
+        "name": name,
+        "race": "Human",
+        "class": "Warrior",
+        "sex": "Male",
+        "depth": 0,
+        "time": 0,
+        "level": 1,
+        "xp": 0,
+        "gold": 100,
+        "known_spells": [],
+    }
+
+
+def create_headless_game(project_root: str, depth: int = 1, player_data: Optional[Dict[str, Any]] = None):
+    """Build an initialised headless ``Game`` with a player placed on a fresh map."""
+    use_dummy_drivers()
+    from app.lib.core.game_engine import Game
+    from app.lib.utils import ensure_valid_player_position
+    from app.model.player import Player
+
+    game = Game(project_root, headless=True)
+    game.init()
+    game.player = Player(player_data or default_player_data(), game.data)
+    game.generate_map(depth)
+    # Start on the first room's centre (or any open tile) like a fresh descent
+    if game.rooms:
+        game.player.position = list(game.rooms[0].center())
+    ensure_valid_player_position(game, game.player)
+    game.fov.update_fov()
+    return game
+
+
+def _random_step(game, rng: random.Random) -> None:
+    """One player action: bump-attack, step to a free tile, or rest."""
+    player = game.player
+    px, py = player.position
+    dx, dy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1)))
+    nx, ny = px + dx, py + dy
+    target = game.get_entity_at(nx, ny)
+    if target is not None:
+        game.player_attack_entity(target)
+    elif game.current_map.is_passable(nx, ny):
+        player.position = (nx, ny)
+    game._end_player_turn()
+
+
+def simulate(game, turns: int, seed: Optional[int] = None, immortal: bool = True) -> Dict[str, float]:
+    """Play `turns` player actions and report throughput.
+
+    With `immortal` the player is healed each action so long runs are not cut
+    short by death. Returns turns, actions, seconds and turns_per_second
+    (engine turns, so Slowed/Hasted players count correctly).
+    """
+    rng = random.Random(seed)
+    if seed is not None:
+        random.seed(seed)
+    start_turn = game.time
+    started = time.perf_counter()
+    actions = 0
+    for _ in range(turns):
+        if immortal:
+            game.player.hp = game.player.max_hp
+        elif game.player.hp <= 0:
+            break
+        _random_step(game, rng)
+        actions += 1
+    seconds = time.perf_counter() - started
+    elapsed = game.time - start_turn
+    stats = {
+        "turns": elapsed,
+        "actions": actions,
+        "seconds": seconds,
+        "turns_per_second": elapsed / seconds if seconds > 0 else 0.0,
+    }
+    debug("[SIM] %s turns in %.2fs (%.1f turns/s)", elapsed, seconds, stats['turns_per_second'], channel="GENERAL")
+    return stats
+
+
+def bench_logging(project_root: str, turns: int, depth: int, seed: Optional[int] = None) -> Dict[str, float]:
+    """Milliseconds per engine turn for one seeded run with debug logging on and off.
+
+    Both runs start from the same seed, so they play the same map and
+    actions. The console echo stays off; records still go through the queue
+    to the log file.
+    """
+    seed = 0 if seed is None else seed
+    results = {}
+    try:
+        for label, enabled in (("on", True), ("off", False)):
+            set_debug_enabled(enabled, console=False)
+            random.seed(seed)
+            game = create_headless_game(project_root, depth=depth)
+            stats = simulate(game, turns, seed=seed)
+            results[label] = stats["seconds"] * 1000 / max(stats["turns"], 1)
+    finally:
+        set_debug_enabled(False)
+    return results
+
+
+def _sqrt_in_range(d2: int, radius: float) -> bool:
+    """``geometry.in_range`` the way the float-distance AI did it."""
+    return math.sqrt(d2) <= radius
+
+
+def bench_ai(project_root: str, depth: int = 40, hostiles: int = 60, turns: int = 50,
+             seed: Optional[int] = None, repeats: int = 5, baseline: bool = False) -> Dict[str, float]:
+    """Microseconds of ``update_entities`` per entity per turn.
+
+    The map at `depth` is topped up with spawns until it holds `hostiles`
+    monsters. 'unaware' times them as spawned, mostly far away and parked;
+    'aware' makes all of them aware of the player so they chase. The player
+    stands still and is healed every turn. Each figure is the best of
+    `repeats` runs of `turns` turns, each run on a freshly seeded game.
+
+    With `baseline` every AI range check takes a square root, as the
+    float-distance code did, to give a before figure to compare against.
+    """
+    from app.lib.core.engine import entity as entity_module
+    from app.lib.core.engine.generation.entity import spawn_entities_for_depth
+
+    seed = 0 if seed is None else seed
+    squared_in_range = entity_module.in_range
+    if baseline:
+        entity_module.in_range = _sqrt_in_range
+    try:
+        results = {}
+        for mode in ("unaware", "aware"):
+            best = None
+            for _ in range(repeats):
+                random.seed(seed)
+                game = create_headless_game(project_root, depth=depth)
+                manager = game.entity_manager
+                taken = {tuple(e.position) for e in manager.entities}
+                taken.add(tuple(game.player.position))
+                while len(manager.entities) < hostiles:
+                    spawned = [e for e in spawn_entities_for_depth(game.current_map, depth, list(game.player.position))
+                               if e.hostile and tuple(e.position) not in taken]
+                    if not spawned:
+                        break
+                    for entity in spawned[:hostiles - len(manager.entities)]:
+                        taken.add(tuple(entity.position))
+                        manager.entities.append(entity)
+                if mode == "aware":
+                    for entity in manager.entities:
+                        entity.aware_of_player = True
+                manager.rebuild_index()
+                count = len(manager.entities)
+                elapsed = 0.0
+                for _ in range(turns):
+                    game.player.hp = game.player.max_hp
+                    game.time += 1
+                    started = time.perf_counter()
+                    manager.update_entities()
+                    elapsed += time.perf_counter() - started
+                per_entity = elapsed * 1e6 / (turns * max(count, 1))
+                best = per_entity if best is None else min(best, per_entity)
+            results[mode] = best
+            results["entities"] = count
+    finally:
+        entity_module.in_range = squared_in_range
+    return results
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a headless Plaguefire simulation.")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--save", default=None, help="write a save file to this path afterwards")
+    parser.add_argument("--debug", action="store_true", help="keep debug logging on (slow)")
+    parser.add_argument("--bench-logging", action="store_true", help="compare ms/turn with debug logging on and off")
+    parser.add_argument("--bench-ai", action="store_true", help="time update_entities per entity with 60 hostiles, against a sqrt baseline")
+    args = parser.parse_args(argv)
+    set_debug_enabled(args.debug)
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    if args.bench_logging:
+        ms = bench_logging(project_root, args.turns, args.depth, args.seed)
+        print(f"depth {args.depth}, {args.turns} actions: logging on {ms['on']:.3f} ms/turn, "
+              f"off {ms['off']:.3f} ms/turn ({ms['on'] / ms['off']:.1f}x)")
+        return 0
+    if args.bench_ai:
+        for label, baseline in (("squared", False), ("sqrt baseline", True)):
+            us = bench_ai(project_root, depth=args.depth, seed=args.seed, baseline=baseline)
+            print(f"depth {args.depth}, {us['entities']} entities, {label}: per-entity AI tick "
+                  f"unaware {us['unaware']:.1f} us, aware {us['aware']:.1f} us")
+        return 0
+    if args.seed is not None:
+        random.seed(args.seed)
+    game = create_headless_game(project_root, depth=args.depth)
+    stats = simulate(game, args.turns, seed=args.seed)
+    print(f"depth {args.depth}: {stats['turns']} turns in {stats['seconds']:.2f}s "
+          f"= {stats['turns_per_second']:.1f} turns/s ({len(game.entity_manager.entities)} entities)")
+    if args.save:
+        game.depth_store.save_game(args.save)
+        print(f"saved to {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,16 @@
 # debugtools.py
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import sys
 import traceback
 from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Union
+
+from config import DEBUG
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = "logs"
@@ -12,33 +19,97 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 # Configure logging
 log_filename = os.path.join(LOGS_DIR, f"plaguefire_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.log")
 
-# Create logger
+# Create logger. Records are handed to a queue and written by a background
+# listener thread so callers never block on file or console I/O.
 logger = logging.getLogger("plaguefire")
-logger.setLevel(logging.DEBUG)
+logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+logger.propagate = False
 
 # Create file handler
 file_handler = logging.FileHandler(log_filename, mode='a', encoding='utf-8')
 file_handler.setLevel(logging.DEBUG)
 
 # Create formatter
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 file_handler.setFormatter(formatter)
 
-# Add file handler to logger
-logger.addHandler(file_handler)
+# Console echo (kept for backwards compatibility with the old print-based debug)
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setLevel(logging.DEBUG if DEBUG else logging.CRITICAL + 1)
+console_handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_listener = logging.handlers.QueueListener(_log_queue, file_handler, console_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+# Channels: each is a child logger ("plaguefire.ai", ...) with its own level.
+# Messages tagged like "[AI][MOVE] ..." are routed to their channel
+# automatically; pass channel= explicitly on hot paths to skip the lookup.
+CHANNELS = ("GENERAL", "AI", "STEALTH", "FOV", "SPAWN", "PROJECTILE", "RENDER")
+_channels: Dict[str, logging.Logger] = {name: logger.getChild(name.lower()) for name in CHANNELS}
+_general = _channels["GENERAL"]
+
+
+class _Lazy:
+    """Defers a message-building callable until a handler formats the record."""
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+
+def _channel_logger(channel: Optional[str], msg: Any) -> logging.Logger:
+    if channel:
+        return _channels.get(channel.upper(), _general)
+    if isinstance(msg, str) and msg.startswith("["):
+        end = msg.find("]")
+        if end > 1:
+            return _channels.get(msg[1:end], _general)
+    return _general
+
+
+def debug(msg: Union[str, Callable[[], Any]], *args: Any, channel: Optional[str] = None):
+    """Log a debug message.
+
+    Formatting is lazy: pass `%`-style args (``debug("hp=%d", hp)``) or a
+    callable returning the message; neither is evaluated when the channel
+    is disabled.
+    """
+    log = _channel_logger(channel, msg)
+    if not log.isEnabledFor(logging.DEBUG):
+        return
+    if callable(msg):
+        msg = _Lazy(msg)
+    log.debug(msg, *args)
+
+
+def is_debug_enabled(channel: Optional[str] = None) -> bool:
+    """True if debug messages on `channel` (or the general channel) are emitted."""
+    return _channel_logger(channel, None).isEnabledFor(logging.DEBUG)
+
+
+def set_debug_enabled(enabled: bool, console: Optional[bool] = None) -> None:
+    """Runtime toggle for debug logging (all channels without their own level)."""
+    logger.setLevel(logging.DEBUG if enabled else logging.INFO)
+    if console is None:
+        console = enabled
+    console_handler.setLevel(logging.DEBUG if console else logging.CRITICAL + 1)
+
+
+def set_channel_level(channel: str, level: Union[int, str, None]) -> None:
+    """Set one channel's level (e.g. "AI", "WARNING"); None inherits the global level."""
+    log = _channels.get(channel.upper())
+    if log is None:
+        log = _channels[channel.upper()] = logger.getChild(channel.lower())
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    log.setLevel(level if level is not None else logging.NOTSET)
 
-def debug(msg: str):
-    from config import DEBUG
-    logger.debug(msg)
-    # Also print to console if DEBUG is enabled (for backwards compatibility)
-    if DEBUG:
-        print(f"[DEBUG] {msg}")
 
 def log_exception(e: Exception):
-    from config import DEBUG
-    logger.error(f"Exception: {e}")
-    logger.error(traceback.format_exc())
-    # Also print to console if DEBUG is enabled (for backwards compatibility)
-    if DEBUG:
-        print("[ERROR]", e)
-        traceback.print_exc()
+    _general.error("Exception: %s\n%s", e, traceback.format_exc())
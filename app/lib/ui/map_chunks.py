@@ -0,0 +1,226 @@
+"""
+Chunked, pre-rendered map layer.
+
+The map is drawn into fixed-size chunk surfaces (`CHUNK_TILES` x
+`CHUNK_TILES` tiles) that are built lazily the first time the camera sees
+them and kept in an LRU. Each frame the view blits the chunks overlapping
+the viewport at their scrolled offsets, so moving the camera never redraws
+tiles; only chunks scrolling into view for the first time are built.
+
+Dirty tiles (doors, digging) are patched into the one chunk that contains
+them, if that chunk is cached. Uncached chunks pick the change up when they
+are built.
+
+Chunks are keyed per depth. When a depth's map object changes (regenerated
+or restored from the depth cache) its chunks are dropped.
+
+Terrain chunks are drawn fully lit. Fog of war is a separate layer
+(`FogLayer`) built from the FOV visibility array: its chunks are copies of
+the terrain chunks with one flat multiply fill per tile (or run of tiles)
+of equal visibility. A visibility change copies one tile rect back from
+the terrain chunk and refills its fog, so FOV updates never re-blit
+terrain sprites. The fog is baked into the fog chunks rather than
+multiplied over the terrain every frame, which keeps the per-frame cost
+at one plain blit per visible chunk.
+"""
+from __future__ import annotations
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+CHUNK_TILES = 16
+# 16x16 tiles at 32px is 1 MB per chunk; a 1280x720 viewport touches at most 12
+MAX_CHUNKS = 32
+
+ChunkKey = Tuple[int, int, int]  # (depth, chunk x, chunk y)
+# build(chunk, x0, y0, x1, y1) paints tiles [x0, x1) x [y0, y1) into a fresh chunk
+BuildFn = Callable[[pygame.Surface, int, int, int, int], None]
+# paint(chunk, rect, x, y) repaints tile (x, y) at `rect` inside its chunk
+PaintFn = Callable[[pygame.Surface, pygame.Rect, int, int], None]
+
+# Fog multipliers by visibility (0=unseen, 1=explored, 2=visible). Explored
+# matches SpriteManager.get_dimmed_sprite; unseen matches the black unseen tile.
+FOG_COLORS = ((0, 0, 0), (100, 100, 100), (255, 255, 255))
+
+
+class ChunkCache:
+    """LRU of pre-rendered map chunks for one view."""
+
+    def __init__(self, tile_size: int, background=(0, 0, 0), chunk_tiles: int = CHUNK_TILES, max_chunks: int = MAX_CHUNKS):
+        self.tile_size = tile_size
+        self.background = background
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+        self._chunks: "OrderedDict[ChunkKey, pygame.Surface]" = OrderedDict()
+        # depth -> weak reference to the map its chunks were drawn from
+        self._maps: Dict[int, Any] = {}
+        self._depth = 0
+        self._width = 0
+        self._height = 0
+        # Diagnostics
+        self.builds = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._maps.clear()
+
+    def bind(self, depth: int, current_map: Any) -> None:
+        """Select the depth/map being drawn, dropping chunks from a replaced map."""
+        self._depth = depth
+        self._width = current_map.width
+        self._height = current_map.height
+        ref = self._maps.get(depth)
+        if ref is not None and ref() is current_map:
+            return
+        self._drop_depth(depth)
+        self._maps[depth] = weakref.ref(current_map)
+
+    def _drop_depth(self, depth: int) -> None:
+        for key in [k for k in self._chunks if k[0] == depth]:
+            del self._chunks[key]
+
+    # -------------------------
+    # Drawing
+    # -------------------------
+    def draw(self, surface: pygame.Surface, start_x: int, start_y: int, end_x: int, end_y: int, build: BuildFn, special_flags: int = 0) -> None:
+        """Blit the chunks covering tiles [start_x, end_x) x [start_y, end_y) onto `surface`."""
+        n = self.chunk_tiles
+        ts = self.tile_size
+        blits = []
+        for cy in range(start_y // n, (end_y - 1) // n + 1):
+            for cx in range(start_x // n, (end_x - 1) // n + 1):
+                chunk = self._get(cx, cy, build)
+                blits.append((chunk, ((cx * n - start_x) * ts, (cy * n - start_y) * ts)))
+        if not blits:
+            return
+        if special_flags:
+            for chunk, pos in blits:
+                surface.blit(chunk, pos, special_flags=special_flags)
+        else:
+            surface.blits(blits, doreturn=False)
+
+    def patch(self, tiles: Iterable[Tuple[int, int]], paint: PaintFn) -> int:
+        """Redraw `tiles` inside their cached chunks. Returns how many were drawn."""
+        n = self.chunk_tiles
+        ts = self.tile_size
+        depth = self._depth
+        chunks = self._chunks
+        drawn = 0
+        for x, y in tiles:
+            if not (0 <= x < self._width and 0 <= y < self._height):
+                continue
+            chunk = chunks.get((depth, x // n, y // n))
+            if chunk is None:
+                continue
+            paint(chunk, pygame.Rect((x % n) * ts, (y % n) * ts, ts, ts), x, y)
+            drawn += 1
+        return drawn
+
+    def _get(self, cx: int, cy: int, build: BuildFn) -> pygame.Surface:
+        key = (self._depth, cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        n = self.chunk_tiles
+        x0, y0 = cx * n, cy * n
+        x1, y1 = min(self._width, x0 + n), min(self._height, y0 + n)
+        chunk = pygame.Surface(((x1 - x0) * self.tile_size, (y1 - y0) * self.tile_size))
+        try:
+            # Match the display format so composing chunks is a plain copy
+            chunk = chunk.convert()
+        except Exception:
+            pass
+        chunk.fill(self.background)
+        build(chunk, x0, y0, x1, y1)
+        self._chunks[key] = chunk
+        self.builds += 1
+        while len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+            self.evictions += 1
+        return chunk
+
+
+class FogLayer(ChunkCache):
+    """Terrain chunks with fog of war applied; these are what the view blits.
+
+    Each chunk starts as a copy of the matching `terrain` chunk and is
+    multiplied by `FOG_COLORS` per tile. Chunks of a depth are dropped when
+    FOV allocates a new visibility array for it.
+    """
+
+    def __init__(self, terrain: ChunkCache, chunk_tiles: int = CHUNK_TILES, max_chunks: int = MAX_CHUNKS):
+        super().__init__(terrain.tile_size, terrain.background, chunk_tiles, max_chunks)
+        self.terrain = terrain
+        self._visibility: Optional[List[List[int]]] = None
+
+    def clear(self) -> None:
+        super().clear()
+        self.terrain.clear()
+        self._visibility = None
+
+    def bind(self, depth: int, current_map: Any, visibility: Optional[List[List[int]]] = None) -> None:
+        self.terrain.bind(depth, current_map)
+        super().bind(depth, current_map)
+        if visibility is not self._visibility:
+            self._drop_depth(depth)
+            self._visibility = visibility
+
+    def draw(self, surface: pygame.Surface, start_x: int, start_y: int, end_x: int, end_y: int, build_terrain: BuildFn) -> None:
+        """Blit the fogged chunks over the viewport; `build_terrain` paints missing terrain chunks."""
+        super().draw(
+            surface, start_x, start_y, end_x, end_y,
+            lambda chunk, x0, y0, x1, y1: self._build(chunk, x0, y0, x1, y1, build_terrain)
+        )
+
+    def patch(self, tiles: Iterable[Tuple[int, int]], build_terrain: BuildFn) -> int:
+        """Re-apply fog to `tiles` from their terrain chunk (after FOV or terrain changes)."""
+        return super().patch(tiles, lambda chunk, rect, x, y: self._paint(chunk, rect, x, y, build_terrain))
+
+    def _build(self, chunk: pygame.Surface, x0: int, y0: int, x1: int, y1: int, build_terrain: BuildFn) -> None:
+        n = self.chunk_tiles
+        terrain = self.terrain._get(x0 // n, y0 // n, build_terrain)
+        chunk.blit(terrain, (0, 0))
+        vis = self._visibility
+        ts = self.tile_size
+        if not vis or len(vis) < y1 or len(vis[0]) < x1:
+            # Missing/misaligned FOV data: everything is unseen
+            chunk.fill(FOG_COLORS[0])
+            return
+        # One multiply per run of equal visibility; visible runs are left as is
+        for y in range(y0, y1):
+            row = vis[y]
+            py = (y - y0) * ts
+            run_start = x0
+            run_value = row[x0]
+            for x in range(x0 + 1, x1 + 1):
+                value = row[x] if x < x1 else None
+                if value == run_value:
+                    continue
+                self._fog(chunk, ((run_start - x0) * ts, py, (x - run_start) * ts, ts), run_value)
+                run_start = x
+                run_value = value
+
+    def _paint(self, chunk: pygame.Surface, rect: pygame.Rect, x: int, y: int, build_terrain: BuildFn) -> None:
+        n = self.chunk_tiles
+        chunk.blit(self.terrain._get(x // n, y // n, build_terrain), rect, area=rect)
+        try:
+            value = self._visibility[y][x]
+        except Exception:
+            value = 0
+        self._fog(chunk, rect, value)
+
+    @staticmethod
+    def _fog(chunk: pygame.Surface, rect, value: int) -> None:
+        if value == 2:
+            return
+        if value == 1:
+            chunk.fill(FOG_COLORS[1], rect, special_flags=pygame.BLEND_RGB_MULT)
+        else:
+            chunk.fill(FOG_COLORS[0], rect)
@@ -0,0 +1,216 @@
+"""
+Texture atlas for the fixed-size map sprites.
+
+Terrain tiles (everything `TileMapper` can return), trap sprites and effect
+frames are all drawn at the map tile size. Instead of keeping one scaled
+Surface (plus a dimmed copy) per sprite, `pack_sprites` scales each of them
+once and packs them on a grid into a few large sheets. `SpriteManager`
+serves tile-sized requests for packed paths as sub-rects of those sheets.
+
+The index uses the `data/sprite_atlas.json` entry format (`frame_0` ->
+[x, y, w, h]) with an extra `sheet` key naming the sheet image, so packed
+sheets can be written out with `SpriteAtlas.save` and read by the same
+tools. Build and inspect an atlas from the command line with::
+
+    python -m app.lib.ui.sprite_atlas --tile-size 32 --out build/atlas
+"""
+from __future__ import annotations
+import json
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from app.lib.core.logger import debug
+
+# Sheets are square; 1024px holds 32x32 = 1024 sprites at 32px tiles
+SHEET_SIZE = 1024
+# Image folders (under assets/images) packed in full besides the TileMapper tiles
+ATLAS_FOLDERS = ("traps", "effect")
+
+# path -> Surface (unscaled), or None if it cannot be loaded
+LoadFn = Callable[[str], Optional[pygame.Surface]]
+
+
+class SpriteAtlas:
+    """Packed sheets plus the index of where each sprite lives."""
+
+    def __init__(self, tile_size: int, sheets: List[pygame.Surface], index: Dict[str, dict]):
+        self.tile_size = tile_size
+        self.sheets = sheets
+        self.index = index
+        # Dimmed copies of whole sheets, made on first use
+        self._dimmed_sheets: Dict[int, pygame.Surface] = {}
+        # (path, dimmed) -> subsurface handed to callers
+        self._views: Dict[Tuple[str, bool], pygame.Surface] = {}
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def region(self, path: str, dimmed: bool = False) -> Optional[Tuple[pygame.Surface, pygame.Rect]]:
+        """(sheet, rect) for `path`, for `Surface.blits` entries of the form (sheet, dest, rect)."""
+        entry = self.index.get(path)
+        if entry is None:
+            return None
+        sheet = self._dimmed_sheet(entry['sheet_index']) if dimmed else self.sheets[entry['sheet_index']]
+        return sheet, pygame.Rect(entry['frame_0'])
+
+    def get(self, path: str, dimmed: bool = False) -> Optional[pygame.Surface]:
+        """Sprite for `path` as a subsurface of its sheet (shares the sheet's pixels)."""
+        key = (path, dimmed)
+        view = self._views.get(key)
+        if view is None:
+            region = self.region(path, dimmed)
+            if region is None:
+                return None
+            view = region[0].subsurface(region[1])
+            self._views[key] = view
+        return view
+
+    def native(self, path: str) -> bool:
+        """True if the source image was already tile-sized (packed unscaled)."""
+        entry = self.index.get(path)
+        return bool(entry) and entry.get('source_size') == [self.tile_size, self.tile_size]
+
+    def _dimmed_sheet(self, i: int) -> pygame.Surface:
+        sheet = self._dimmed_sheets.get(i)
+        if sheet is None:
+            # Same multiply as SpriteManager.get_dimmed_sprite, once per sheet
+            sheet = self.sheets[i].copy()
+            sheet.fill((100, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
+            self._dimmed_sheets[i] = sheet
+        return sheet
+
+    # -------------------------
+    # Export
+    # -------------------------
+    def sheet_name(self, i: int) -> str:
+        return f"atlas_{self.tile_size}_{i}.png"
+
+    def export_index(self) -> Dict[str, object]:
+        """Index in the `data/sprite_atlas.json` layout, with sheet file names."""
+        out: Dict[str, object] = {
+            "_comment": f"Packed {self.tile_size}px map sprites (generated by app.lib.ui.sprite_atlas)",
+            "_format": "Each entry maps a sprite path to its sheet and frame coordinates: [x, y, width, height]",
+        }
+        for path, entry in self.index.items():
+            out[path] = {"sheet": self.sheet_name(entry['sheet_index']), "frame_0": list(entry['frame_0'])}
+        return out
+
+    def save(self, directory: str) -> str:
+        """Write the sheets and `atlas_<size>.json` to `directory`; returns the index path."""
+        os.makedirs(directory, exist_ok=True)
+        for i, sheet in enumerate(self.sheets):
+            pygame.image.save(sheet, os.path.join(directory, self.sheet_name(i)))
+        index_path = os.path.join(directory, f"atlas_{self.tile_size}.json")
+        with open(index_path, 'w') as f:
+            json.dump(self.export_index(), f, indent=1)
+        return index_path
+
+
+def atlas_sprite_paths(tile_mapper, assets_root: Optional[str]) -> List[str]:
+    """Paths (as passed to `SpriteManager.load_sprite`) of every sprite to pack."""
+    rel: List[str] = []
+    for sprite_set in (tile_mapper.dungeon_sprites, tile_mapper.town_sprites, tile_mapper.building_wall_sprites):
+        for sprites in sprite_set.values():
+            rel.extend(sprites)
+    rel.append(tile_mapper.unseen_overlay)
+    images_root = os.path.join(assets_root or '', 'images')
+    for folder in ATLAS_FOLDERS:
+        try:
+            names = sorted(os.listdir(os.path.join(images_root, folder)))
+        except OSError:
+            continue
+        rel.extend(f"{folder}/{name}" for name in names if name.endswith('.png'))
+    paths: List[str] = []
+    seen = set()
+    for path in rel:
+        path = f"images/{path}"
+        if path not in seen:
+            seen.add(path)
+            paths.append(path)
+    return paths
+
+
+def pack_sprites(paths: Iterable[str], load: LoadFn, tile_size: int, sheet_size: int = SHEET_SIZE) -> SpriteAtlas:
+    """Scale every loadable sprite in `paths` to `tile_size` and pack them on a grid."""
+    per_row = max(1, sheet_size // tile_size)
+    per_sheet = per_row * per_row
+    cells: List[Tuple[str, pygame.Surface, Tuple[int, int]]] = []
+    for path in paths:
+        try:
+            image = load(path)
+        except Exception:
+            image = None
+        if image is None:
+            continue
+        source_size = image.get_size()
+        if source_size != (tile_size, tile_size):
+            image = pygame.transform.scale(image, (tile_size, tile_size))
+        cells.append((path, image, source_size))
+
+    sheets: List[pygame.Surface] = []
+    index: Dict[str, dict] = {}
+    for start in range(0, len(cells), per_sheet):
+        batch = cells[start:start + per_sheet]
+        rows = -(-len(batch) // per_row)
+        cols = min(per_row, len(batch))
+        sheet = pygame.Surface((cols * tile_size, rows * tile_size), pygame.SRCALPHA)
+        try:
+            sheet = sheet.convert_alpha()
+        except Exception:
+            pass
+        sheet.fill((0, 0, 0, 0))
+        sheet_index = len(sheets)
+        for i, (path, image, source_size) in enumerate(batch):
+            x = (i % per_row) * tile_size
+            y = (i // per_row) * tile_size
+            # MAX onto a cleared sheet copies pixels exactly (no alpha blending)
+            sheet.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            index[path] = {
+                'sheet_index': sheet_index,
+                'frame_0': (x, y, tile_size, tile_size),
+                'source_size': list(source_size),
+            }
+        sheets.append(sheet)
+    debug("[ATLAS] packed %d sprites at %dpx into %d sheet(s)", len(index), tile_size, len(sheets), channel="RENDER")
+    return SpriteAtlas(tile_size, sheets, index)
+
+
+def main(argv=None) -> int:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Pack the map sprites into atlas sheets.")
+    parser.add_argument("--tile-size", type=int, default=32)
+    parser.add_argument("--out", default=None, help="write sheets and index JSON to this directory")
+    args = parser.parse_args(argv)
+
+    from app.lib.core.headless import use_dummy_drivers
+    from app.lib.core.assets import AssetManager
+    from app.lib.core.tile_mapper import TileMapper
+
+    use_dummy_drivers()
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    assets = AssetManager(os.path.join(project_root, "assets"))
+    started = time.perf_counter()
+    atlas = pack_sprites(
+        atlas_sprite_paths(TileMapper(), assets.root),
+        lambda path: assets.image(*path.split('/')),
+        args.tile_size,
+    )
+    seconds = time.perf_counter() - started
+    print(f"{len(atlas)} sprites -> {len(atlas.sheets)} sheet(s) of "
+          f"{', '.join('%dx%d' % s.get_size() for s in atlas.sheets)} in {seconds:.2f}s")
+    if args.out:
+        print(f"index written to {atlas.save(args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
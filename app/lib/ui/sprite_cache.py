@@ -0,0 +1,326 @@
+"""
+Persistent on-disk cache of decoded, scaled sprites.
+
+Loading a sprite normally decodes the PNG, converts it and scales it to the
+tile size; dimmed variants add a multiply pass, and the atlas packs the
+result into sheets. `SpriteDiskCache` stores the finished pixels as raw
+RGBA so the next launch reads them back with `pygame.image.frombuffer`
+(through mmap) and skips decoding and scaling entirely.
+
+Entries are keyed by the cache version, the source files' paths, mtimes and
+sizes, the target scale and a variant name ('sprite', 'dimmed', 'atlas'),
+so editing an image or changing the tile size simply misses the old entry.
+Bumping `SPRITE_CACHE_VERSION` moves the cache to a fresh directory.
+
+`store` only queues an entry; `flush` writes the queue (a time slice at a
+time, from MapView.update, and whatever is left at exit) so a cold start
+never waits on the disk. Once the queue first drains the cache is pruned
+to `max_bytes`, least recently used entries first, which also clears out
+entries orphaned by edited images and directories of older cache versions.
+
+Measure cold vs warm startup with::
+
+    python -m app.lib.ui.sprite_cache --bench
+"""
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import time
+import weakref
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import pygame
+
+from app.lib.core.logger import debug
+
+SPRITE_CACHE_VERSION = 1
+# Default size cap; MapView passes config.SPRITE_CACHE_MAX_MB
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_MAGIC = b"PFSPR"
+# magic, version, header length
+_PREFIX = struct.Struct("<5sBI")
+
+
+class SpriteDiskCache:
+    """Raw RGBA sprite buffers under `directory/v<version>/`."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.path.join(directory, f"v{SPRITE_CACHE_VERSION}")
+        self.max_bytes = max_bytes
+        # key -> (surface, meta) waiting for flush()
+        self._pending: Dict[str, Tuple[pygame.Surface, Dict[str, Any]]] = {}
+        # Entry files read this session, touched before pruning
+        self._used: Set[str] = set()
+        self._pruned = False
+        # Diagnostics
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.removed = 0
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    @property
+    def pending(self) -> int:
+        """Entries queued but not written yet."""
+        return len(self._pending)
+
+    def entry_key(self, sources: Iterable[str], scale_to: Optional[Tuple[int, int]], variant: str) -> str:
+        """Cache key for pixels derived from `sources` (file paths) at `scale_to`."""
+        digest = hashlib.sha1(f"{SPRITE_CACHE_VERSION}|{scale_to}|{variant}".encode())
+        for source in sources:
+            try:
+                st = os.stat(source)
+                stamp = f"{st.st_mtime_ns}:{st.st_size}"
+            except OSError:
+                stamp = "missing"
+            digest.update(f"|{source}|{stamp}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".rgba")
+
+    def load(self, key: str) -> Optional[Tuple[pygame.Surface, Dict[str, Any]]]:
+        """(surface, meta) stored under `key`, or None on a miss or unreadable entry."""
+        queued = self._pending.get(key)
+        if queued is not None:
+            self.hits += 1
+            return queued
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, version, header_len = _PREFIX.unpack_from(data, 0)
+                if magic != _MAGIC or version != SPRITE_CACHE_VERSION:
+                    raise ValueError("stale sprite cache entry")
+                offset = _PREFIX.size + header_len
+                header = json.loads(bytes(data[_PREFIX.size:offset]))
+                size = (header['w'], header['h'])
+                view = memoryview(data)[offset:offset + size[0] * size[1] * 4]
+                try:
+                    raw = pygame.image.frombuffer(view, size, 'RGBA')
+                    # Copy out of the mapping in display format before it closes
+                    surface = _converted(raw, header.get('alpha', True))
+                    del raw
+                finally:
+                    view.release()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            debug("[SPRITE] unreadable cache entry %s: %s", path, e, channel="RENDER")
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.add(path)
+        return surface, header.get('meta') or {}
+
+    def store(self, key: str, surface: pygame.Surface, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Queue `surface` to be written under `key` by the next `flush`.
+
+        The surface is kept by reference, so it must not be drawn on afterwards.
+        """
+        self._pending[key] = (surface, meta or {})
+
+    def flush(self, max_seconds: Optional[float] = None) -> bool:
+        """Write queued entries, stopping once `max_seconds` have passed (if given).
+
+        Returns True when nothing is left to do. The first call that drains
+        the queue also prunes the cache.
+        """
+        pending = self._pending
+        deadline = None if max_seconds is None else time.perf_counter() + max_seconds
+        while pending:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            key = next(iter(pending))
+            surface, meta = pending.pop(key)
+            self._write(key, surface, meta)
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+        return True
+
+    def _write(self, key: str, surface: pygame.Surface, meta: Dict[str, Any]) -> None:
+        """Write one entry. Failures are logged and ignored."""
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            w, h = surface.get_size()
+            header = json.dumps({
+                'w': w,
+                'h': h,
+                'alpha': bool(surface.get_flags() & pygame.SRCALPHA),
+                'meta': meta,
+            }).encode()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(_PREFIX.pack(_MAGIC, SPRITE_CACHE_VERSION, len(header)))
+                f.write(header)
+                f.write(pygame.image.tobytes(surface, 'RGBA'))
+            # Atomic so a concurrent or interrupted run never reads half a file
+            os.replace(tmp, path)
+            self.writes += 1
+        except Exception as e:
+            debug("[SPRITE] could not write cache entry %s: %s", path, e, channel="RENDER")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used entries until the cache fits in `max_bytes`.
+
+        Defaults to the cap given at construction. Directories of other cache
+        versions are removed outright. Returns how many entries were deleted.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        # Entries read this session count as the newest
+        for path in self._used:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        self._used.clear()
+        parent, current = os.path.split(self.directory)
+        try:
+            names = os.listdir(parent)
+        except OSError:
+            return 0
+        for name in names:
+            if name != current and name[:1] == 'v' and name[1:].isdigit():
+                shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+                total += st.st_size
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            debug("[SPRITE] pruned %d cache entries, %d bytes left", removed, total, channel="RENDER")
+        self.removed += removed
+        return removed
+
+
+def _flush_at_exit(ref: "weakref.ref[SpriteDiskCache]") -> None:
+    cache = ref()
+    if cache is not None:
+        cache.flush()
+
+
+def _converted(surface: pygame.Surface, alpha: bool) -> pygame.Surface:
+    """Display-format copy of `surface` (a plain copy before a display exists)."""
+    try:
+        return surface.convert_alpha() if alpha else surface.convert()
+    except Exception:
+        return surface.copy()
+
+
+def _bench_startup(cache_dir: Optional[str], tile_size: int) -> Dict[str, float]:
+    """Load the map sprites the way MapView does at startup; returns timings.
+
+    Cache writes happen after startup (see `flush`), so they are timed
+    separately as 'flush' and not counted in 'total'.
+    """
+    from app.lib.core.assets import AssetManager
+    from app.lib.core.tile_mapper import TileMapper
+    from app.lib.ui.sprite_atlas import atlas_sprite_paths
+    from app.lib.ui.sprite_manager import SpriteManager
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    assets = AssetManager(os.path.join(project_root, "assets"))
+    cache = SpriteDiskCache(cache_dir) if cache_dir else None
+    started = time.perf_counter()
+    manager = SpriteManager(assets, cache)
+    manager.build_atlas(atlas_sprite_paths(TileMapper(), assets.root), tile_size)
+    atlas_done = time.perf_counter()
+    # Monster sprites are loaded one by one, scaled, as entities come into view
+    monsters_root = os.path.join(assets.root, "sprites", "monsters")
+    loaded = 0
+    for root, _, files in os.walk(monsters_root):
+        for name in sorted(files):
+            if name.endswith('.png'):
+                rel = os.path.relpath(os.path.join(root, name), assets.root).replace(os.sep, '/')
+                if manager.load_sprite(rel, scale_to=(tile_size, tile_size)) is not None:
+                    loaded += 1
+    finished = time.perf_counter()
+    if cache is not None:
+        cache.flush()
+    return {
+        'atlas': atlas_done - started,
+        'sprites': finished - atlas_done,
+        'loaded': loaded,
+        'total': finished - started,
+        'flush': time.perf_counter() - finished,
+    }
+
+
+def main(argv=None) -> int:
+    import argparse
+    import subprocess
+    import sys
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmark sprite loading with and without the disk cache.")
+    parser.add_argument("--bench", action="store_true", help="run uncached, cold and warm startups in fresh processes")
+    parser.add_argument("--tile-size", type=int, default=32)
+    parser.add_argument("--cache-dir", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--once", choices=("none", "cache"), default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    from app.lib.core.headless import use_dummy_drivers
+    from app.lib.core.logger import set_debug_enabled
+    use_dummy_drivers()
+    set_debug_enabled(False)
+
+    if args.once:
+        # One startup in this process; prints its timings as JSON for --bench
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        stats = _bench_startup(args.cache_dir if args.once == "cache" else None, args.tile_size)
+        print(json.dumps(stats))
+        return 0
+    if not args.bench:
+        parser.print_help()
+        return 0
+
+    cache_dir = tempfile.mkdtemp(prefix="plaguefire-sprites-")
+    try:
+        # Each run is a fresh process so no in-memory cache carries over
+        runs = (("no cache", "none"), ("cold cache", "cache"), ("warm cache", "cache"))
+        for label, mode in runs:
+            out = subprocess.run(
+                [sys.executable, "-m", "app.lib.ui.sprite_cache", "--once", mode,
+                 "--cache-dir", cache_dir, "--tile-size", str(args.tile_size)],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            stats = json.loads(out)
+            print(f"{label:>10}: total {stats['total'] * 1000:7.1f} ms "
+                  f"(atlas {stats['atlas'] * 1000:6.1f} ms, {stats['loaded']} sprites {stats['sprites'] * 1000:7.1f} ms); "
+                  f"deferred writes {stats['flush'] * 1000:6.1f} ms")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
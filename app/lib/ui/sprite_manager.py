@@ -6,6 +6,9 @@ import os
 import json
 import pygame
 from typing import Optional, Tuple, Dict
+from app.lib.core.logger import debug
+from app.lib.ui.sprite_atlas import SHEET_SIZE, SpriteAtlas, pack_sprites
+from app.lib.ui.sprite_cache import SpriteDiskCache
 
 
 class AnimatedSprite:
@@ -156,20 +159,82 @@ class AnimatedSprite:
 class SpriteManager:
     """Manages sprite loading and caching."""
     
-    def __init__(self, assets):
+    def __init__(self, assets, disk_cache: Optional[SpriteDiskCache] = None):
         """
         Initialize the sprite manager.
         
         Args:
             assets: AssetManager instance for loading images
+            disk_cache: Optional on-disk cache of converted/scaled sprites
         """
         self.assets = assets
+        self.disk_cache = disk_cache
         self.sprite_cache = {}
         self.animated_sprites = {}
         self.atlas_metadata = self._load_atlas_metadata()
         # Performance optimization: cache scaled and dimmed variants
         self.scaled_sprite_cache = {}  # (path, scale_to) -> Surface
         self.dimmed_sprite_cache = {}  # (path, scale_to) -> dimmed Surface
+        # Packed tile-sized sprites (see sprite_atlas); None until build_atlas
+        self.atlas: Optional[SpriteAtlas] = None
+    
+    def build_atlas(self, paths, tile_size: int) -> Optional[SpriteAtlas]:
+        """Pack `paths` into atlas sheets at `tile_size`; later tile-sized loads of them use the atlas."""
+        paths = list(paths)
+        cache = self.disk_cache
+        key = None
+        if cache is not None:
+            # One entry per sheet; the first also carries the index
+            key = cache.entry_key([self._resolve_path(p) for p in paths], (tile_size, tile_size), f"atlas{SHEET_SIZE}")
+            atlas = self._load_cached_atlas(key, tile_size)
+            if atlas is not None:
+                self.atlas = atlas
+                return atlas
+        def load(path):
+            path_parts = path.split('/')
+            return self.assets.image(*path_parts)
+        try:
+            self.atlas = pack_sprites(paths, load, tile_size)
+        except Exception as e:
+            debug("[ATLAS] Failed to build sprite atlas: %s", e, channel="RENDER")
+            self.atlas = None
+        if key is not None and self.atlas is not None:
+            index = {path: {'sheet_index': e['sheet_index'], 'frame_0': list(e['frame_0']), 'source_size': e['source_size']}
+                     for path, e in self.atlas.index.items()}
+            for i, sheet in enumerate(self.atlas.sheets):
+                cache.store(f"{key}-{i}", sheet, {'sheets': len(self.atlas.sheets), 'index': index} if i == 0 else None)
+        return self.atlas
+    
+    def _load_cached_atlas(self, key: str, tile_size: int) -> Optional[SpriteAtlas]:
+        first = self.disk_cache.load(f"{key}-0")
+        if first is None:
+            return None
+        sheet, meta = first
+        sheets = [sheet]
+        for i in range(1, int(meta.get('sheets', 1))):
+            entry = self.disk_cache.load(f"{key}-{i}")
+            if entry is None:
+                return None
+            sheets.append(entry[0])
+        return SpriteAtlas(tile_size, sheets, meta.get('index') or {})
+    
+    def _resolve_path(self, path: str) -> str:
+        """Filesystem path of a sprite path, with the same images/ prefixing as load_sprite."""
+        path_parts = path.split('/')
+        if path_parts and path_parts[0] not in ('images', 'sprites', 'assets'):
+            images_root = os.path.join(self.assets.root or '', 'images')
+            if os.path.isdir(images_root):
+                path_parts = ['images'] + path_parts
+        return self.assets._resolve(*path_parts)
+    
+    def _atlas_sprite(self, path: str, scale_to, direction: str, frame_index: int, dimmed: bool = False) -> Optional[pygame.Surface]:
+        """Sprite from the atlas if `path` is packed and requested at the atlas tile size."""
+        atlas = self.atlas
+        if atlas is None or direction != 'down' or frame_index != 0 or path not in atlas:
+            return None
+        if scale_to == (atlas.tile_size, atlas.tile_size) or (scale_to is None and atlas.native(path)):
+            return atlas.get(path, dimmed)
+        return None
     
     def _load_atlas_metadata(self) -> Dict:
         """Load sprite atlas metadata from data/sprite_atlas.json"""
@@ -195,6 +260,10 @@ class SpriteManager:
         Returns:
             The loaded sprite surface or None if loading fails
         """
+        sprite = self._atlas_sprite(path, scale_to, direction, frame_index)
+        if sprite is not None:
+            return sprite
+        
         # Performance: check scaled cache first if scaling requested
         if scale_to:
             scaled_key = (path, scale_to, direction, frame_index)
@@ -245,16 +314,31 @@ class SpriteManager:
             except Exception:
                 resolved = None
 
-            sprite = self.assets.image(*path_parts)
-            
-            # Performance: convert to optimal pixel format immediately
-            if sprite.get_flags() & pygame.SRCALPHA:
-                sprite = sprite.convert_alpha()
-            else:
-                sprite = sprite.convert()
+            # Warm start: converted/scaled pixels straight from the disk cache
+            disk_key = None
+            sprite = None
+            if self.disk_cache is not None and resolved:
+                disk_key = self.disk_cache.entry_key([resolved], scale_to, 'sprite')
+                cached = self.disk_cache.load(disk_key)
+                if cached is not None:
+                    sprite = cached[0]
+                    disk_key = None
+
+            if sprite is None:
+                sprite = self.assets.image(*path_parts)
+                
+                # Performance: convert to optimal pixel format immediately
+                if sprite.get_flags() & pygame.SRCALPHA:
+                    sprite = sprite.convert_alpha()
+                else:
+                    sprite = sprite.convert()
+
+                if scale_to:
+                    sprite = pygame.transform.scale(sprite, scale_to)
+                if disk_key is not None:
+                    self.disk_cache.store(disk_key, sprite)
 
             if scale_to:
-                sprite = pygame.transform.scale(sprite, scale_to)
                 # Cache the scaled version separately for faster lookups
                 scaled_key = (path, scale_to, direction, frame_index)
                 self.scaled_sprite_cache[scaled_key] = sprite
@@ -279,6 +363,17 @@ class SpriteManager:
                 if os.path.isdir(images_root):
                     path_parts = ['images'] + path_parts
             
+            # Warm start: the extracted (and scaled) frame from the disk cache
+            disk_key = None
+            if self.disk_cache is not None:
+                disk_key = self.disk_cache.entry_key(
+                    [self.assets._resolve(*path_parts)], scale_to, 'frame:%d,%d,%d,%d' % tuple(coords)
+                )
+                cached = self.disk_cache.load(disk_key)
+                if cached is not None:
+                    self.sprite_cache[cache_key] = cached[0]
+                    return cached[0]
+            
             # Load full sheet
             full_sheet = self.assets.image(*path_parts)
             
@@ -289,6 +384,8 @@ class SpriteManager:
             
             if scale_to:
                 frame = pygame.transform.scale(frame, scale_to)
+            if disk_key is not None:
+                self.disk_cache.store(disk_key, frame)
             
             self.sprite_cache[cache_key] = frame
             return frame
@@ -309,11 +406,26 @@ class SpriteManager:
         Returns:
             Dimmed sprite surface or None if loading fails
         """
+        dimmed = self._atlas_sprite(path, scale_to, direction, frame_index, dimmed=True)
+        if dimmed is not None:
+            return dimmed
+        
         cache_key = (path, scale_to, direction, frame_index, 'dimmed')
         
         if cache_key in self.dimmed_sprite_cache:
             return self.dimmed_sprite_cache[cache_key]
         
+        disk_key = None
+        if self.disk_cache is not None and path not in self.atlas_metadata:
+            try:
+                disk_key = self.disk_cache.entry_key([self._resolve_path(path)], scale_to, f'dimmed:{direction}:{frame_index}')
+            except Exception:
+                disk_key = None
+            cached = self.disk_cache.load(disk_key) if disk_key else None
+            if cached is not None:
+                self.dimmed_sprite_cache[cache_key] = cached[0]
+                return cached[0]
+        
         # Load the original sprite
         sprite = self.load_sprite(path, scale_to, direction, frame_index)
         if not sprite:
@@ -322,6 +434,8 @@ class SpriteManager:
         # Create dimmed version
         dimmed = sprite.copy()
         dimmed.fill((100, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
+        if disk_key is not None:
+            self.disk_cache.store(disk_key, dimmed)
         
         # Cache it
         self.dimmed_sprite_cache[cache_key] = dimmed
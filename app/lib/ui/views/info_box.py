@@ -7,6 +7,7 @@ about entities (NPCs, monsters) when clicked, with interactive action buttons.
 
 import pygame
 import app.lib.ui.theme as theme
+from app.lib.core.logger import debug
 
 
 class Button:
@@ -106,7 +107,7 @@ class InfoBox:
             # Check if player can cast spells
             known = getattr(player, 'known_spells', [])
             can_cast = hasattr(player, 'known_spells') and len(known) > 0
-            print(f"[DEBUG] InfoBox: player has known_spells={hasattr(player, 'known_spells')}, known={known}, can_cast={can_cast}")
+            debug("InfoBox: player has known_spells=%s, known=%s, can_cast=%s", hasattr(player, 'known_spells'), known, can_cast)
         
         # Button layout will be created during render
         # We'll store button specs here
@@ -358,7 +359,7 @@ class InfoBox:
             if button.contains(pos) and button.enabled:
                 self.last_action = (button.action, self.entity)
                 entity_name = getattr(self.entity, 'name', 'Unknown') if self.entity else 'Unknown'
-                print(f"[DEBUG] Button clicked: {button.action} on {entity_name}")
+                debug("Button clicked: %s on %s", button.action, entity_name)
                 return True
         
         # Check if click is outside the box (close it)
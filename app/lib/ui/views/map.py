@@ -1,31 +1,38 @@
+import time
+
 import pygame
 from app.lib.core.game_engine import Game
 from app.lib.core.loader import Loader
-from app.lib.core.logger import debug
+from app.lib.core.engine.pathfinding import PathFollower
+from app.lib.core.logger import debug, is_debug_enabled, set_debug_enabled
 from app.lib.ui.views.view import View
 from app.lib.core.tile_mapper import TileMapper
 from app.lib.ui.sprite_manager import SpriteManager
+from app.lib.ui.sprite_atlas import atlas_sprite_paths
+from app.lib.ui.sprite_cache import SpriteDiskCache
 from app.lib.ui.views.info_box import InfoBox
 from app.lib.ui.views.player_info_box import PlayerInfoBox
 from app.lib.ui.trap_overlay import render_traps_and_chests
+from app.lib.ui.map_chunks import ChunkCache, FogLayer
 from app.lib.ui import gui
-from config import STAIRS_UP, STAIRS_DOWN, FLOOR, WALL, DOOR_OPEN, DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND, MAGMA_VEIN, QUARTZ_VEIN, RENDER_DIRTY_RECTS
+from config import STAIRS_UP, STAIRS_DOWN, FLOOR, WALL, DOOR_OPEN, DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND, MAGMA_VEIN, QUARTZ_VEIN, RENDER_DIRTY_RECTS, SPRITE_CACHE_ENABLED, SPRITE_CACHE_DIR, SPRITE_CACHE_MAX_MB
 from app.lib.utils import ensure_valid_player_position, find_preferred_start_position
 
+# Frames between RENDER-channel timing summaries
+RENDER_STATS_INTERVAL = 300
+# Colour behind the map (and behind transparent tile sprites)
+MAP_BACKGROUND = (20, 20, 20)
+# Time per frame spent writing queued sprites to the disk cache
+SPRITE_CACHE_FLUSH_SECONDS = 0.004
+
 class MapView(View):
     def _is_walkable(self, x, y):
         engine = self.game
         if not engine or not engine.current_map:
             return False
-        current_map = engine.current_map
-        if not (0 <= x < engine.map_width and 0 <= y < engine.map_height):
-            return False
-        # Block walls and hazardous veins (magma/lava should be impassable)
-        tile = current_map[y][x]
-        if tile in (WALL, MAGMA_VEIN, QUARTZ_VEIN):
-            return False
-        # Block closed or secret doors; doors must be opened before moving through
-        if tile in (DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND):
+        # Walls, veins and closed or secret doors are cleared from the
+        # precomputed passable mask; doors must be opened before moving through
+        if not engine.current_map.is_passable(x, y):
             return False
         # Avoid traps marked to avoid
         tm = getattr(engine, 'trap_manager', None)
@@ -42,9 +49,19 @@ class MapView(View):
             return False
         return True
 
+    def _click_move_blocked(self) -> set:
+        """Tiles click-to-move must route around: entities and traps marked to avoid."""
+        engine = self.game
+        blocked = set(engine.entity_manager._spatial_hash.keys())
+        tm = getattr(engine, 'trap_manager', None)
+        if tm and tm.traps:
+            for pos, trap in tm.traps.items():
+                if trap.get('avoid') and not trap.get('disarmed'):
+                    blocked.add(pos)
+        return blocked
+
     def _start_click_move(self, target):
         """Compute path to target and start moving along it."""
-        from app.lib.core.engine import pathfinding
         player = self.game.player
         engine = self.game
         if not player or not player.position or not engine or not engine.current_map:
@@ -54,13 +71,16 @@ class MapView(View):
         start = (int(player.position[0]), int(player.position[1]))
         goal = (int(target[0]), int(target[1]))
         debug(f"[DEBUG] Starting pathfinding from {start} to {goal}")
-        path = pathfinding.find_path(
-            engine.map_width,
-            engine.map_height,
-            start,
-            goal,
-            self._is_walkable
-        )
+        blocked = self._click_move_blocked()
+        follower = self._click_follower
+        follower.pathfinder = engine.pathfinder
+        follower.hierarchy = getattr(engine, 'path_hierarchy', None)
+        if goal in blocked:
+            # _is_walkable semantics: never step onto an entity or avoided trap
+            follower.clear()
+            path = []
+        else:
+            path = follower.plan(start, goal, blocked=blocked)
         debug(f"[DEBUG] Path found: {path[:10] if len(path) > 10 else path} (length: {len(path)})")
         if path:
             self._click_move_path = path
@@ -69,39 +89,30 @@ class MapView(View):
             debug("[DEBUG] No valid path found!")
 
     def _find_adjacent_path(self, target: tuple[int, int]):
-        """Find a path to any walkable tile adjacent to target (x,y)."""
+        """Find a path to the nearest walkable tile adjacent to target (x,y).
+
+        All eight neighbours are handed to one multi-goal search instead of
+        pathing to each in turn.
+        """
         engine = self.game
         player = getattr(engine, 'player', None)
         if not engine or not player or not player.position:
             return None, None
-        from app.lib.core.engine import pathfinding
         start = (int(player.position[0]), int(player.position[1]))
+        blocked = self._click_move_blocked()
         tx, ty = target
-        candidates = []
-        for ady in (-1, 0, 1):
-            for adx in (-1, 0, 1):
-                if adx == 0 and ady == 0:
-                    continue
-                ax = tx + adx
-                ay = ty + ady
-                if not (0 <= ax < engine.map_width and 0 <= ay < engine.map_height):
-                    continue
-                if not self._is_walkable(ax, ay):
-                    continue
-                path = pathfinding.find_path(
-                    engine.map_width,
-                    engine.map_height,
-                    start,
-                    (ax, ay),
-                    self._is_walkable
-                )
-                if path:
-                    candidates.append((len(path), (ax, ay), path))
-        if not candidates:
+        goals = [
+            (tx + adx, ty + ady)
+            for ady in (-1, 0, 1)
+            for adx in (-1, 0, 1)
+            if (adx or ady) and self._is_walkable(tx + adx, ty + ady)
+        ]
+        if not goals:
             return None, None
-        candidates.sort(key=lambda x: x[0])
-        chosen = candidates[0]
-        return chosen[1], chosen[2]
+        path = engine.pathfinder.find_path_to_any(start, goals, blocked=blocked)
+        if not path:
+            return None, None
+        return path[-1], path
 
     """Renders the dungeon/town map using sprites."""
     
@@ -112,7 +123,12 @@ class MapView(View):
         self.tile_size = 32  # Size of each tile in pixels
         
         # Initialize sprite manager
-        self.sprite_manager = SpriteManager(game.assets)
+        self.sprite_manager = SpriteManager(
+            game.assets,
+            SpriteDiskCache(SPRITE_CACHE_DIR, SPRITE_CACHE_MAX_MB * 1024 * 1024) if SPRITE_CACHE_ENABLED else None
+        )
+        # Terrain, trap and effect sprites are served from packed sheets
+        self.sprite_manager.build_atlas(atlas_sprite_paths(self.tile_mapper, game.assets.root), self.tile_size)
         # Development toggle: show all entities regardless of FOV (dimmed when not visible)
         self._debug_show_all_entities = False
         
@@ -123,6 +139,8 @@ class MapView(View):
         # Click-to-move state
         self._click_move_timer = 0.0  # Timer for movement delay
         self._click_move_delay = 0.15  # Delay between steps (seconds)
+        # Cached route being walked; repaired locally when something blocks it
+        self._click_follower = PathFollower(getattr(game, 'pathfinder', None))
         # If a click target was a door, store its coords here so we can attempt
         # to open it when we reach an adjacent tile.
         self._click_move_door_target = None
@@ -158,11 +176,17 @@ class MapView(View):
         
         # Performance: dirty rectangle tracking for partial redraws
         self._dirty_tiles = set()  # Set of (x, y) tile coords that need redrawing
-        # Optional cached surface of the base tile layer — invalidated by
-        # changes in engine state and used when `RENDER_DIRTY_RECTS` is True
-        self._cached_map_surface: pygame.Surface | None = None
-        self._force_full_redraw = True  # Force full redraw on first frame or major changes
-        self._last_viewport = None  # Track viewport (start_x, start_y, end_x, end_y)
+        # Pre-rendered tile layer in 16x16-tile chunks, used when
+        # `RENDER_DIRTY_RECTS` is True; the camera composes the visible
+        # chunks of the fog-of-war layer built on top of them
+        self._map_chunks = ChunkCache(self.tile_size, MAP_BACKGROUND)
+        self._fog_layer = FogLayer(self._map_chunks)
+        self._dirty_fog_tiles = set()  # Tiles whose visibility changed (fog only)
+        self._force_full_redraw = True  # Drop all chunks on the next frame (major changes)
+        # Seconds per render phase for the last frame, plus rolling counters
+        # logged every RENDER_STATS_INTERVAL frames on the RENDER channel
+        self.frame_profile: dict[str, float] = {}
+        self.render_stats = self._new_render_stats()
         
         self._minimap_zoom = 1  # integer zoom level for fullscreen map
         self._minimap_min_zoom = 1
@@ -238,8 +262,9 @@ class MapView(View):
 
     def render(self, surface: pygame.Surface):
         """Render the map with tiles."""
+        frame_started = time.perf_counter()
         # Clear the surface first
-        surface.fill((20, 20, 20))
+        surface.fill(MAP_BACKGROUND)
         
         engine = self.game
         if not engine or not engine.current_map:
@@ -288,107 +313,50 @@ class MapView(View):
             if hasattr(engine, 'consume_dirty_map_tiles'):
                 dtile = engine.consume_dirty_map_tiles()
                 if dtile:
-                    for dx, dy in dtile:
-                        # Mark the logical tile dirty so the cached tiles update
-                        self._dirty_tiles.add((dx, dy))
-                    # If we configured to re-render partial tiles, don't force full
-                    # redraw; only apply deltas to the cache.
-                    self._force_full_redraw = False
+                    # Mark the logical tiles dirty so the cached tiles update
+                    self._dirty_tiles.update(dtile)
+            if hasattr(engine, 'consume_dirty_fog_tiles'):
+                self._dirty_fog_tiles.update(engine.consume_dirty_fog_tiles())
         except Exception:
             pass
-        tile_blits = []  # List of (surface, position) tuples for pygame.Surface.blits()
-        
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                # Get tile character
-                try:
-                    tile_char = current_map[y][x]
-                except Exception:
-                    tile_char = FLOOR
-
-                # Get visibility (0=unseen, 1=explored, 2=visible)
-                if vis_map and 0 <= y < len(vis_map) and 0 <= x < len(vis_map[0]):
-                    visibility = vis_map[y][x]
-                else:
-                    # Default to unseen instead of visible when FOV data is missing/misaligned
-                    visibility = 0
-                
-                # Get sprite path for this tile
-                sprite_path = self.tile_mapper.get_tile_sprite(tile_char, x, y, visibility, is_town)
-                
-                # Load sprite (with caching)
-                sprite = self._get_sprite(sprite_path)
-                
-                # Calculate screen position (relative to this view's surface, not absolute)
-                screen_x = (x - start_x) * self.tile_size
-                screen_y = (y - start_y) * self.tile_size
-                
-                # Queue the tile for batched rendering
-                if sprite:
-                    # Apply dimming for explored but not visible tiles
-                    if visibility == 1:
-                        # Performance: use pre-cached dimmed sprite
-                        dimmed = self.sprite_manager.get_dimmed_sprite(sprite_path, (self.tile_size, self.tile_size))
-                        if dimmed:
-                            tile_blits.append((dimmed, (screen_x, screen_y)))
-                        else:
-                            # Fallback to original if dimmed version fails
-                            tile_blits.append((sprite, (screen_x, screen_y)))
-                    else:
-                        tile_blits.append((sprite, (screen_x, screen_y)))
-        
+        tiles_started = time.perf_counter()
         # Dirty-rect / cached tile layer logic
         if RENDER_DIRTY_RECTS:
-            # Cache or update base tiles in a cached surface, then blit once
-            # onto the target surface to reduce overhead.
-            viewport_key = (start_x, start_y, end_x, end_y)
-            if self._cached_map_surface is None or self._force_full_redraw or self._last_viewport != viewport_key:
-                # Rebuild the entire cached tile layer
-                surf_w = (end_x - start_x) * self.tile_size
-                surf_h = (end_y - start_y) * self.tile_size
-                new_cache = pygame.Surface((surf_w, surf_h), pygame.SRCALPHA)
-                new_cache.fill((0, 0, 0, 0))
-                if tile_blits:
-                    new_cache.blits(tile_blits)
-                self._cached_map_surface = new_cache
-                self._dirty_tiles.clear()
+            # Tiles are drawn once, fully lit, into terrain chunks; the fog
+            # layer copies them and applies the visibility array. Scrolling
+            # only changes where the fog chunks are blitted, FOV changes only
+            # refresh fog rects, and dirty terrain tiles patch their own
+            # chunk. Chunks entering view for the first time are built lazily.
+            chunks = self._map_chunks
+            fog = self._fog_layer
+            if self._force_full_redraw:
+                fog.clear()
                 self._force_full_redraw = False
-                self._last_viewport = viewport_key
-            else:
-                # Apply deltas for marked tiles
-                if self._dirty_tiles:
-                    for dx, dy in list(self._dirty_tiles):
-                        if dx < start_x or dx >= end_x or dy < start_y or dy >= end_y:
-                            continue
-                        # Recompute sprite for this tile and update cache
-                        try:
-                            tile_char = current_map[dy][dx]
-                        except Exception:
-                            tile_char = FLOOR
-                        # Determine visibility and town flag
-                        if vis_map and 0 <= dy < len(vis_map) and 0 <= dx < len(vis_map[0]):
-                            visibility = vis_map[dy][dx]
-                        else:
-                            visibility = 2
-                        sprite_path = self.tile_mapper.get_tile_sprite(tile_char, dx, dy, visibility, is_town)
-                        sprite = self._get_sprite(sprite_path)
-                        if visibility == 1:
-                            dimmed = self.sprite_manager.get_dimmed_sprite(sprite_path, (self.tile_size, self.tile_size))
-                            tile_to_blit = dimmed if dimmed else sprite
-                        else:
-                            tile_to_blit = sprite
-                        if tile_to_blit and self._cached_map_surface:
-                            sx = (dx - start_x) * self.tile_size
-                            sy = (dy - start_y) * self.tile_size
-                            self._cached_map_surface.blit(tile_to_blit, (sx, sy))
-                    self._dirty_tiles.clear()
-
-            if self._cached_map_surface:
-                surface.blit(self._cached_map_surface, (0, 0))
+            fog.bind(getattr(engine, 'current_depth', 0), current_map, vis_map)
+            build_terrain = lambda chunk, x0, y0, x1, y1: chunk.blits(
+                self._build_tile_blits(current_map, vis_map, x0, y0, x1, y1, is_town, lit=True), doreturn=False
+            )
+            built = chunks.builds + fog.builds
+            if self._dirty_tiles:
+                self.render_stats['patched_tiles'] += chunks.patch(
+                    self._dirty_tiles,
+                    lambda chunk, rect, x, y: self._paint_terrain_tile(chunk, rect, current_map, x, y, is_town)
+                )
+                self._dirty_fog_tiles |= self._dirty_tiles
+                self._dirty_tiles.clear()
+            if self._dirty_fog_tiles:
+                self.render_stats['fog_tiles'] += fog.patch(self._dirty_fog_tiles, build_terrain)
+                self._dirty_fog_tiles.clear()
+            fog.draw(surface, start_x, start_y, end_x, end_y, build_terrain)
+            self.render_stats['chunks_built'] += chunks.builds + fog.builds - built
         else:
             # Batch render all tiles at once - much faster than individual blits
+            tile_blits = self._build_tile_blits(current_map, vis_map, start_x, start_y, end_x, end_y, is_town)
             if tile_blits:
-                surface.blits(tile_blits)
+                surface.blits(tile_blits, doreturn=False)
+            self._dirty_tiles.clear()
+            self._dirty_fog_tiles.clear()
+        self.frame_profile['tiles'] = time.perf_counter() - tiles_started
         
         # Render entities
         self._render_entities(surface, start_x, start_y, end_x, end_y)
@@ -424,6 +392,90 @@ class MapView(View):
         self._render_trap_action_popup(surface)
         # Render tunnel action popup
         self._render_tunnel_action_popup(surface)
+        self._record_frame(frame_started)
+
+    def _tile_sprite(self, tile_char: str, x: int, y: int, visibility: int, is_town: bool):
+        """Sprite for one map tile, dimmed when explored but not currently visible."""
+        sprite_path = self.tile_mapper.get_tile_sprite(tile_char, x, y, visibility, is_town)
+        sprite = self._get_sprite(sprite_path)
+        if sprite and visibility == 1:
+            # Performance: use pre-cached dimmed sprite (original if that fails)
+            dimmed = self.sprite_manager.get_dimmed_sprite(self._sprite_load_path(sprite_path), (self.tile_size, self.tile_size))
+            if dimmed:
+                return dimmed
+        return sprite
+
+    def _tile_source(self, tile_char: str, x: int, y: int, visibility: int, is_town: bool):
+        """(surface, area) to blit for one map tile: a sheet and sub-rect when
+        the sprite is in the atlas, otherwise the sprite and None."""
+        atlas = self.sprite_manager.atlas
+        if atlas is not None:
+            sprite_path = self.tile_mapper.get_tile_sprite(tile_char, x, y, visibility, is_town)
+            region = atlas.region(self._sprite_load_path(sprite_path), dimmed=visibility == 1)
+            if region is not None:
+                return region
+        return self._tile_sprite(tile_char, x, y, visibility, is_town), None
+
+    def _build_tile_blits(self, current_map, vis_map, start_x: int, start_y: int, end_x: int, end_y: int, is_town: bool, lit: bool = False) -> list:
+        """(sprite, position[, area]) entries for every tile in the viewport, for Surface.blits().
+
+        With `lit` every tile is drawn as fully visible (fog is applied separately).
+        """
+        tile_blits = []
+        ts = self.tile_size
+        vis_ok = not lit and bool(vis_map) and len(vis_map) >= end_y and len(vis_map[0]) >= end_x
+        for y in range(start_y, end_y):
+            # Decode the visible span of this row once instead of per tile
+            row_tiles = current_map.row_string(y, start_x, end_x)
+            # Get visibility (0=unseen, 1=explored, 2=visible); default to
+            # unseen when FOV data is missing/misaligned
+            vis_row = vis_map[y] if vis_ok else None
+            screen_y = (y - start_y) * ts
+            for x in range(start_x, end_x):
+                try:
+                    tile_char = row_tiles[x - start_x]
+                except Exception:
+                    tile_char = FLOOR
+                visibility = 2 if lit else (vis_row[x] if vis_row is not None else 0)
+                source, area = self._tile_source(tile_char, x, y, visibility, is_town)
+                if area is not None:
+                    tile_blits.append((source, ((x - start_x) * ts, screen_y), area))
+                elif source:
+                    tile_blits.append((source, ((x - start_x) * ts, screen_y)))
+        return tile_blits
+
+    def _paint_terrain_tile(self, chunk: pygame.Surface, rect: pygame.Rect, current_map, x: int, y: int, is_town: bool) -> None:
+        """Redraw the fully lit map tile at (x, y) into `rect` of its terrain chunk."""
+        try:
+            tile_char = current_map.char_at(x, y)
+        except Exception:
+            tile_char = FLOOR
+        # Clear first so transparent sprite edges do not show the old tile
+        chunk.fill(MAP_BACKGROUND, rect)
+        sprite = self._tile_sprite(tile_char, x, y, 2, is_town)
+        if sprite:
+            chunk.blit(sprite, rect)
+
+    def _record_frame(self, frame_started: float) -> None:
+        """Store this frame's timings and periodically log averages on the RENDER channel."""
+        stats = self.render_stats
+        elapsed = time.perf_counter() - frame_started
+        self.frame_profile['frame'] = elapsed
+        stats['frames'] += 1
+        stats['frame_time'] += elapsed
+        stats['tile_time'] += self.frame_profile.get('tiles', 0.0)
+        if stats['frames'] >= RENDER_STATS_INTERVAL:
+            frames = stats['frames']
+            debug(
+                lambda: f"[RENDER] {frames} frames: frame={stats['frame_time'] / frames * 1000:.2f}ms "
+                f"tiles={stats['tile_time'] / frames * 1000:.3f}ms chunks_built={stats['chunks_built']} patched={stats['patched_tiles']} fog={stats['fog_tiles']}",
+                channel="RENDER"
+            )
+            self.render_stats = self._new_render_stats()
+
+    @staticmethod
+    def _new_render_stats() -> dict:
+        return {'frames': 0, 'frame_time': 0.0, 'tile_time': 0.0, 'chunks_built': 0, 'patched_tiles': 0, 'fog_tiles': 0}
 
     def _render_traps_and_chests(self, surface: pygame.Surface, start_x: int, start_y: int, end_x: int, end_y: int) -> None:
         """Render trap/chest sprites for revealed (or disarmed) objects within viewport."""
@@ -551,6 +603,15 @@ class MapView(View):
             return
         gui.render_popup(self._tunnel_action_popup, surface, default_bg=(28, 24, 20), default_border=(200, 170, 120))
     
+    @staticmethod
+    def _sprite_load_path(sprite_path: str) -> str:
+        """Namespace a path relative to images/ the way SpriteManager expects."""
+        path_to_load = sprite_path or ""
+        first_seg = path_to_load.split('/')[0] if path_to_load else ''
+        if first_seg not in ('images', 'sprites', 'assets'):
+            path_to_load = f"images/{path_to_load}"
+        return path_to_load
+
     def _get_sprite(self, sprite_path: str) -> pygame.Surface:
         """Load and cache a sprite."""
         # Many callers pass either a bare path relative to the images/ folder
@@ -558,10 +619,7 @@ class MapView(View):
         # "sprites/monsters/fly/fly_idle.png". Avoid blindly prefixing
         # "images/" which would turn "sprites/..." into
         # "images/sprites/..." and break resolution.
-        path_to_load = sprite_path or ""
-        first_seg = path_to_load.split('/')[0] if path_to_load else ''
-        if first_seg not in ('images', 'sprites', 'assets'):
-            path_to_load = f"images/{path_to_load}"
+        path_to_load = self._sprite_load_path(sprite_path)
 
         sprite = self.sprite_manager.load_sprite(
             path_to_load,
@@ -1367,6 +1425,10 @@ class MapView(View):
     
     def update(self, dt: float):
         """Update animation state."""
+        # Write sprites queued for the disk cache a slice at a time
+        disk_cache = self.sprite_manager.disk_cache
+        if disk_cache is not None:
+            disk_cache.flush(SPRITE_CACHE_FLUSH_SECONDS)
         # Update player sprite animation continuously
         if self.player_sprite:
             self.player_sprite.update(dt, is_moving=True)  # Always animate like NPCs
@@ -1432,7 +1494,7 @@ class MapView(View):
         # Handle click-to-move path following
         if hasattr(self, '_click_move_target') and getattr(self, '_click_move_target', None):
             if not hasattr(self, '_click_move_path') or self._click_move_path is None:
-                debug(f"[DEBUG] Initiating click move to {self._click_move_target}")
+                debug("[DEBUG] Initiating click move to %s", self._click_move_target)
                 self._start_click_move(self._click_move_target)
                 # Only start once per click
                 self._click_move_target = None
@@ -1444,16 +1506,33 @@ class MapView(View):
             # Only move when timer exceeds delay
             if self._click_move_timer >= self._click_move_delay:
                 self._click_move_timer = 0.0  # Reset timer
-                
-                # Move player one step along the path
-                next_pos = self._click_move_path[0]
+
+                follower = self._click_follower
+                follower.pathfinder = self.game.pathfinder
+                follower.hierarchy = getattr(self.game, 'path_hierarchy', None)
+                if follower.path is not self._click_move_path:
+                    # Route was set directly by a door/tunnel/trap click
+                    follower.adopt(self._click_move_path)
                 player = self.game.player
+                # Repair the cached route if an entity or a door change broke it
+                if player and player.position and not follower.check(tuple(player.position), self._click_move_blocked()):
+                    debug("[DEBUG] Click-move route blocked and no detour found")
+                    follower.clear()
+                    self._click_move_path = []
+                    return
+                self._click_move_path = follower.path
+                if follower.done:
+                    self._click_move_path = []
+                    return
+
+                # Move player one step along the path
+                next_pos = follower.next_step()
                 player_pos = getattr(player, 'position', None)
-                debug(f"[DEBUG] Following path: player at {player_pos}, next step {next_pos}, path remaining: {len(self._click_move_path)}")
+                debug("[DEBUG] Following path: player at %s, next step %s, path remaining: %d", player_pos, next_pos, len(follower.path) - follower.index)
                 if player and player.position != next_pos:
                     dx = next_pos[0] - player.position[0]
                     dy = next_pos[1] - player.position[1]
-                    debug(f"[DEBUG] Moving player by ({dx},{dy})")
+                    debug("[DEBUG] Moving player by (%d,%d)", dx, dy)
                     # Block click-to-move if immobilized or frozen
                     try:
                         sm = getattr(player, 'status_manager', None)
@@ -1472,7 +1551,7 @@ class MapView(View):
                     new_y = player.position[1] + dy
                     if self._is_walkable(new_x, new_y):
                         player.position = (new_x, new_y)
-                        debug(f"[DEBUG] Player moved to {player.position}")
+                        debug("[DEBUG] Player moved to %s", player.position)
                         # Update sprite direction before FOV update
                         if self.player_sprite:
                             if dy < 0:  # Moving up
@@ -1513,9 +1592,11 @@ class MapView(View):
                         if hasattr(self.game, "_end_player_turn"):
                             self.game._end_player_turn()
                     else:
-                        debug(f"[DEBUG] Position ({new_x},{new_y}) is not walkable!")
+                        debug("[DEBUG] Position (%d,%d) is not walkable!", new_x, new_y)
                     # Remove the step from the path
-                    self._click_move_path = self._click_move_path[1:]
+                    follower.advance()
+                    if follower.done:
+                        self._click_move_path = []
                     # If we've finished the path and the click target was a
                     # door/tunnel/trap, attempt to act now that we're adjacent.
                     if not self._click_move_path:
@@ -1526,9 +1607,11 @@ class MapView(View):
                         except Exception:
                             pass
                 else:
-                    debug(f"[DEBUG] Already at {next_pos}, removing from path")
+                    debug("[DEBUG] Already at %s, removing from path", next_pos)
                     # Arrived at next step, remove it
-                    self._click_move_path = self._click_move_path[1:]
+                    follower.advance()
+                    if follower.done:
+                        self._click_move_path = []
                     # If we've finished the path and the click target was a
                     # door/tunnel/trap, attempt to act now that we're adjacent.
                     if not self._click_move_path:
@@ -1862,7 +1945,6 @@ class MapView(View):
                         self._open_tunnel_action_popup((tile_x, tile_y), (view_mx, view_my), clicked_tile)
                         continue
 
-                    from config import DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND
                     if clicked_tile in (DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND):
                         # Attempt to find a reachable adjacent tile to path to
                         adj, path = self._find_adjacent_path((tile_x, tile_y))
@@ -1929,6 +2011,14 @@ class MapView(View):
                         state = "ON" if self._debug_show_all_entities else "OFF"
                         self.game.toasts.show(f"Debug: show all entities {state}", 1.2, (200,200,255), (30,30,60))
                     return
+                # Debug: toggle debug logging at runtime
+                if event.key == pygame.K_F12:
+                    enabled = not is_debug_enabled()
+                    set_debug_enabled(enabled)
+                    if hasattr(self.game, 'toasts'):
+                        state = "ON" if enabled else "OFF"
+                        self.game.toasts.show(f"Debug logging {state}", 1.2, (200,200,255), (30,30,60))
+                    return
                 # Fullscreen map toggle
                 if event.key == pygame.K_f:
                     self._minimap_fullscreen = not getattr(self, '_minimap_fullscreen', False)
@@ -2053,6 +2143,7 @@ class MapView(View):
             entity.provoked = True
             if hasattr(entity, 'aware_of_player'):
                 entity.aware_of_player = True
+            engine.entity_manager.wake_entity(entity)
             self.game.toasts.show(f"You attack {entity.name}!", 2.0, (255, 200, 200), (60, 20, 20))
             engine.player_attack_entity(entity)
             
@@ -2271,7 +2362,6 @@ class MapView(View):
             return
         
         # Get tile at destination
-        from config import DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND
         cm = getattr(engine, 'current_map', None)
         tile = None
         if cm and 0 <= new_y < getattr(engine, 'map_height', len(cm)) and 0 <= new_x < getattr(engine, 'map_width', len(cm[0]) if cm else 0):
@@ -2609,7 +2699,6 @@ class MapView(View):
             return
         
         px, py = player.position
-        from config import DOOR_OPEN
         
         # Check all 8 adjacent tiles for open doors
         adjacent_doors = []
@@ -2782,11 +2871,12 @@ class MapView(View):
         vis = engine.fov.visibility or []
         cur_map = engine.current_map
         for y in range(map_h):
+            row_tiles = cur_map.row_string(y)
             for x in range(map_w):
                 v = vis[y][x] if y < len(vis) and x < len(vis[y]) else 0
                 if v == 0:
                     continue  # Unseen: skip (transparent)
-                tile = cur_map[y][x]
+                tile = row_tiles[x]
                 # Always use base color for explored/visible tiles
                 if tile in ('#', WALL):
                     color = COL_WALL
@@ -3111,11 +3201,12 @@ class MapView(View):
 
         # Draw tiles
         for y in range(map_h):
+            row_tiles = cur_map.row_string(y)
             for x in range(map_w):
                 v = vis[y][x] if y < len(vis) and x < len(vis[y]) else 0
                 if v == 0:
                     continue
-                tile = cur_map[y][x]
+                tile = row_tiles[x]
                 if tile in ('#', WALL):
                     color = (90,90,90, int(200*op))
                 elif tile == FLOOR:
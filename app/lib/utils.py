@@ -7,13 +7,6 @@ from config import (
     HISTORY_TABLES,
     FLOOR,
     STAIRS_UP,
-    WALL,
-    DOOR_OPEN,
-    DOOR_CLOSED,
-    SECRET_DOOR,
-    SECRET_DOOR_FOUND,
-    QUARTZ_VEIN,
-    MAGMA_VEIN,
 )
 from typing import Dict, List, Tuple, Any, Optional
 import random
@@ -259,16 +252,9 @@ def build_character_profile(
 def _is_walkable_for_player(engine, x: int, y: int) -> bool:
     if not engine or not engine.current_map:
         return False
-    if not (0 <= x < engine.map_width and 0 <= y < engine.map_height):
-        return False
-    tile = engine.current_map[y][x]
-    if tile == WALL:
-        return False
-    # Quartz and magma veins are solid, non-walkable tiles
-    if tile in (QUARTZ_VEIN, MAGMA_VEIN):
-        return False
-    # Do not allow walking onto closed or secret doors; they must be opened first
-    if tile in (DOOR_CLOSED, SECRET_DOOR, SECRET_DOOR_FOUND):
+    # Walls, quartz/magma veins and closed or secret doors are not passable;
+    # doors must be opened first
+    if not engine.current_map.is_passable(x, y):
         return False
     if engine.get_entity_at(x, y) is not None:
         return False
@@ -94,7 +94,8 @@ class Entity:
             clone_cap_value = DEFAULT_CLONE_CAP
         self.clone_max_population: int = int(clone_cap_value) if clone_cap_value is not None else 0
 
-        self.move_counter: float = roll_dice(1, 100) / 100
+        # Action energy (see engine/energy.py); a random start staggers monsters
+        self.energy: int = roll_dice(1, 50)
         self.status_manager = StatusEffectManager()
         self.aware_of_player: bool = False
         
@@ -210,7 +211,7 @@ class Entity:
             "aware_of_player": bool(getattr(self, "aware_of_player", False)),
             "is_sleeping": bool(getattr(self, "is_sleeping", False)),
             "has_spotted_player": bool(getattr(self, "has_spotted_player", False)),
-            "move_counter": float(getattr(self, "move_counter", 0.0)),
+            "energy": int(getattr(self, "energy", 0)),
             "ranged_attack": getattr(self, "ranged_attack", None),
             "ranged_range": int(getattr(self, "ranged_range", 0)),
             "spell_list": list(getattr(self, "spell_list", [])),
@@ -237,7 +238,11 @@ class Entity:
         ent.aware_of_player = bool(data.get("aware_of_player", False))
         ent.is_sleeping = bool(data.get("is_sleeping", False))
         ent.has_spotted_player = bool(data.get("has_spotted_player", False))
-        ent.move_counter = float(data.get("move_counter", 0.0))
+        if "energy" in data:
+            ent.energy = int(data.get("energy", 0))
+        else:
+            # Legacy saves stored a 0-2 move_counter
+            ent.energy = int(float(data.get("move_counter", 0.0)) * 50)
         # Optional overrides
         ent.ranged_attack = data.get("ranged_attack", ent.ranged_attack)
         ent.ranged_range = int(data.get("ranged_range", ent.ranged_range))
@@ -86,8 +86,8 @@ class Player:
             # Status effect manager (for buffs/debuffs); load from save if present
             se_data = data.get("status_effects") or {}
             self.status_manager = StatusEffectManager.from_dict(se_data) if isinstance(se_data, dict) else StatusEffectManager()
-            # Haste bonus actions tracking (runtime only, not saved)
-            self.haste_actions_remaining: int = 0
+            # Action energy (runtime only, not saved); a full action's worth to start
+            self.energy: int = 100
             # Encumbrance tracking (engine expects these attributes)
             self.encumbrance_level: str = data.get("encumbrance_level", "unburdened")
             self.last_encumbrance_warning: int = int(data.get("last_encumbrance_warning", 0))
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 
 
 class StatusEffect:
@@ -79,12 +79,15 @@ class StatusEffectManager:
     - get_effect(name): get StatusEffect object for querying magnitude/stacks
     - has_behavior(name): convenience alias for behavior flags (e.g., "Fleeing", "asleep")
     - tick_effects(): decrement durations and return list of expired effect names
+    - advance(turns): fast-forward durations by several turns at once
     - clear_all(): remove all effects
     """
 
     def __init__(self):
         # Store as name -> StatusEffect
         self._effects: Dict[str, StatusEffect] = {}
+        # Called with the effect name when an effect starts or ends (runtime only)
+        self.on_change: Optional[Callable[[str], None]] = None
 
     # -------- Core API --------
     def add_effect(
@@ -119,6 +122,7 @@ class StatusEffectManager:
             existing = self._effects[name]
             if stack_mode == "replace":
                 self._effects[name] = StatusEffect(name, duration, magnitude, stacks, max_stacks, source)
+                self._changed(name)
                 return True
             elif stack_mode == "stack":
                 # Try to add stacks
@@ -134,12 +138,14 @@ class StatusEffectManager:
                 return True
         else:
             self._effects[name] = StatusEffect(name, duration, magnitude, stacks, max_stacks, source)
+            self._changed(name)
             return True
 
     def remove_effect(self, name: str) -> bool:
         """Remove an effect if present. Returns True if removed."""
         if name in self._effects:
             del self._effects[name]
+            self._changed(name)
             return True
         return False
 
@@ -173,11 +179,35 @@ class StatusEffectManager:
             if effect.tick():
                 expired.append(name)
                 del self._effects[name]
+                self._changed(name)
+        return expired
+
+    def advance(self, turns: int) -> List[str]:
+        """Advance durations by `turns` turns at once. Return list of expired effect names."""
+        expired: List[str] = []
+        if turns <= 0:
+            return expired
+        for name, effect in list(self._effects.items()):
+            effect.duration -= turns
+            if effect.duration <= 0:
+                expired.append(name)
+                del self._effects[name]
+                self._changed(name)
         return expired
 
     def clear_all(self) -> None:
         """Remove all effects."""
+        names = list(self._effects)
         self._effects.clear()
+        for name in names:
+            self._changed(name)
+
+    def _changed(self, name: str) -> None:
+        if self.on_change is not None:
+            try:
+                self.on_change(name)
+            except Exception:
+                pass
 
     # -------- Serialization --------
     def to_dict(self) -> Dict[str, Any]:
@@ -8,6 +8,12 @@ WINDOW_HEIGHT = 720
 # False to force full redraws each frame (safer but slower). Toggleable per
 # MapView for debugging and progressive rollout.
 RENDER_DIRTY_RECTS = True
+# Keep converted/scaled sprites as raw buffers on disk so later launches skip
+# PNG decoding and scaling (see app/lib/ui/sprite_cache.py).
+SPRITE_CACHE_ENABLED = True
+SPRITE_CACHE_DIR = "cache/sprites"
+# Size cap for that cache; least recently used entries are pruned past it
+SPRITE_CACHE_MAX_MB = 64
 
 # ====================
 # Map Tile Constants
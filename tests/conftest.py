@@ -0,0 +1,12 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# The engine loads data/, assets/ and config.py relative to the working
+# directory, so run every test from the repository root
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
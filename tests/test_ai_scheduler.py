@@ -0,0 +1,73 @@
+import random
+
+from app.lib.core.engine.ai_scheduler import ACTIVE, DORMANT
+from app.lib.core.engine.entity import AI_UPDATE_DISTANCE
+from app.lib.core.headless import create_headless_game
+from app.model.entity import Entity
+from app.model.status_effects import StatusEffectManager
+
+EFFECTS = (
+    # name, duration, magnitude, stacks
+    ('Blessed', 3, 1, 1),
+    ('Weakened', 8, 2, 3),
+    ('Hasted', 12, 1, 1),
+    ('Cursed', 40, 4, 2),
+)
+
+
+def afflicted():
+    manager = StatusEffectManager()
+    for name, duration, magnitude, stacks in EFFECTS:
+        manager.add_effect(name, duration, magnitude, stacks, max_stacks=stacks)
+    return manager
+
+
+def test_advance_matches_ticking_turn_by_turn():
+    for turns in range(0, 45):
+        ticked, skipped = afflicted(), afflicted()
+        expired = []
+        for _ in range(turns):
+            expired += ticked.tick_effects()
+        assert skipped.advance(turns) == expired
+        assert skipped.to_dict() == ticked.to_dict()
+
+
+def far_floor(game):
+    grid = game.current_map
+    px, py = game.player.position
+    reach = AI_UPDATE_DISTANCE * AI_UPDATE_DISTANCE
+    return [(x, y) for y in range(grid.height) for x in range(grid.width)
+            if grid.is_ai_passable(x, y) and (x - px) ** 2 + (y - py) ** 2 > 4 * reach]
+
+
+def test_woken_entity_has_the_statuses_of_one_ticked_every_turn():
+    random.seed(5)
+    game = create_headless_game('.', 5)
+    manager = game.entity_manager
+    template = manager.entities[0].template_id
+    spots = far_floor(game)
+    assert len(spots) >= 2
+    parked, ticked = (Entity(template, game.current_depth, list(spot)) for spot in spots[:2])
+    for entity in (parked, ticked):
+        # Passive and never asleep: only the status tick differs between the two
+        entity.ai_type = 'passive'
+        entity.behavior = ''
+        entity.sleeps_during_day = entity.sleeps_during_night = False
+        entity.status_manager = afflicted()
+    # Aware entities are never parked, whatever the distance
+    ticked.aware_of_player = True
+    manager.entities = [parked, ticked]
+    manager.rebuild_index()
+
+    for gap in (1, 2, 5, 9, 30):
+        for _ in range(gap):
+            game.time += 1
+            manager.update_entities()
+        assert manager.scheduler.tier(parked) == DORMANT
+        assert manager.scheduler.tier(ticked) == ACTIVE
+        # An alarm wakes it; the turn it wakes on is ticked normally
+        manager.wake_entity(parked)
+        game.time += 1
+        manager.update_entities()
+        assert parked.status_manager.to_dict() == ticked.status_manager.to_dict(), gap
+    assert not ticked.status_manager.get_active_effects()
@@ -0,0 +1,33 @@
+from app.lib.core.engine.energy import ACTION_COST, EnergyQueue
+
+
+class Actor:
+    def __init__(self, energy=0):
+        self.energy = energy
+
+
+def test_readded_actor_ignores_entries_from_before_discard():
+    queue = EnergyQueue(base_speed=50)
+    actor = Actor()
+    queue.now = 0
+    queue.add(actor)        # due at turn 2
+    queue.discard(actor)
+    queue.now = 1
+    queue.add(actor)        # rejoins with 0 energy, due at turn 3
+    queue.now = 2
+    assert list(queue.pop_due()) == []
+    assert queue.energy(actor) == 50
+
+
+def test_actor_acts_when_energy_is_full():
+    queue = EnergyQueue(base_speed=50)
+    actor = Actor()
+    queue.add(actor)
+    acted = []
+    for turn in range(1, 7):
+        queue.now = turn
+        for due in queue.pop_due():
+            acted.append(turn)
+            assert queue.energy(due) >= ACTION_COST
+            queue.spend(due)
+    assert acted == [2, 4, 6]
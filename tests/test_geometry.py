@@ -0,0 +1,29 @@
+import math
+
+from app.lib.core.engine.geometry import adjacent, chebyshev, disc_offsets, dist2, distance, in_range
+
+OFFSETS = [(dx, dy) for dy in range(-25, 26) for dx in range(-25, 26)]
+
+
+def test_in_range_agrees_with_float_distance_thresholds():
+    # Integer radii (detection, AI update distance) and fractional ones
+    for radius in (0, 1, 1.5, 2, 2.5, 3.5, 5, 7.5, 8, 12.5, 20):
+        for dx, dy in OFFSETS:
+            assert in_range(dist2(dx, dy, 0, 0), radius) == (math.sqrt(dx * dx + dy * dy) <= radius), (radius, dx, dy)
+
+
+def test_pair_helpers_match_their_float_forms():
+    for dx, dy in OFFSETS:
+        d2 = dist2(3 + dx, 4 + dy, 3, 4)
+        assert distance(d2) == math.hypot(dx, dy)
+        assert adjacent(3 + dx, 4 + dy, 3, 4) == (math.hypot(dx, dy) <= 1.5)
+        assert chebyshev(3 + dx, 4 + dy, 3, 4) == max(abs(dx), abs(dy))
+
+
+def test_disc_offsets_match_bounding_square_scan():
+    for radius in (0, 1, 4, 8, 15):
+        square = [(dx, dy, dx * dx + dy * dy)
+                  for dy in range(-radius, radius + 1)
+                  for dx in range(-radius, radius + 1)
+                  if math.sqrt(dx * dx + dy * dy) <= radius]
+        assert list(disc_offsets(radius)) == square
@@ -0,0 +1,137 @@
+import random
+
+import pygame
+import pytest
+
+import app.lib.ui.views.map as map_view
+from app.lib.core.engine.grid import TileGrid
+from app.lib.core.headless import create_headless_game
+from app.lib.ui.map_chunks import CHUNK_TILES, ChunkCache
+
+VIEW_SIZE = (640, 480)
+
+
+def pillar_grid(width, height):
+    """Open floor with a walled border and a regular pattern of pillars."""
+    return TileGrid.from_rows([
+        ''.join('#' if x in (0, width - 1) or y in (0, height - 1) or (x % 9 == 4 and y % 6 == 3) else '.'
+                for x in range(width))
+        for y in range(height)
+    ])
+
+
+@pytest.fixture
+def view(monkeypatch):
+    monkeypatch.setattr(map_view, "SPRITE_CACHE_ENABLED", False)
+    random.seed(1)
+    game = create_headless_game('.', 3)
+    grid = pillar_grid(500, 200)
+    game.current_map = grid
+    game.map_width, game.map_height = grid.width, grid.height
+    game.rooms = []
+    game.fov.reset(grid.width, grid.height)
+    game.pathfinder.bind(grid)
+    game.path_hierarchy.bind(grid)
+    game.entity_manager.entities = []
+    game.entity_manager.rebuild_index()
+    game.player.position = (20, 20)
+    game.fov.update_fov()
+    pygame.display.init()
+    pygame.display.set_mode(VIEW_SIZE)
+    return map_view.MapView(pygame.Rect((0, 0), VIEW_SIZE), game)
+
+
+def render(view, monkeypatch, chunked):
+    monkeypatch.setattr(map_view, "RENDER_DIRTY_RECTS", chunked)
+    surface = pygame.Surface(VIEW_SIZE)
+    view.render(surface)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def test_walk_matches_full_redraw_and_builds_one_strip_per_step(view, monkeypatch):
+    game = view.game
+    chunks = view._map_chunks
+    fog = view._fog_layer
+    render(view, monkeypatch, True)
+    # Chunks in one column or one row of the viewport (plus its extra tile)
+    tiles_wide = VIEW_SIZE[0] // view.tile_size + 1
+    tiles_high = VIEW_SIZE[1] // view.tile_size + 1
+    strip = max(-(-tiles_wide // CHUNK_TILES), -(-tiles_high // CHUNK_TILES)) + 1
+    assert chunks.builds > strip
+    for step in range(60):
+        x, y = game.player.position
+        game.player.position = (x + 1, y) if step < 40 else (x, y + 1)
+        if step % 7 == 3:
+            game.set_tile(x + 3, y, '#')
+        game.fov.update_fov()
+        builds = chunks.builds, fog.builds
+        patched = view.render_stats['patched_tiles']
+        chunked = render(view, monkeypatch, True)
+        assert chunks.builds - builds[0] <= strip, step
+        assert fog.builds - builds[1] <= strip, step
+        if step % 7 == 3:
+            assert view.render_stats['patched_tiles'] == patched + 1
+        assert chunked == render(view, monkeypatch, False), step
+
+
+def test_patch_redraws_only_cached_chunks():
+    cache = ChunkCache(4, chunk_tiles=8)
+    cache.bind(1, pillar_grid(40, 24))
+    target = pygame.Surface((40, 40))
+    cache.draw(target, 0, 0, 10, 6, lambda chunk, x0, y0, x1, y1: None)
+    assert cache.builds == 2
+    painted = []
+    drawn = cache.patch([(1, 1), (9, 5), (20, 1), (3, 12), (-1, 0), (40, 0)],
+                        lambda chunk, rect, x, y: painted.append((x, y, tuple(rect))))
+    assert drawn == 2
+    assert painted == [(1, 1, (4, 4, 4, 4)), (9, 5, (4, 20, 4, 4))]
+    assert cache.builds == 2
+
+
+def test_visibility_change_only_patches_fog(view, monkeypatch):
+    game = view.game
+    chunks = view._map_chunks
+    fog = view._fog_layer
+    render(view, monkeypatch, True)
+    px, py = game.player.position
+    x0 = px - VIEW_SIZE[0] // view.tile_size // 2
+    y0 = py - VIEW_SIZE[1] // view.tile_size // 2
+    x1 = x0 + VIEW_SIZE[0] // view.tile_size + 1
+    y1 = y0 + VIEW_SIZE[1] // view.tile_size + 1
+    # A run of explored tiles ending in a visible one, plus viewport corners
+    flips = [(x, py + 3, 1) for x in range(px - 6, px - 1)]
+    flips += [(px - 1, py + 3, 2), (x0, y0, 2), (x1 - 1, y1 - 1, 1), (x0 + 3, y1 - 2, 2)]
+    changed = sum(game.fov._set_visibility(x, y, value) for x, y, value in flips)
+    assert changed == len(flips)
+    builds = chunks.builds, fog.builds
+    patched = view.render_stats['patched_tiles']
+    fog_tiles = view.render_stats['fog_tiles']
+    render(view, monkeypatch, True)
+    assert (chunks.builds, fog.builds) == builds
+    assert view.render_stats['patched_tiles'] == patched
+    assert view.render_stats['fog_tiles'] == fog_tiles + len(flips)
+
+    def tile_layers():
+        vis = game.fov.visibility
+        build_terrain = lambda chunk, bx0, by0, bx1, by1: chunk.blits(
+            view._build_tile_blits(game.current_map, vis, bx0, by0, bx1, by1, False, lit=True), doreturn=False
+        )
+        size = ((x1 - x0) * view.tile_size, (y1 - y0) * view.tile_size)
+        chunked = pygame.Surface(size)
+        chunked.fill(map_view.MAP_BACKGROUND)
+        fog.draw(chunked, x0, y0, x1, y1, build_terrain)
+        direct = pygame.Surface(size)
+        direct.fill(map_view.MAP_BACKGROUND)
+        direct.blits(view._build_tile_blits(game.current_map, vis, x0, y0, x1, y1, False), doreturn=False)
+        return pygame.image.tobytes(chunked, "RGB"), pygame.image.tobytes(direct, "RGB")
+
+    # Patched fog chunks
+    chunked, direct = tile_layers()
+    assert chunked == direct
+    assert (chunks.builds, fog.builds) == builds
+    # Fog chunks rebuilt from scratch: one fill per run of equal visibility
+    fog._drop_depth(game.current_depth)
+    chunked, direct = tile_layers()
+    assert chunked == direct
+    assert chunks.builds == builds[0]
+    assert fog.builds > builds[1]
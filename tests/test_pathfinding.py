@@ -0,0 +1,274 @@
+import random
+from collections import deque
+from types import SimpleNamespace
+
+from app.lib.core.engine.entity import EntityManager
+from app.lib.core.engine.grid import TileGrid
+from app.lib.core.engine.pathfinding import DIAGONAL_COST, STRAIGHT_COST, FlowField, PathFinder, PathFollower, SafetyMap
+from app.lib.core.headless import create_headless_game
+from config import DOOR_CLOSED, DOOR_OPEN, FLOOR
+
+
+def open_grid(width, height):
+    rows = ['#' * width]
+    rows += ['#' + '.' * (width - 2) + '#' for _ in range(height - 2)]
+    rows.append('#' * width)
+    return TileGrid.from_rows(rows)
+
+
+MAZE = [
+    "############",
+    "#....#.....#",
+    "#.##.#.###.#",
+    "#.#..#...#.#",
+    "#.#.####.#.#",
+    "#.#......#.#",
+    "#.######.#.#",
+    "#........#.#",
+    "############",
+]
+
+
+def bfs_steps(grid, start, goal):
+    """4-way step count from start to goal over grid.passable, or None."""
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return seen[(x, y)]
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (nx, ny) not in seen and grid.in_bounds(nx, ny) and grid.passable[ny * grid.width + nx]:
+                seen[(nx, ny)] = seen[(x, y)] + 1
+                queue.append((nx, ny))
+    return None
+
+
+def assert_walk(grid, start, path):
+    for (ax, ay), (bx, by) in zip([start] + path, path):
+        assert max(abs(ax - bx), abs(ay - by)) == 1
+        assert grid.passable[by * grid.width + bx]
+
+
+def test_find_path_to_any_picks_cheapest_finish():
+    pf = PathFinder(open_grid(20, 5))
+    # (15, 2) is further away but finishing there is cheaper overall
+    costs = {(5, 2): 200, (15, 2): 0}
+    path = pf.find_path_to_any((2, 2), costs.keys(), goal_costs=costs)
+    assert path[-1] == (15, 2)
+    assert len(path) == 13
+
+
+def test_repair_rejoins_route_near_obstruction():
+    grid = open_grid(60, 7)
+    follower = PathFollower(PathFinder(grid))
+    route = follower.plan((1, 3), (58, 3))
+    blocked = {route[1]}
+    assert follower.check((1, 3), blocked)
+    assert follower.repairs == 1 and follower.replans == 0
+    path = follower.path
+    assert path[-1] == (58, 3)
+    assert not blocked & set(path)
+    # Contiguous, and no more expensive than walking around the occupant
+    steps = zip([(1, 3)] + path, path)
+    assert all(abs(ax - bx) + abs(ay - by) == 1 for (ax, ay), (bx, by) in steps)
+    assert follower.remaining[0] == STRAIGHT_COST * (len(path) - 1)
+    assert len(path) == len(route) + 2
+    # A short detour should not search the whole open corridor
+    assert follower.pathfinder.last_expanded < 100
+
+
+def test_astar_paths_are_shortest():
+    grid = TileGrid.from_rows(MAZE)
+    pf = PathFinder(grid)
+    floors = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.passable[y * grid.width + x]]
+    for start in floors[::5]:
+        for goal in floors[::3]:
+            path = pf.find_path(start, goal)
+            expected = bfs_steps(grid, start, goal)
+            if start == goal or expected is None:
+                assert path == []
+                continue
+            assert len(path) == expected, (start, goal)
+            assert path[-1] == goal
+            assert_walk(grid, start, path)
+
+
+def test_diagonal_moves_do_not_cut_wall_corners():
+    grid = TileGrid.from_rows([
+        "####",
+        "#.##",
+        "#..#",
+        "####",
+    ])
+    pf = PathFinder(grid)
+    # (1,1) -> (2,2) diagonally would clip the wall at (2,1)
+    assert pf.find_path((1, 1), (2, 2), diagonal=True) == [(1, 2), (2, 2)]
+    # In the open a diagonal step is taken and costs DIAGONAL_COST
+    open_pf = PathFinder(open_grid(8, 8))
+    path = open_pf.find_path((1, 1), (4, 4), diagonal=True)
+    assert path == [(2, 2), (3, 3), (4, 4)]
+    assert open_pf.path_costs(path) == [DIAGONAL_COST, 2 * DIAGONAL_COST, 3 * DIAGONAL_COST]
+
+
+def test_search_gives_up_at_the_node_budget():
+    pf = PathFinder(open_grid(60, 3))
+    assert pf.find_path((1, 1), (58, 1), max_nodes=10) == []
+    assert pf.last_expanded == 10
+    assert len(pf.find_path((1, 1), (58, 1))) == 57
+    assert pf.last_expanded == 58
+
+
+def test_reused_arrays_give_the_same_paths_as_a_fresh_engine():
+    grid = TileGrid.from_rows(MAZE)
+    pf = PathFinder(grid)
+    arrays = pf._g, pf._parent, pf._stamp
+    queries = [((1, 1), (10, 7)), ((8, 7), (1, 1)), ((6, 1), (3, 3)), ((1, 1), (10, 7))]
+    for start, goal in queries:
+        assert pf.find_path(start, goal) == PathFinder(grid).find_path(start, goal)
+    assert (pf._g, pf._parent, pf._stamp) == arrays
+    assert pf._generation == len(queries)
+    # Wrapping the generation counter clears the stamps instead of reusing stale entries
+    pf._generation = 0xFFFFFFFE
+    for start, goal in queries:
+        assert pf.find_path(start, goal) == PathFinder(grid).find_path(start, goal)
+    assert pf._generation == len(queries)
+
+
+def test_flow_distances_match_bfs_within_max_dist():
+    grid = TileGrid.from_rows(MAZE)
+    field = FlowField()
+    field.compute(grid, (1, 1), max_dist=9)
+    for y in range(grid.height):
+        for x in range(grid.width):
+            expected = bfs_steps(grid, (1, 1), (x, y))
+            if expected is None or expected > 9:
+                assert field.distance(x, y) == FlowField.UNREACHED, (x, y)
+            else:
+                assert field.distance(x, y) == expected, (x, y)
+    assert field.distance(-1, 0) == FlowField.UNREACHED
+
+
+def test_downhill_steps_lead_to_the_origin():
+    grid = TileGrid.from_rows(MAZE)
+    field = FlowField()
+    field.compute(grid, (10, 7))
+    pos = (1, 7)
+    d = field.distance(*pos)
+    while d > 0:
+        steps = field.downhill(*pos)
+        assert steps and all(field.distance(*s) == d - 1 for s in steps)
+        pos = steps[0]
+        d -= 1
+    assert pos == (10, 7)
+    # Occupied tiles are skipped, but the origin is still offered as the final step
+    assert field.downhill(10, 6, blocked={(10, 7)}) == [(10, 7)]
+    assert field.downhill(10, 5, blocked={(10, 6)}) == []
+
+
+def test_player_field_refreshes_when_player_moves_or_a_door_changes():
+    grid = TileGrid.from_rows([
+        "########",
+        "#...+..#",
+        "########",
+    ])
+    player = SimpleNamespace(position=[1, 1])
+    manager = EntityManager(SimpleNamespace(current_map=grid, player=player))
+    field = manager._player_flow_field()
+    assert field.computations == 1
+    assert field.distance(5, 1) == FlowField.UNREACHED
+    assert manager._player_flow_field().computations == 1
+
+    player.position = [2, 1]
+    assert not field.is_current(grid, (2, 1), grid.ai_passable)
+    assert manager._player_flow_field().computations == 2
+    assert field.distance(1, 1) == 1
+
+    grid.set(4, 1, DOOR_OPEN)
+    assert not field.is_current(grid, (2, 1), grid.ai_passable)
+    assert manager._player_flow_field().computations == 3
+    assert field.distance(5, 1) == 3
+
+    grid.set(4, 1, DOOR_CLOSED)
+    assert manager._player_flow_field().distance(5, 1) == FlowField.UNREACHED
+
+
+def test_escape_steps_move_away_from_the_player_down_a_dead_end():
+    grid = TileGrid.from_rows([
+        "##########",
+        "#........#",
+        "########.#",
+        "########.#",
+        "##########",
+    ])
+    field = FlowField()
+    field.compute(grid, (1, 1))
+    safety = SafetyMap()
+    safety.compute(field)
+    pos = (3, 1)
+    path = []
+    while True:
+        steps = safety.escape_steps(*pos)
+        if not steps:
+            break
+        assert (1, 1) not in steps
+        assert field.distance(*steps[0]) == field.distance(*pos) + 1
+        pos = steps[0]
+        path.append(pos)
+    # Cornered at the end of the corridor, as far from the player as it gets
+    assert pos == (8, 3)
+    assert len(path) == 7
+    # Fleeing never steps onto the player or an occupied tile
+    assert safety.escape_steps(2, 1) == [(3, 1)]
+    assert safety.escape_steps(2, 1, blocked={(3, 1)}) == []
+
+
+def large_dungeon():
+    random.seed(7)
+    game = create_headless_game('.', 120)
+    assert game.path_hierarchy.active
+    return game
+
+
+def test_hierarchy_paths_are_walkable_and_near_optimal():
+    game = large_dungeon()
+    grid = game.current_map
+    flat = PathFinder(grid)
+    centres = [room.center() for room in game.rooms]
+    pairs = list(zip(centres, reversed(centres)))[:len(centres) // 2]
+    assert pairs
+    for start, goal in pairs:
+        path = game.path_hierarchy.find_path(start, goal)
+        best = flat.find_path(start, goal, max_nodes=grid.width * grid.height)
+        assert bool(path) == bool(best), (start, goal)
+        if not path:
+            continue
+        assert path[-1] == goal
+        assert_walk(grid, start, path)
+        assert all(abs(ax - bx) + abs(ay - by) == 1 for (ax, ay), (bx, by) in zip([start] + path, path))
+        assert len(best) <= len(path) <= len(best) * 1.1 + 4, (start, goal)
+
+
+def test_hierarchy_follows_doors_changed_through_set_tile():
+    game = large_dungeon()
+    hierarchy = game.path_hierarchy
+    graph = hierarchy.graph('passable')
+    start, goal = game.rooms[0].center(), game.rooms[-1].center()
+    route = hierarchy.find_path(start, goal)
+    assert route
+    door = next(pos for pos in route[len(route) // 2:] if game.get_tile_at_coords(*pos) == FLOOR)
+    rebuilds = graph.rebuilds
+
+    assert game.set_tile(door[0], door[1], DOOR_CLOSED)
+    assert graph._dirty
+    detour = hierarchy.find_path(start, goal)
+    assert graph.rebuilds == rebuilds + 1 and not graph._dirty
+    assert door not in detour
+    if detour:
+        assert_walk(game.current_map, start, detour)
+
+    assert game.set_tile(door[0], door[1], DOOR_OPEN)
+    reopened = hierarchy.find_path(start, goal)
+    assert graph.rebuilds == rebuilds + 2
+    assert len(reopened) == len(route)
+    assert_walk(game.current_map, start, reopened)
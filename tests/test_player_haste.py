@@ -0,0 +1,19 @@
+from collections import Counter
+
+from app.lib.core.headless import create_headless_game
+
+
+def test_haste_bonus_actions_stop_when_it_expires():
+    game = create_headless_game('.', 1)
+    game.entity_manager.entities = []
+    game.entity_manager.rebuild_index()
+    game._end_player_turn()
+    game.player.status_manager.add_effect('Hasted', duration=3)
+    actions = Counter()
+    for _ in range(10):
+        actions[game.time] += 1
+        game._end_player_turn()
+    start = min(actions)
+    # Ticked after the turn's energy gain, so Haste covers two full turns
+    assert [actions[start + i] for i in range(6)] == [1, 2, 2, 1, 1, 1]
+    assert sum("haste allows extra movement" in m for m in game.combat_log) == 1
@@ -0,0 +1,44 @@
+import json
+import random
+
+from app.lib.core.headless import create_headless_game, simulate
+
+
+def depth_snapshot(game):
+    return {
+        'entities': sorted((e.template_id, tuple(e.position), e.hp) for e in game.entity_manager.entities),
+        'ground_items': dict(game.ground_items),
+        'traps': {pos: (t['id'], t['revealed'], t['disarmed']) for pos, t in game.trap_manager.traps.items()},
+        'chests': {pos: (c['id'], c['opened']) for pos, c in game.trap_manager.chests.items()},
+        'secret_doors': dict(game.secret_door_difficulty),
+        'known_traps': set(game.trap_manager.known_traps),
+        'lit_rooms': set(game.lit_rooms),
+    }
+
+
+def test_save_load_round_trip_replaces_depth_state(tmp_path):
+    random.seed(11)
+    game = create_headless_game('.', 3)
+    simulate(game, 40, seed=11)
+    if game.trap_manager.traps:
+        game.trap_manager.known_traps.add(next(iter(game.trap_manager.traps)))
+    game.lit_rooms.add(0)
+    path = tmp_path / "save.json"
+    game.depth_store.save_game(str(path))
+    expected = depth_snapshot(game)
+    assert expected['entities']
+
+    # Load into a game that already holds another depth's entities and items
+    loaded = create_headless_game('.', 5)
+    loaded.ground_items[(1, 1)] = ["stale"]
+    loaded.depth_store.load_game(json.loads(path.read_text()))
+
+    assert loaded.current_depth == 3
+    assert depth_snapshot(loaded) == expected
+    manager = loaded.entity_manager
+    assert len(manager.index) == len(manager.entities)
+    assert manager.scheduler.in_sync(manager.entities)
+    for entity in manager.entities:
+        assert entity in manager.index
+        assert entity in manager.scheduler.queue
+        assert manager.get_entity_at(*entity.position) is entity
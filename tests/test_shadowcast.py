@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from app.lib.core.engine.grid import TileGrid
+from app.lib.core.engine.shadowcast import OCTANTS, Shadowcaster
+
+
+def cave_grid(width, height, seed):
+    """Cellular-automaton cave: 45% walls smoothed four times, solid border."""
+    rng = random.Random(seed)
+    walls = [[x in (0, width - 1) or y in (0, height - 1) or rng.random() < 0.45
+              for x in range(width)] for y in range(height)]
+    for _ in range(4):
+        walls = [[x in (0, width - 1) or y in (0, height - 1) or
+                  sum(walls[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) >= 5
+                  for x in range(width)] for y in range(height)]
+    return TileGrid.from_rows([''.join('#' if w else '.' for w in row) for row in walls])
+
+
+def recursive_visible(grid, ox, oy, radius):
+    """The recursive float-slope caster Shadowcaster replaced."""
+    visible = {(ox, oy)}
+
+    def cast(row, start_slope, end_slope, xx, xy, yx, yy):
+        if start_slope < end_slope:
+            return
+        while row <= radius:
+            blocked = False
+            next_start_slope = start_slope
+            dy = -row
+            col = -row - 1
+            while col < 0:
+                col += 1
+                x = ox + col * xx + dy * xy
+                y = oy + col * yx + dy * yy
+                left_slope = (col - 0.5) / (dy + 0.5)
+                right_slope = (col + 0.5) / (dy - 0.5)
+                if start_slope < right_slope:
+                    continue
+                elif end_slope > left_slope:
+                    break
+                if grid.in_bounds(x, y):
+                    is_opaque = grid.is_opaque(x, y)
+                    if col * col + dy * dy <= radius * radius:
+                        visible.add((x, y))
+                else:
+                    is_opaque = True
+                if blocked:
+                    if is_opaque:
+                        next_start_slope = right_slope
+                    else:
+                        blocked = False
+                        start_slope = next_start_slope
+                elif is_opaque and row < radius:
+                    blocked = True
+                    cast(row + 1, start_slope, left_slope, xx, xy, yx, yy)
+                    next_start_slope = right_slope
+            if blocked:
+                break
+            row += 1
+
+    for octant in OCTANTS:
+        cast(1, 1.0, 0.0, *octant)
+    return visible
+
+
+@pytest.mark.parametrize("radius", [8, 20, 60])
+def test_iterative_caster_matches_recursive_caster(radius):
+    grid = cave_grid(160, 70, seed=radius)
+    w = grid.width
+    floors = [(x, y) for y in range(grid.height) for x in range(w) if not grid.is_opaque(x, y)]
+    caster = Shadowcaster()
+    for ox, oy in random.Random(radius).sample(floors, 40):
+        seen = {(i % w, i // w) for i in caster.compute(grid.opaque, w, grid.height, ox, oy, radius)}
+        assert seen == recursive_visible(grid, ox, oy, radius), (ox, oy)
+
+
+def bench(width=320, height=122, seed=3, origins=200, radii=(8, 20, 60)):
+    """Time the recursive caster against Shadowcaster.compute on one cave."""
+    import time
+
+    grid = cave_grid(width, height, seed)
+    w = grid.width
+    floors = [(x, y) for y in range(grid.height) for x in range(w) if not grid.is_opaque(x, y)]
+    sample = random.Random(seed).sample(floors, min(origins, len(floors)))
+    caster = Shadowcaster()
+    print(f"{width}x{height} cave (seed {seed}), {len(sample)} origins")
+    for radius in radii:
+        caster.compute(grid.opaque, w, grid.height, *sample[0], radius)  # build the octant tables
+        started = time.perf_counter()
+        for ox, oy in sample:
+            recursive_visible(grid, ox, oy, radius)
+        recursive = time.perf_counter() - started
+        started = time.perf_counter()
+        for ox, oy in sample:
+            caster.compute(grid.opaque, w, grid.height, ox, oy, radius)
+        iterative = time.perf_counter() - started
+        n = len(sample)
+        print(f"radius {radius:>2}: recursive {recursive / n * 1e6:8.1f} us  "
+              f"iterative {iterative / n * 1e6:8.1f} us  ({recursive / iterative:.1f}x)")
+
+
+if __name__ == "__main__":
+    # python -m tests.test_shadowcast --bench [--seed S]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the iterative shadowcaster against the recursive one.")
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    if args.bench:
+        bench(seed=args.seed)
+    else:
+        parser.print_help()
@@ -0,0 +1,125 @@
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+from app.lib.core.engine.spatial import CELL_SIZE, SpatialIndex
+from app.lib.core.headless import create_headless_game
+
+
+def mob(x, y, template_id='rat', hp=5):
+    # SimpleNamespace compares by value, like the game's entity types may
+    return SimpleNamespace(position=(x, y), template_id=template_id, hp=hp)
+
+
+def walk(index, entity, x, y):
+    entity.position = (x, y)
+    index.move(entity, x, y)
+
+
+def test_moves_refile_entities_across_bucket_boundaries():
+    index = SpatialIndex()
+    a = mob(CELL_SIZE - 1, CELL_SIZE - 1)
+    index.insert(a)
+    assert list(index._buckets) == [(0, 0)]
+    walk(index, a, CELL_SIZE, CELL_SIZE - 1)
+    assert list(index._buckets) == [(1, 0)]
+    walk(index, a, CELL_SIZE, CELL_SIZE)
+    assert list(index._buckets) == [(1, 1)]
+    # Moving inside a bucket leaves it where it is
+    walk(index, a, 2 * CELL_SIZE - 1, 2 * CELL_SIZE - 1)
+    assert index._buckets == {(1, 1): [a]}
+    assert list(index.in_rect(0, 0, CELL_SIZE - 1, CELL_SIZE - 1)) == []
+    assert list(index.in_rect(CELL_SIZE, CELL_SIZE, 3 * CELL_SIZE, 3 * CELL_SIZE)) == [a]
+    # Moving an entity the index has not seen yet files it
+    b = mob(0, 0)
+    walk(index, b, 3, 3)
+    assert b in index and len(index) == 2
+
+
+def test_remove_takes_out_only_that_entity():
+    index = SpatialIndex()
+    a, twin = mob(4, 4), mob(4, 4)
+    index.insert(a)
+    index.insert(twin)
+    index.insert(a)
+    assert len(index) == 2 and index.population('rat') == 2
+    index.remove(a)
+    assert a not in index and twin in index
+    assert [e is twin for e in index.in_radius(4, 4, 0)] == [True]
+    assert index.population('rat') == 1
+    index.remove(twin)
+    index.remove(twin)
+    assert len(index) == 0 and index._buckets == {}
+    assert index.population('rat') == 0
+
+
+def test_radius_queries_match_a_full_scan_at_map_edges():
+    rng = random.Random(3)
+    width, height = 40, 30
+    index = SpatialIndex()
+    mobs = [mob(rng.randrange(width), rng.randrange(height)) for _ in range(120)]
+    mobs += [mob(0, 0), mob(width - 1, 0), mob(0, height - 1), mob(width - 1, height - 1)]
+    for m in mobs:
+        index.insert(m)
+    centres = [(0, 0), (width - 1, height - 1), (0, 15), (20, 0), (width - 1, 7), (13, height - 1)]
+    for radius in (0, 1, 1.5, 3, 7.5, 12):
+        for x, y in centres:
+            found = {id(e) for e in index.in_radius(x, y, radius)}
+            expected = {id(m) for m in mobs
+                        if (m.position[0] - x) ** 2 + (m.position[1] - y) ** 2 <= radius * radius}
+            assert found == expected, (x, y, radius)
+
+
+def test_population_counts_living_entities_per_template():
+    index = SpatialIndex()
+    rats = [mob(i, 0) for i in range(3)]
+    bat = mob(9, 9, 'bat')
+    corpse = mob(5, 5, hp=0)
+    for e in rats + [bat, corpse]:
+        index.insert(e)
+    assert index.population('rat') == 3 and index.population('bat') == 1
+    index.mark_dead(rats[0])
+    index.mark_dead(rats[0])
+    assert index.population('rat') == 2
+    # The dead stay findable by position until removed, and removal does not count twice
+    assert rats[0] in list(index.in_radius(0, 0, 0))
+    index.remove(rats[0])
+    assert index.population('rat') == 2
+    assert index.population('orc') == 0
+
+
+def test_manager_population_follows_spawns_deaths_and_clones():
+    random.seed(11)
+    game = create_headless_game('.', 5)
+    manager = game.entity_manager
+
+    def counts():
+        return Counter(e.template_id for e in manager.entities if e.hp > 0)
+
+    assert manager.entities
+    for tid, n in counts().items():
+        assert manager.index.population(tid) == n
+
+    victim = manager.entities[0]
+    tid = victim.template_id
+    before = manager.index.population(tid)
+    victim.hp = 0
+    manager._process_entity_deaths()
+    assert manager.index.population(tid) == before - 1
+
+    # Cloning stops once the template reaches its population cap
+    parent = next(e for e in manager.entities if e.hp > 0 and any(
+        manager._is_walkable_for_ai(e.position[0] + dx, e.position[1] + dy)
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))))
+    tid = parent.template_id
+    parent.clone_rate = 1.0
+    parent.clone_max_population = manager.index.population(tid)
+    size = len(manager.entities)
+    manager._attempt_entity_clone(parent)
+    assert len(manager.entities) == size
+    parent.clone_max_population += 1
+    manager._attempt_entity_clone(parent)
+    assert len(manager.entities) == size + 1
+    assert manager.index.population(tid) == parent.clone_max_population
+    for tid, n in counts().items():
+        assert manager.index.population(tid) == n
@@ -0,0 +1,84 @@
+import json
+
+import pygame
+
+from app.lib.ui.sprite_atlas import pack_sprites
+from app.lib.ui.sprite_manager import SpriteManager
+
+TILE = 4
+
+
+def solid(size, color):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
+
+
+# Six loadable sprites: tile-sized ones are packed as is, larger ones scaled
+SPRITES = {
+    f"images/s{i}.png": solid((TILE, TILE) if i % 2 else (TILE * 3, TILE * 2), (40 * i, 200 - 30 * i, 17 * i + 5, 255))
+    for i in range(6)
+}
+
+
+def load(path):
+    if path == "images/broken.png":
+        raise pygame.error("bad png")
+    return SPRITES.get(path)
+
+
+def pack():
+    paths = ["images/s0.png", "images/missing.png", "images/broken.png"] + [f"images/s{i}.png" for i in range(1, 6)]
+    # 8px sheets hold 2x2 sprites, so six sprites overflow onto a second sheet
+    return pack_sprites(paths, load, TILE, sheet_size=8)
+
+
+def test_pack_places_sprites_on_a_grid_across_sheets():
+    atlas = pack()
+    assert len(atlas) == 6
+    assert "images/missing.png" not in atlas and "images/broken.png" not in atlas
+    assert [s.get_size() for s in atlas.sheets] == [(8, 8), (8, 4)]
+    for i in range(6):
+        path = f"images/s{i}.png"
+        slot = i % 4
+        assert atlas.index[path]['sheet_index'] == i // 4
+        assert tuple(atlas.index[path]['frame_0']) == ((slot % 2) * TILE, (slot // 2) * TILE, TILE, TILE)
+        sheet, rect = atlas.region(path)
+        assert sheet is atlas.sheets[i // 4]
+        assert atlas.get(path).get_size() == (TILE, TILE)
+        assert atlas.get(path).get_at((1, 2)) == SPRITES[path].get_at((0, 0))
+        assert atlas.native(path) == bool(i % 2)
+    assert atlas.region("images/missing.png") is None
+    assert not atlas.native("images/missing.png")
+
+
+def test_dimmed_sheet_matches_dimmed_sprite():
+    atlas = pack()
+    for path, source in SPRITES.items():
+        expected = pygame.transform.scale(source, (TILE, TILE))
+        # SpriteManager.get_dimmed_sprite's multiply
+        expected.fill((100, 100, 100), special_flags=pygame.BLEND_RGB_MULT)
+        sheet, rect = atlas.region(path, dimmed=True)
+        assert sheet is not atlas.sheets[atlas.index[path]['sheet_index']]
+        assert sheet.get_at((rect.x + 1, rect.y + 1)) == expected.get_at((1, 1))
+        assert atlas.get(path, dimmed=True).get_at((0, 0)) == expected.get_at((0, 0))
+
+
+def test_exported_index_reads_like_sprite_atlas_json(tmp_path, monkeypatch):
+    atlas = pack()
+    index_path = atlas.save(str(tmp_path / "out"))
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "sprite_atlas.json").write_text(open(index_path).read())
+    monkeypatch.chdir(tmp_path)
+    metadata = SpriteManager(None).atlas_metadata
+    assert metadata == json.loads(open(index_path).read())
+    entries = {k: v for k, v in metadata.items() if not k.startswith('_')}
+    assert set(entries) == set(SPRITES)
+    for path, entry in entries.items():
+        # What load_sprite reads: frame_0 as [x, y, w, h]
+        frame = entry['frame_0']
+        assert isinstance(frame, list) and len(frame) == 4
+        sheet = pygame.image.load(str(tmp_path / "out" / entry['sheet']))
+        assert pygame.Rect(0, 0, *sheet.get_size()).contains(pygame.Rect(frame))
+        assert sheet.get_at((frame[0], frame[1])) == SPRITES[path].get_at((0, 0))
@@ -0,0 +1,60 @@
+import os
+
+import pygame
+
+from app.lib.ui.sprite_cache import SpriteDiskCache
+
+
+def sprite(color):
+    surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
+
+
+def entry_files(cache):
+    return sorted(name for _, _, files in os.walk(cache.directory) for name in files)
+
+
+def test_store_is_written_on_flush(tmp_path):
+    cache = SpriteDiskCache(str(tmp_path))
+    cache.store("ab01", sprite((10, 20, 30, 255)), {'frame': 1})
+    assert entry_files(cache) == []
+    # Still served from the queue before it reaches the disk
+    assert cache.load("ab01")[1] == {'frame': 1}
+    assert cache.flush()
+    assert entry_files(cache) == ["ab01.rgba"]
+    surface, meta = SpriteDiskCache(str(tmp_path)).load("ab01")
+    assert surface.get_at((1, 1)) == (10, 20, 30, 255)
+    assert meta == {'frame': 1}
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = SpriteDiskCache(str(tmp_path))
+    cache.store("ab01", sprite((1, 2, 3, 255)))
+
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    assert cache.flush()
+    assert entry_files(cache) == []
+    assert cache.writes == 0
+
+
+def test_prune_keeps_recently_used_entries_under_the_cap(tmp_path):
+    cache = SpriteDiskCache(str(tmp_path))
+    for i, key in enumerate(("aa01", "bb02", "cc03")):
+        cache.store(key, sprite((i, i, i, 255)))
+    cache.flush()
+    for i, name in enumerate(entry_files(cache)):
+        path = os.path.join(cache.directory, name[:2], name)
+        os.utime(path, (1000 + i, 1000 + i))
+    stale_version = tmp_path / "v0"
+    stale_version.mkdir()
+    size = os.path.getsize(os.path.join(cache.directory, "aa", "aa01.rgba"))
+
+    reader = SpriteDiskCache(str(tmp_path), max_bytes=2 * size)
+    assert reader.load("aa01") is not None
+    assert reader.prune() == 1
+    # The oldest entry was read this session, so the next oldest goes
+    assert entry_files(reader) == ["aa01.rgba", "cc03.rgba"]
+    assert not stale_version.exists()
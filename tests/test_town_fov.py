@@ -0,0 +1,93 @@
+"""Daytime town FOV must see exactly what the old per-tile Bresenham sweep saw."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.lib.core.engine import line_sweep
+from app.lib.core.engine.fov import FOV
+from app.lib.core.engine.generation.map import TOWN_LAYOUT
+from app.lib.core.engine.grid import TileGrid
+from app.lib.core.game_engine import Game
+
+ORIGINS = [
+    (1, 1), (50, 2), (78, 2), (98, 1), (6, 5), (20, 12), (62, 12),
+    (40, 16), (90, 18), (30, 21), (66, 27), (90, 27), (5, 30), (50, 30),
+]
+
+
+def bresenham_visible(grid, ox, oy):
+    """The old day-town sweep: one Bresenham trace to every tile on the map."""
+    opaque = grid.opaque
+    width = grid.width
+    visible = set()
+    for ty in range(grid.height):
+        for tx in range(width):
+            dx = abs(tx - ox)
+            dy = -abs(ty - oy)
+            sx = 1 if ox < tx else -1
+            sy = 1 if oy < ty else -1
+            err = dx + dy
+            x, y = ox, oy
+            while (x, y) != (tx, ty):
+                e2 = 2 * err
+                if e2 >= dy:
+                    err += dy
+                    x += sx
+                if e2 <= dx:
+                    err += dx
+                    y += sy
+                if (x, y) != (tx, ty) and opaque[y * width + x]:
+                    break
+            else:
+                visible.add((tx, ty))
+    return visible
+
+
+@pytest.fixture(scope="module")
+def town():
+    return TileGrid.from_rows(TOWN_LAYOUT)
+
+
+@pytest.fixture(scope="module")
+def fov(town):
+    game = SimpleNamespace(current_map=town, map_width=town.width, map_height=town.height)
+    return FOV(game)
+
+
+def day_visible(fov, ox, oy):
+    """What update_fov's day-town branch marks visible from (ox, oy)."""
+    width = fov.game.current_map.width
+    return {(i % width, i // width) for i in fov._town_day_fov(ox, oy)}
+
+
+@pytest.mark.parametrize("origin", ORIGINS, ids=lambda o: "%d,%d" % o)
+def test_day_town_fov_matches_bresenham_sweep(town, fov, origin):
+    assert day_visible(fov, *origin) == bresenham_visible(town, *origin)
+
+
+def test_day_town_fov_matches_bresenham_sweep_across_town(town, fov):
+    streets = [(x, y) for y in range(town.height) for x in range(town.width) if not town.is_opaque(x, y)]
+    # Every 50th street tile, plus origins on a wall and inside a building
+    for origin in streets[::50] + [(0, 0), (13, 7), (55, 10)]:
+        assert day_visible(fov, *origin) == bresenham_visible(town, *origin), origin
+
+
+def test_town_shadow_table_is_built_with_the_map():
+    game = Game('.', headless=True)
+    game.init()
+    game.generate_map(0)
+    # Ready before the first daytime update_fov needs it
+    assert game.fov._sweep._size == (game.map_width, game.map_height)
+
+
+def test_sweep_keeps_only_the_last_table(monkeypatch):
+    built = []
+    real = line_sweep.shadow_table
+    monkeypatch.setattr(line_sweep, "shadow_table", lambda w, h: built.append((w, h)) or real(w, h))
+    sweep = line_sweep.LineSweep()
+    small = TileGrid.from_rows(["....", ".#..", "...."])
+    wide = TileGrid.from_rows(["......", "..#...", "......"])
+    for grid in (small, small, wide, small):
+        sweep.compute(grid.opaque, grid.width, grid.height, 0, 0)
+    assert built == [(4, 3), (6, 3), (4, 3)]
+    assert sweep._size == (4, 3)